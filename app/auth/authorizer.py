@@ -1,30 +1,234 @@
 # Built-in libraries
-from typing import Iterable, Generator
+import time
+from typing import Dict, Iterable, Generator, Hashable, Optional, Union
 
 # Project libraries
-from app.bank.account import BankAccount
+from app.bank.account import BankAccount, FastBankAccount
 from app.bank.transactions import BankStatement
+from app.bank.retention import RetentionPolicy
+from app.parse.events import AccountCreation, Event, Transaction, UnknownEvent, as_event
+from app.storage.snapshot import Snapshot
+from app.bank.records import MERCHANTS, TransactionRecord
+from app.storage.wal import ACCOUNT_CREATION, TRANSACTION, WriteAheadLog
+from app.auth.validation.pipeline import ValidationPipeline
 from app.auth.validation.base_validation import BaseValidation
+from app.service.metrics.instrumentation import Instrumentation
 
 
 class Authorizer:
-    """Authorizer class that performs validations for each transaction"""
+    """
+    Authorizer class that performs validations for each transaction.
+
+    Events may refer to many accounts through the 'account-id' field of 'account' and 'transaction' payloads.
+    The state of each account is kept on a table indexed by its id. Events without an id refer to a default account.
+
+    When a 'WriteAheadLog' is provided, account creations and accepted transactions are appended to it. 'lsn' keeps
+    the log sequence number of the last change applied to accounts.
+
+    When a 'RetentionPolicy' is provided, it bounds the transaction history kept on each account. Otherwise, the
+    history of each account grows with every accepted transaction.
+
+    When an 'Instrumentation' is provided, the latency of 'parse' (reading events), 'dispatch' (processing events,
+    apart from validations and registration), 'validate' and 'register' stages is recorded, along with the latency
+    and violations of each validation.
+    """
     def __init__(
         self,
-        events: Iterable[dict],
-        validations: Iterable[BaseValidation]
+        events: Iterable[Union[Event, dict]],
+        validations: Iterable[BaseValidation],
+        instrumentation: Optional[Instrumentation] = None,
+        wal: Optional[WriteAheadLog] = None,
+        retention: Optional[RetentionPolicy] = None
     ):
         """
         Constructor method for Authorizer class
 
         Args:
-            events (Iterable[dict]): An iterable object of dictionaries, where dicts are the events to be validated
+            events (Iterable[Union[Event, dict]]): An iterable object of events to be validated, typed or as dicts
             validations (Iterable[BaseValidation]): An iterable object of 'BaseValidation',
             that will be used to validate the transactions contained on 'events' parameter
+            instrumentation (Optional[Instrumentation]): Where timings are recorded, if provided
+            wal (Optional[WriteAheadLog]): Where changes to accounts are logged, if provided
+            retention (Optional[RetentionPolicy]): Policy bounding the transaction history of accounts, if provided
         """
         self.events = events
         self.validations = validations
-        self.account = None
+        self.instrumentation = instrumentation
+        self.wal = wal
+        self.retention = retention
+        self.lsn = 0
+        self.accounts: Dict[Hashable, BankAccount] = {}
+        self._pipeline = None
+        self._nested_ns = 0
+        # Handlers of typed events, by event class
+        self._handlers = {
+            AccountCreation: self.process_account_creation,
+            Transaction: self.process_transaction,
+            UnknownEvent: self.process_unknown
+        }
+
+    @property
+    def pipeline(self) -> ValidationPipeline:
+        """Property for the validations compiled into a pipeline, built on first use"""
+        if self._pipeline is None:
+            self._pipeline = ValidationPipeline(validations=self.validations, instrumentation=self.instrumentation)
+
+        return self._pipeline
+
+    @property
+    def account(self) -> Optional[BankAccount]:
+        """Property for the default account, used by events without an account id"""
+        return self.accounts.get(None)
+
+    @account.setter
+    def account(self, value: Optional[BankAccount]) -> None:
+        """
+        Setter for the default account
+
+        Args:
+            value (Optional[BankAccount]): Account used by events without an account id. None removes it.
+
+        Returns:
+            None
+        """
+        if value is None:
+            self.accounts.pop(None, None)
+        else:
+            self.accounts[None] = value
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Saves the state of all accounts to a snapshot file. See 'Snapshot'.
+        Entries of the write-ahead log, if any, are dropped once the snapshot is saved, since it includes them.
+
+        Args:
+            path (str): Snapshot file path
+
+        Returns:
+            None
+        """
+        Snapshot.save(accounts=self.accounts, path=path, lsn=self.lsn)
+
+        if self.wal is not None:
+            self.wal.truncate()
+
+    def load_snapshot(self, path: str) -> None:
+        """
+        Restores the state of all accounts from a snapshot file, replacing current accounts. See 'Snapshot'.
+
+        Args:
+            path (str): Snapshot file path
+
+        Returns:
+            None
+        """
+        self.accounts, self.lsn = Snapshot.load(path=path)
+
+    def export_accounts(self, account_ids: Iterable[Hashable]) -> bytes:
+        """
+        Hands off accounts to another authorizer: removes them, returning their state encoded as a snapshot, which
+        is restored by 'import_accounts'. Accounts keep their whole retained history, so transactions registered out of
+        order after the handoff are validated as they would have been here. Accounts not found are skipped.
+        Not allowed when a write-ahead log is provided, since recovering from it would restore the removed accounts.
+
+        Args:
+            account_ids (Iterable[Hashable]): Ids of the accounts handed off
+
+        Returns:
+            data (bytes): State of the removed accounts. See 'Snapshot'.
+        """
+        if self.wal is not None:
+            raise ValueError("Accounts can't be handed off by an authorizer with a write-ahead log")
+
+        accounts = {
+            account_id: self.accounts.pop(account_id) for account_id in account_ids if account_id in self.accounts
+        }
+
+        return Snapshot.dumps(accounts=accounts, lsn=self.lsn, history=True)
+
+    def import_accounts(self, data: bytes) -> int:
+        """
+        Takes over accounts handed off by another authorizer ('export_accounts'), replacing accounts with the same ids
+
+        Args:
+            data (bytes): State of the accounts. See 'Snapshot'.
+
+        Returns:
+            imported (int): Amount of imported accounts
+        """
+        if self.wal is not None:
+            raise ValueError("Accounts can't be handed off to an authorizer with a write-ahead log")
+
+        accounts, _ = Snapshot.loads(data)
+        self.accounts.update(accounts)
+
+        return len(accounts)
+
+    def recover(self, path: str) -> int:
+        """
+        Replays a write-ahead log on top of current accounts (e.g. restored from a snapshot). Only entries newer than
+        the last applied change are replayed, without validations, since they were already accepted. Transactions the
+        retention policy evicts meanwhile aren't written to its sink again.
+
+        Args:
+            path (str): Log file path
+
+        Returns:
+            replayed (int): Amount of replayed entries
+        """
+        horizon = self.pipeline.horizon
+        replayed = 0
+
+        for lsn, kind, values in WriteAheadLog.read(path=path, after=self.lsn):
+            account_id = values[0]
+            account = self.accounts.get(account_id)
+
+            if kind == ACCOUNT_CREATION and account is None:
+                _, active_card, available_limit = values
+                account = FastBankAccount(
+                    active_card=active_card,
+                    available_limit=available_limit,
+                    account_id=account_id
+                )
+                # Keeps the transactions validations will look at, as queries made while processing would
+                if horizon is not None:
+                    account.window.horizon = horizon
+                self.accounts[account_id] = account
+
+            elif kind == TRANSACTION and account is not None:
+                _, record_time, amount, merchant = values
+                BankStatement.register(
+                    account=account,
+                    transaction=TransactionRecord(time=record_time, amount=amount, merchant=MERCHANTS.encode(merchant))
+                )
+                if self.retention is not None:
+                    self.retention.apply(account=account, archive=False)
+
+            self.lsn = lsn
+            replayed += 1
+
+        return replayed
+
+    @staticmethod
+    def account_id_of(event: Union[Event, dict]) -> Hashable:
+        """
+        Gets the account id an event refers to
+
+        Args:
+            event (Union[Event, dict]): An account creation or transaction event, typed or as a dict
+
+        Returns:
+            account_id (Hashable): The 'account-id' field of event payload, None if not found
+        """
+        if isinstance(event, (Transaction, AccountCreation)):
+            return event.account_id
+
+        for key in ('transaction', 'account'):
+            payload = event.get(key)
+            if isinstance(payload, dict):
+                return payload.get('account-id')
+
+        return None
 
     def process(self) -> Generator[dict, None, None]:
         """
@@ -33,111 +237,181 @@ class Authorizer:
         Returns:
             None
         """
+        if self.instrumentation is not None:
+            yield from self._process_instrumented()
+            return
+
         for event in self.events:
-            # Gets event type metadata
-            event_type = event.get('event_type', 'unknown')
+            yield self.process_event(event=event)
+
+    def _process_instrumented(self) -> Generator[dict, None, None]:
+        """Same as 'process', recording the latency of each stage"""
+        clock = time.perf_counter_ns
+        record = self.instrumentation.record_stage
+        events = iter(self.events)
+
+        while True:
+            start = clock()
+            event = next(events, None)
+            parsed = clock()
+            if event is None:
+                break
+            record('parse', parsed - start)
+
+            self._nested_ns = 0
+            processed_event = self.process_event(event=event)
+            record('dispatch', clock() - parsed - self._nested_ns)
+
+            self.instrumentation.tick()
+            yield processed_event
+
+    def process_event(self, event: Union[Event, dict]) -> dict:
+        """
+        Process a single event, based on its type
 
-            # Apply verifications based on event type
-            process_method = getattr(self, f"process_{event_type}")
+        Args:
+            event (Union[Event, dict]): Event to be processed, typed or as a dict
 
-            yield process_method(event=event)
+        Returns:
+            event (dict): An dictionary with account information and possible violations
+        """
+        handler = self._handlers.get(type(event))
 
-    def process_account_creation(self, event: dict) -> dict:
+        if handler is None:
+            # Events given as dicts are dispatched by their 'event_type' field
+            handler = getattr(self, f"process_{event.get('event_type', 'unknown')}")
+
+        return handler(event=event)
+
+    def process_account_creation(self, event: Union[AccountCreation, dict]) -> dict:
         """
         Process events related to account creation. Creates a new account instance if it wasn't created yet.
         If account already been created, return 'account-already-initialized' violation
+        Accounts are created as 'FastBankAccount', so field types are only checked here, on construction.
 
         Args:
-            event (dict): Event with information related to account creation.
+            event (Union[AccountCreation, dict]): Event with information related to account creation.
 
         Returns:
             event (dict): An dictionary with updated information related to account creation and possible violations
         """
-        if not self.account:
-            account = event.get('account', {})
+        event = as_event(event)
+        current_account = self.accounts.get(event.account_id)
 
-            self.account = BankAccount(
-                available_limit=account.get('available-limit'),
-                active_card=account.get('active-card')
+        if not current_account:
+            current_account = FastBankAccount(
+                available_limit=event.available_limit,
+                active_card=event.active_card,
+                account_id=event.account_id
             )
+            self.accounts[event.account_id] = current_account
 
-            account_info = self.account.to_dict()
-            account_info.update({'violations': []})
+            if self.wal is not None:
+                self.lsn = self.wal.append_account(current_account)
 
-        else:
-            account_info = self.account.to_dict()
-            account_info.update(
-                {'violations': ["account-already-initialized"]}
-            )
+            return {'account': current_account.info(), 'violations': []}
 
-        return account_info
+        return {'account': current_account.info(), 'violations': ["account-already-initialized"]}
 
-    def process_transaction(self, event: dict) -> dict:
+    def process_transaction(self, event: Union[Transaction, dict]) -> dict:
         """
         Process events related to account transactions. Creates a new key value pair at event containing,
         if found, any violations based on predefined validations.
 
         Args:
-            event (dict): Event with information related to an account transaction
+            event (Union[Transaction, dict]): Event with information related to an account transaction
 
         Returns:
             event (dict): The original event with possible found violations.
             If wasn't found any violation, violations field will be an empty list.
         """
-        # Checks if account exists
-        if not self.account:
-            account_info = {"account": {}, 'violations': ['account-not-initialized']}
+        event = as_event(event)
+        account_id = event.account_id
+        current_account = self.accounts.get(account_id)
 
-        else:
-            violations = self.apply_validations(transaction=event)
+        # Checks if account exists
+        if not current_account:
+            account = {} if account_id is None else {'account-id': account_id}
+            return {"account": account, 'violations': ['account-not-initialized']}
 
-            account_info = self.account.to_dict()
-            account_info.update(
-                {'violations': [v for v in violations]}
-            )
+        violations = self.apply_validations(transaction=event, account=current_account)
 
-        return account_info
+        return {'account': current_account.info(), 'violations': violations}
 
-    def process_unknown(self, event: dict) -> dict:
+    def process_unknown(self, event: Union[UnknownEvent, dict]) -> dict:
         """
         Process unknown events. Just add 'unknown-error' to violation field
 
         Args:
-            event (dict): Event that wasn't in any expected type, like 'account_creation' or 'transaction'
+            event (Union[UnknownEvent, dict]): Event that wasn't in any expected type, like 'account_creation' or
+            'transaction'
 
         Returns:
             event (dict): The original event with violations field
         """
-        event.update({'violations': ['unknown-error']})
+        data = event.to_dict() if isinstance(event, Event) else event
+        data.update({'violations': ['unknown-error']})
 
-        return event
+        return data
 
-    def apply_validations(self, transaction: dict) -> list:
+    def apply_validations(self, transaction: Union[Transaction, dict], account: Optional[BankAccount] = None) -> list:
         """
         Apply validations specified on constructor to a single transaction.
 
         Args:
-            transaction (dict): An transaction of type 'transaction' to be validated
+            transaction (Union[Transaction, dict]): An transaction of type 'transaction' to be validated
+            account (Optional[BankAccount]): Account where the transaction will be validated.
+            If not provided, uses the account the transaction refers to.
 
         Yield:
             violation (dict): Violation found on validator
         """
+        if account is None:
+            account = self.accounts.get(self.account_id_of(transaction))
+
+        if self.instrumentation is not None:
+            return self._apply_validations_instrumented(transaction=transaction, account=account)
+
         # Apply validations
-        violations = []
-        for validator in self.validations:
-            violation = validator().validate(
-                account=self.account,
-                transaction=transaction
-            )
-            # Appends to list if has an violation
-            if violation:
-                violations.append(violation)
+        violations = self.pipeline.run(account=account, transaction=transaction)
 
         # When no violations was found, register the transaction to account
         if not violations:
-            BankStatement.register(
-                account=self.account,
-                transaction=transaction
+            record = BankStatement.register(
+                account=account,
+                transaction=transaction,
+                retention=self.retention
             )
 
+            if self.wal is not None:
+                self.lsn = self.wal.append_transaction(account_id=account.account_id, record=record)
+
+        return violations
+
+    def _apply_validations_instrumented(self, transaction: Union[Transaction, dict], account: BankAccount) -> list:
+        """Same as 'apply_validations', recording the latency of 'validate' and 'register' stages"""
+        clock = time.perf_counter_ns
+        record = self.instrumentation.record_stage
+
+        start = clock()
+        violations = self.pipeline.run(account=account, transaction=transaction)
+        validated = clock()
+        record('validate', validated - start)
+
+        if not violations:
+            registered_record = BankStatement.register(
+                account=account,
+                transaction=transaction,
+                retention=self.retention
+            )
+
+            if self.wal is not None:
+                self.lsn = self.wal.append_transaction(account_id=account.account_id, record=registered_record)
+
+            registered = clock()
+            record('register', registered - validated)
+            validated = registered
+
+        self._nested_ns += validated - start
+
         return violations
@@ -0,0 +1,232 @@
+# Built-in libraries
+import zlib
+import queue
+import threading
+import multiprocessing
+from typing import Any, Iterable, Generator, Hashable, List, Optional
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.auth.validation.base_validation import BaseValidation
+
+# Default amount of events read before partitioning them among workers
+DEFAULT_BATCH_SIZE = 1000
+
+# Seconds waited for a worker result before checking the worker is still alive
+POLL_INTERVAL = 0.5
+
+
+def canonical_id(account_id: Hashable) -> Hashable:
+    """
+    Gets the canonical form of an account id. Ids that are the same account on 'Authorizer' (equal dict keys, e.g.
+    1, 1.0 and True) get the same canonical form, so they are hashed the same way.
+
+    Args:
+        account_id (Hashable): Account identifier
+
+    Returns:
+        account_id (Hashable): Integral numbers (including booleans) as int, other ids as they are
+    """
+    if isinstance(account_id, bool):
+        return int(account_id)
+
+    if isinstance(account_id, float) and account_id.is_integer():
+        return int(account_id)
+
+    return account_id
+
+
+def shard_of(account_id: Hashable, shards: int) -> int:
+    """
+    Gets the shard an account belongs to. Unlike 'hash', the result is stable across processes and runs.
+
+    Args:
+        account_id (Hashable): Account identifier
+        shards (int): Amount of shards
+
+    Returns:
+        shard (int): A number between 0 and 'shards - 1'
+    """
+    account_id = canonical_id(account_id)
+    if isinstance(account_id, int):
+        return account_id % shards
+
+    return zlib.crc32(repr(account_id).encode()) % shards
+
+
+def get_result(outbox: multiprocessing.Queue, process: multiprocessing.Process) -> Any:
+    """
+    Waits for the next result of a worker process. Results that are exceptions are raised.
+
+    Args:
+        outbox (multiprocessing.Queue): Queue where the worker sends its results
+        process (multiprocessing.Process): The worker process
+
+    Returns:
+        result (Any): Result sent by the worker
+    """
+    while True:
+        try:
+            result = outbox.get(timeout=POLL_INTERVAL)
+            break
+        except queue.Empty:
+            # A worker killed (e.g. out of memory) would never send its result
+            if not process.is_alive():
+                raise RuntimeError(f"Worker process {process.pid} died with exit code {process.exitcode}")
+
+    if isinstance(result, Exception):
+        raise result
+
+    return result
+
+
+def _work(validations: Iterable[BaseValidation], inbox: multiprocessing.Queue, outbox: multiprocessing.Queue) -> None:
+    """
+    Worker loop. Owns the state of the accounts of a shard, processing batches of events until receives None.
+    For each batch, puts on 'outbox' a list with the processed events, or the exception raised while processing it.
+
+    Args:
+        validations (Iterable[BaseValidation]): Validations used by the worker 'Authorizer'
+        inbox (multiprocessing.Queue): Queue where batches of events are received
+        outbox (multiprocessing.Queue): Queue where processed batches are sent
+
+    Returns:
+        None
+    """
+    authorizer = Authorizer(events=[], validations=validations)
+
+    for batch in iter(inbox.get, None):
+        try:
+            outbox.put([authorizer.process_event(event=event) for event in batch])
+        except Exception as e:
+            outbox.put(e)
+
+
+class ShardedAuthorizer:
+    """
+    Authorizer that spreads the work among a pool of worker processes.
+
+    Events are hash partitioned by account id, so each worker owns the state of its accounts and events of an account
+    are processed in order. The processed events are merged back following the order events were read, which is the
+    same 'order' assigned by 'parse_input_events', so the output is identical to the one of 'Authorizer'.
+    """
+    def __init__(
+        self,
+        events: Iterable[dict],
+        validations: Iterable[BaseValidation],
+        workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Constructor method for ShardedAuthorizer
+
+        Args:
+            events (Iterable[dict]): An iterable object of dictionaries, where dicts are the events to be validated
+            validations (Iterable[BaseValidation]): An iterable object of 'BaseValidation',
+            that will be used to validate the transactions contained on 'events' parameter
+            workers (Optional[int]): Amount of worker processes. If not provided, uses one per CPU.
+            batch_size (int): Amount of events read before partitioning them among workers
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+
+        if workers <= 0:
+            raise ValueError(f"Expected a positive amount of workers, got: {workers}")
+
+        if batch_size <= 0:
+            raise ValueError(f"Expected a positive batch size, got: {batch_size}")
+
+        self.events = events
+        self.validations = list(validations)
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def _feed(self, inboxes: List[multiprocessing.Queue], routes: queue.Queue) -> None:
+        """
+        Reads events in batches, sending each event to the worker that owns its account. For each batch, puts on
+        'routes' the list of workers in the order its events were read. Puts None when events are over.
+
+        Args:
+            inboxes (List[multiprocessing.Queue]): Queues where workers receive batches of events
+            routes (queue.Queue): Queue where the routes of each batch are sent
+
+        Returns:
+            None
+        """
+        try:
+            batch = []
+            for event in self.events:
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    self._dispatch(batch=batch, inboxes=inboxes, routes=routes)
+                    batch = []
+
+            if batch:
+                self._dispatch(batch=batch, inboxes=inboxes, routes=routes)
+
+        except Exception as e:
+            routes.put(e)
+
+        finally:
+            routes.put(None)
+
+    def _dispatch(self, batch: List[dict], inboxes: List[multiprocessing.Queue], routes: queue.Queue) -> None:
+        """Partitions a batch of events among workers"""
+        partitions = [[] for _ in range(self.workers)]
+        route = []
+
+        for event in batch:
+            shard = shard_of(Authorizer.account_id_of(event), self.workers)
+            partitions[shard].append(event)
+            route.append(shard)
+
+        for shard, partition in enumerate(partitions):
+            if partition:
+                inboxes[shard].put(partition)
+
+        routes.put(route)
+
+    def process(self) -> Generator[dict, None, None]:
+        """
+        Starts the validations for all transactions, on worker processes.
+
+        Yield:
+            event (dict): Processed events, in the same order they were read
+        """
+        inboxes = [multiprocessing.Queue(maxsize=4) for _ in range(self.workers)]
+        outboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        routes = queue.Queue(maxsize=4 * self.workers)
+
+        processes = [
+            multiprocessing.Process(target=_work, args=(self.validations, inbox, outbox), daemon=True)
+            for inbox, outbox in zip(inboxes, outboxes)
+        ]
+        for process in processes:
+            process.start()
+
+        feeder = threading.Thread(target=self._feed, args=(inboxes, routes), daemon=True)
+        feeder.start()
+
+        try:
+            for route in iter(routes.get, None):
+                if isinstance(route, Exception):
+                    raise route
+
+                processed = {
+                    shard: iter(get_result(outbox=outboxes[shard], process=processes[shard])) for shard in set(route)
+                }
+
+                for shard in route:
+                    yield next(processed[shard])
+
+            for inbox in inboxes:
+                inbox.put(None)
+            for process in processes:
+                process.join()
+
+        finally:
+            for inbox, process in zip(inboxes, processes):
+                if process.is_alive():
+                    # Don't wait for events that won't be consumed anymore
+                    inbox.cancel_join_thread()
+                    process.terminate()
@@ -1,8 +1,11 @@
 # Built-in libraries
 from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import FrozenSet, Optional
 
 # Project libraries
 from app.bank.account import BankAccount
+from app.auth.validation.context import ValidationContext
 
 
 class BaseValidation(ABC):
@@ -10,7 +13,15 @@ class BaseValidation(ABC):
     An abstract class to represent the a transaction validator to be used on Authorizer.
     To implement custom validations, just implement this class. The 'validate' method is the responsible for return the
     final value of validation. Feel free to add others methods to the concrete class.
+
+    When applied by the 'ValidationPipeline', validations receive a 'ValidationContext' through the 'check' method.
+    By default, 'check' adapts the context to 'validate', so any concrete class works. Validations may override
+    'check' to reuse the context, declaring on 'requires' the context they need (e.g. 'recent' transactions within
+    'window' before the transaction time).
     """
+    requires: FrozenSet[str] = frozenset()
+    window: Optional[timedelta] = None
+
     @abstractmethod
     def validate(self, account: BankAccount, transaction: dict) -> str:
         """
@@ -24,3 +35,15 @@ class BaseValidation(ABC):
             The violation found, otherwise, an empty string
         """
         raise NotImplementedError
+
+    def check(self, context: ValidationContext) -> str:
+        """
+        Validate a single transaction from a context shared with other validations.
+
+        Args:
+            context: A 'ValidationContext' with the account and the transaction to be validated
+
+        Returns:
+            The violation found, otherwise, an empty string
+        """
+        return self.validate(account=context.account, transaction=context.transaction)
@@ -0,0 +1,80 @@
+# Built-in libraries
+from datetime import timedelta
+from typing import List, Optional, Union
+
+# Project libraries
+from app.bank.account import BankAccount
+from app.bank.records import TransactionRecord, to_epoch_micros
+from app.bank.transactions import BankStatement
+from app.parse.events import Transaction
+
+
+class ValidationContext:
+    """
+    Information about a transaction being validated, shared by all validations applied to it.
+    Transaction fields are read once, and the recent transactions of the account are queried at most once,
+    only if some validation needs them.
+    """
+    __slots__ = ('account', 'transaction', 'time', 'amount', 'merchant', 'window', '_recent')
+
+    def __init__(self, account: BankAccount, transaction: Union[Transaction, dict], window: Optional[timedelta] = None):
+        """
+        Constructor method for ValidationContext
+
+        Args:
+            account (BankAccount): Account where the transaction will be validated
+            transaction (Union[Transaction, dict]): Transaction to be validated, typed or as a dict
+            window (Optional[timedelta]): Time span of the recent transactions, before the transaction time
+        """
+        self.account = account
+        self.transaction = transaction
+        self.window = window
+        self._recent = None
+
+        if isinstance(transaction, Transaction):
+            self.time = transaction.time
+            self.amount = transaction.amount
+            self.merchant = transaction.merchant
+        else:
+            transaction_info = transaction.get('transaction', {})
+            self.time = transaction_info.get('time')
+            # Same defaults as 'Transaction'
+            self.amount = transaction_info.get('amount', 0)
+            self.merchant = transaction_info.get('merchant', '')
+
+    @property
+    def recent(self) -> List[TransactionRecord]:
+        """Transactions registered on account within 'window' before the transaction time"""
+        if self._recent is None:
+            self._recent = list(
+                BankStatement.query_by_date(
+                    account=self.account,
+                    field='time',
+                    start_date=self.time - self.window,
+                    end_date=self.time
+                )
+            )
+
+        return self._recent
+
+    def recent_since(self, window: timedelta) -> List[TransactionRecord]:
+        """
+        Gets the transactions registered on account within a time span before the transaction time.
+        Spans up to the context 'window' are served from the 'recent' transactions.
+
+        Args:
+            window (timedelta): Time span before the transaction time
+
+        Returns:
+            transactions (List[TransactionRecord]): Transactions that meet the criteria
+        """
+        if self.window is None or window > self.window:
+            self.window = window
+            self._recent = None
+
+        if window == self.window:
+            return self.recent
+
+        # Record times are microseconds since epoch, unless they weren't python datetimes, as on the window
+        start = to_epoch_micros(self.time - window)
+        return [t for t in self.recent if isinstance(t.time, int) and t.time >= start]
@@ -1,9 +1,11 @@
 # Built-in libraries
 from datetime import datetime, timedelta
+from typing import Optional
 
 # Project libraries
 from app.bank.account import BankAccount
 from app.bank.transactions import BankStatement
+from app.auth.validation.context import ValidationContext
 from app.auth.validation.base_validation import BaseValidation
 
 
@@ -23,7 +25,10 @@ class CardNotActiveValidation(BaseValidation):
      {"account": {"active-card": false, "available-limit": 100}, "violations": ["card-not-active"]}
     """
     def validate(self, account: BankAccount, transaction: dict) -> str:
-        if not account.active_card:
+        return self.check(ValidationContext(account=account, transaction=transaction))
+
+    def check(self, context: ValidationContext) -> str:
+        if not context.account.active_card:
             return 'card-not-active'
         return ''
 
@@ -45,9 +50,12 @@ class InsufficientLimitValidation(BaseValidation):
     {"account": {"active-card": true,"available-limit": 1000}, "violations": ["insufficient-limit"]}
     """
     def validate(self, account: BankAccount, transaction: dict) -> str:
-        transaction_amount = transaction.get('transaction', {}).get('amount')
+        return self.check(ValidationContext(account=account, transaction=transaction))
+
+    def check(self, context: ValidationContext) -> str:
+        account = context.account
 
-        if account.available_limit < transaction_amount and account.active_card:
+        if account.available_limit < context.amount and account.active_card:
             return 'insufficient-limit'
         return ''
 
@@ -76,18 +84,35 @@ class HighFreqSmallIntervalValidation(BaseValidation):
     {"account": {"active-card": true, "available-limit": 40}, "violations": ["highfrequency-small-interval"]}
     {"account": {"active-card": true, "available-limit": 30}, "violations": []}
     """
+    requires = frozenset({'recent'})
+    window = timedelta(minutes=2)
+    threshold = 3
+
+    def __init__(self, threshold: Optional[int] = None, window: Optional[timedelta] = None):
+        """
+        Constructor method for HighFreqSmallIntervalValidation
+
+        Args:
+            threshold (Optional[int]): Amount of recent transactions that leads to the violation. Defaults to 3.
+            window (Optional[timedelta]): Time span of recent transactions. Defaults to 2 minutes.
+        """
+        if threshold is not None:
+            if threshold <= 0:
+                raise ValueError(f"Expected a positive threshold, got: {threshold}")
+            self.threshold = threshold
+
+        if window is not None:
+            if window <= timedelta(0):
+                raise ValueError(f"Expected a positive window, got: {window}")
+            self.window = window
+
     def validate(self, account: BankAccount, transaction: dict) -> str:
-        end_time = transaction.get('transaction', {}).get('time')
-        start_time = end_time - timedelta(minutes=2)
-
-        transactions = BankStatement.query_by_date(
-            account=account,
-            field='time',
-            start_date=start_time,
-            end_date=end_time
-        )
+        return self.check(ValidationContext(account=account, transaction=transaction, window=self.window))
+
+    def check(self, context: ValidationContext) -> str:
+        transactions = context.recent_since(self.window)
 
-        if len(list(transactions)) >= 3:
+        if len(transactions) >= self.threshold:
             return 'high-frequency-small-interval'
 
         return ''
@@ -115,28 +140,33 @@ class DoubledTransaction(BaseValidation):
     {"account": {"active-card": true, "available-limit": 70}, "violations": ["doubled-transaction"]}
     {"account": {"active-card": true, "available-limit": 55}, "violations": []}
     """
-    def validate(self, account: BankAccount, transaction: dict) -> str:
-        transaction_info = transaction.get('transaction', {})
-        end_time = transaction_info.get('time')
-        start_time = end_time - timedelta(minutes=2)
-
-        transactions = BankStatement.query_by_date(
-            account=account,
-            field='time',
-            start_date=start_time,
-            end_date=end_time
-        )
+    window = timedelta(minutes=2)
+
+    def __init__(self, window: Optional[timedelta] = None):
+        """
+        Constructor method for DoubledTransaction
 
-        amount = transaction_info.get('amount', '')
-        merchant = transaction_info.get('merchant', '')
+        Args:
+            window (Optional[timedelta]): Time span where repeated transactions are looked for. Defaults to 2 minutes.
+        """
+        if window is not None:
+            if window <= timedelta(0):
+                raise ValueError(f"Expected a positive window, got: {window}")
+            self.window = window
 
-        for t in transactions:
-            t_info = t.get('transaction', {})
-            past_transaction_amount = t_info.get('amount', '')
-            past_transaction_merchant = t_info.get('merchant', '')
+    def validate(self, account: BankAccount, transaction: dict) -> str:
+        return self.check(ValidationContext(account=account, transaction=transaction))
+
+    def check(self, context: ValidationContext) -> str:
+        found = BankStatement.has_similar_transaction(
+            account=context.account,
+            merchant=context.merchant,
+            amount=context.amount,
+            start_date=context.time - self.window,
+            end_date=context.time
+        )
 
-            if (past_transaction_merchant == merchant) and \
-                    (past_transaction_amount == amount):
-                return 'doubled-transaction'
+        if found:
+            return 'doubled-transaction'
 
         return ''
@@ -0,0 +1,83 @@
+# Built-in libraries
+import time
+from typing import Iterable, List, Optional, Type, Union
+
+# Project libraries
+from app.bank.account import BankAccount
+from app.auth.validation.context import ValidationContext
+from app.auth.validation.base_validation import BaseValidation
+from app.service.metrics.instrumentation import Instrumentation
+
+
+class ValidationPipeline:
+    """
+    Validations compiled to be applied to many transactions.
+
+    Validations are instantiated once. For each transaction, a single 'ValidationContext' is built and passed to
+    every validation, sized to the longest window the validations require.
+
+    When an 'Instrumentation' is provided, latency and violations of each validation are recorded.
+    """
+    def __init__(
+        self,
+        validations: Iterable[Union[Type[BaseValidation], BaseValidation]],
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        Constructor method for ValidationPipeline
+
+        Args:
+            validations (Iterable[Union[Type[BaseValidation], BaseValidation]]): Validations to be applied, in order.
+            Classes are instantiated without arguments.
+            instrumentation (Optional[Instrumentation]): Where validation timings are recorded, if provided
+        """
+        self.instrumentation = instrumentation
+        self.rules: List[BaseValidation] = [
+            validation() if isinstance(validation, type) else validation
+            for validation in validations
+        ]
+
+        windows = [rule.window for rule in self.rules if 'recent' in rule.requires and rule.window]
+        self.window = max(windows) if windows else None
+
+        # Longest time span of transactions any validation looks at
+        self.horizon = max((rule.window for rule in self.rules if rule.window), default=None)
+
+    def run(self, account: BankAccount, transaction: dict) -> List[str]:
+        """
+        Applies all validations to a single transaction
+
+        Args:
+            account (BankAccount): Account where the transaction will be validated
+            transaction (dict): Transaction to be validated
+
+        Returns:
+            violations (List[str]): Violations found, in the same order of validations
+        """
+        context = ValidationContext(account=account, transaction=transaction, window=self.window)
+
+        if self.instrumentation is not None:
+            return self._run_instrumented(context=context)
+
+        violations = []
+        for rule in self.rules:
+            violation = rule.check(context)
+            if violation:
+                violations.append(violation)
+
+        return violations
+
+    def _run_instrumented(self, context: ValidationContext) -> List[str]:
+        """Same as 'run', recording the latency and violations of each validation"""
+        clock = time.perf_counter_ns
+        record = self.instrumentation.record_validation
+
+        violations = []
+        for rule in self.rules:
+            start = clock()
+            violation = rule.check(context)
+            record(type(rule).__name__, clock() - start, violation)
+            if violation:
+                violations.append(violation)
+
+        return violations
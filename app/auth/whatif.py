@@ -0,0 +1,101 @@
+# Built-in libraries
+from collections import Counter
+from typing import Dict, Generator, Iterable, Type, Union
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.events import Event, as_event
+from app.auth.validation.base_validation import BaseValidation
+
+
+class WhatIfReplay:
+    """
+    Replays events through several independent 'Authorizer's at once, one per scenario (a set of validations, or of
+    validation parameters), so events are parsed once for all scenarios instead of once per run.
+
+    Each scenario keeps account state of its own, so its processed events are the same as running 'Authorizer' alone
+    with its validations. Violations found by each scenario are counted, and compared to the first scenario (the
+    baseline): the difference of each violation count and the amount of events with different violations.
+    """
+    def __init__(
+        self,
+        events: Iterable[Union[Event, dict]],
+        scenarios: Dict[str, Iterable[Union[Type[BaseValidation], BaseValidation]]]
+    ):
+        """
+        Constructor method for WhatIfReplay
+
+        Args:
+            events (Iterable[Union[Event, dict]]): Parsed events
+            scenarios (Dict[str, Iterable[Union[Type[BaseValidation], BaseValidation]]]): Validations of each
+            scenario, by name. The first one is the baseline.
+        """
+        if not scenarios:
+            raise ValueError('Expected at least one scenario')
+
+        self.events = events
+        self.authorizers = {
+            name: Authorizer(events=[], validations=validations) for name, validations in scenarios.items()
+        }
+        self.baseline = next(iter(self.authorizers))
+        self.processed = 0
+        self.violations: Dict[str, Counter] = {name: Counter() for name in self.authorizers}
+        self.changed: Dict[str, int] = {name: 0 for name in self.authorizers}
+
+    def process(self) -> Generator[Dict[str, dict], None, None]:
+        """
+        Processes all events on every scenario
+
+        Yield:
+            processed_events (Dict[str, dict]): Processed event of each scenario, by name, the same as
+            'Authorizer.process'
+        """
+        authorizers = list(self.authorizers.items())
+        violations, changed = self.violations, self.changed
+
+        for event in self.events:
+            # Converted once, instead of by each authorizer
+            event = as_event(event)
+
+            processed_events = {}
+            baseline = None
+            for name, authorizer in authorizers:
+                processed_event = authorizer.process_event(event=event)
+                processed_events[name] = processed_event
+
+                found = processed_event.get('violations', [])
+                violations[name].update(found)
+
+                if baseline is None:
+                    baseline = found
+                elif found != baseline:
+                    changed[name] += 1
+
+            self.processed += 1
+            yield processed_events
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Gets the violations found by each scenario, compared to the baseline
+
+        Returns:
+            summary (Dict[str, dict]): For each scenario, by name: violation counts, their difference to the baseline
+            ones (when not zero) and the amount of events with violations different from the baseline ones
+        """
+        baseline = self.violations[self.baseline]
+        summary = {}
+
+        for name, violations in self.violations.items():
+            diff = {
+                violation: violations[violation] - baseline[violation]
+                for violation in sorted(set(violations) | set(baseline))
+                if violations[violation] != baseline[violation]
+            }
+            summary[name] = {
+                'events': self.processed,
+                'violations': dict(sorted(violations.items())),
+                'diff': diff,
+                'changed_events': self.changed[name]
+            }
+
+        return summary
@@ -1,9 +1,72 @@
-class BankAccount:
+# Built-in libraries
+import json
+from typing import Hashable
+
+# Project libraries
+from app.bank.window import TransactionWindow
+from app.bank.records import TransactionRecord
+
+
+class AccountInfo(dict):
+    """
+    Account fields of a processed event. Along with the fields, keeps their JSON encoding, so writers don't need to
+    encode the same account state many times. Instances are shared by events of the same account state, so they
+    must not be modified.
+    """
+    __slots__ = ('encoded',)
+
+    def __init__(self, fields: dict, encoded: str):
+        """
+        Constructor method for AccountInfo
+
+        Args:
+            fields (dict): Account fields
+            encoded (str): JSON encoding of fields, with sorted keys
+        """
+        super().__init__(fields)
+        self.encoded = encoded
+
+
+class AccountFields:
+    """Encoding of the account fields shown on processed events, shared by account types"""
+    __slots__ = ()
+
+    def fields(self) -> dict:
+        """
+        Gets the account fields, as they are shown on processed events
+
+        Returns:
+            fields (dict): Account fields
+        """
+        fields = {
+            "active-card": self.active_card,
+            "available-limit": self.available_limit,
+        }
+        if self.account_id is not None:
+            fields["account-id"] = self.account_id
+
+        return fields
+
+    def to_json(self) -> str:
+        """
+        Gets the JSON encoding of account fields, with sorted keys
+
+        Returns:
+            encoded (str): Account fields encoded as JSON
+        """
+        return self.info().encoded
+
+    def to_dict(self):
+        return {"account": self.info()}
+
+
+class BankAccount(AccountFields):
     """Represents an bank account"""
     def __init__(
         self,
         active_card: bool,
-        available_limit: int
+        available_limit: int,
+        account_id: Hashable = None
     ):
         """
         Constructor method for BankAccount
@@ -11,7 +74,10 @@ class BankAccount:
         Args:
             active_card (bool): Indicates if card whether is active or not
             available_limit (int): Current available limit at account
+            account_id (Hashable): Identifier of the account, when events refer to many accounts
         """
+        self.account_id = account_id
+        self._info = None
         self.active_card = active_card
         self.available_limit = available_limit
         self.transactions = []
@@ -39,6 +105,7 @@ class BankAccount:
         """
         if isinstance(value, bool):
             self.__active_card = value
+            self._info = None
         else:
             raise TypeError(f"Expected type 'boolean', got: {type(value)} instead")
 
@@ -65,12 +132,16 @@ class BankAccount:
         """
         if isinstance(value, int):
             self.__available_limit = value
+            self._info = None
         else:
             raise TypeError(f"Expected integer, but got: {type(value)}")
 
     @property
     def transactions(self) -> list:
-        """Property for transactions attribute"""
+        """
+        Property for transactions attribute, a list of 'TransactionRecord'. It keeps the full history of the
+        account, growing with every transaction unless a 'RetentionPolicy' bounds it.
+        """
         return self.__transactions
 
     @transactions.getter
@@ -81,7 +152,8 @@ class BankAccount:
     @transactions.setter
     def transactions(self, value: list) -> None:
         """
-        Setter for transactions attribute
+        Setter for transactions attribute. Transactions are stored as 'TransactionRecord'.
+        Also rebuilds the time window index used by 'BankStatement'.
         Args:
             value (list): Value to be set to transactions. Must be a list.
 
@@ -89,14 +161,76 @@ class BankAccount:
             None
         """
         if isinstance(value, list):
-            self.__transactions = value
+            self.__transactions = [TransactionRecord.from_transaction(t) for t in value]
+            self.window = TransactionWindow.from_transactions(self.__transactions)
         else:
             raise TypeError(f"Expected type 'list', got: {type(value)} instead")
 
-    def to_dict(self):
-        return {
-            "account": {
-                "active-card": self.active_card,
-                "available-limit": self.available_limit,
-            }
-        }
+    def info(self) -> AccountInfo:
+        """
+        Gets the account fields along with their JSON encoding. Both are cached until the account changes.
+
+        Returns:
+            info (AccountInfo): Account fields
+        """
+        if self._info is None:
+            fields = self.fields()
+            self._info = AccountInfo(fields=fields, encoded=json.dumps(fields, default=str, sort_keys=True))
+
+        return self._info
+
+
+class FastBankAccount(AccountFields):
+    """
+    Represents an bank account, the same as 'BankAccount' with plain slotted attributes instead of type checked
+    properties. Types are checked once, on construction, so reading and writing fields on the hot path (registering
+    transactions and running validations) is plain attribute access, and each instance takes less memory.
+
+    Callers must keep field types: 'active_card' a boolean, 'available_limit' an integer and 'transactions' a list of
+    'TransactionRecord', indexed by 'window'. As on 'BankAccount', 'transactions' keeps the full history of the
+    account unless a 'RetentionPolicy' bounds it.
+    """
+    __slots__ = ('account_id', 'active_card', 'available_limit', 'transactions', 'window', '_info', '_info_state')
+
+    def __init__(
+        self,
+        active_card: bool,
+        available_limit: int,
+        account_id: Hashable = None
+    ):
+        """
+        Constructor method for FastBankAccount
+
+        Args:
+            active_card (bool): Indicates if card whether is active or not
+            available_limit (int): Current available limit at account
+            account_id (Hashable): Identifier of the account, when events refer to many accounts
+        """
+        if not isinstance(active_card, bool):
+            raise TypeError(f"Expected type 'boolean', got: {type(active_card)} instead")
+        if not isinstance(available_limit, int):
+            raise TypeError(f"Expected integer, but got: {type(available_limit)}")
+
+        self.account_id = account_id
+        self.active_card = active_card
+        self.available_limit = available_limit
+        self.transactions = []
+        self.window = TransactionWindow()
+        self._info = None
+        self._info_state = None
+
+    def info(self) -> AccountInfo:
+        """
+        Gets the account fields along with their JSON encoding. Both are cached until the account changes, which is
+        checked against the fields the cache was built from, since writes aren't tracked.
+
+        Returns:
+            info (AccountInfo): Account fields
+        """
+        state = (self.active_card, self.available_limit)
+        if self._info is None or self._info_state != state:
+            fields = self.fields()
+            self._info = AccountInfo(fields=fields, encoded=json.dumps(fields, default=str, sort_keys=True))
+            self._info_state = state
+
+        return self._info
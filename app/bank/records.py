@@ -0,0 +1,213 @@
+# Built-in libraries
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+# Project libraries
+from app.parse.events import Transaction
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_micros(value: datetime) -> int:
+    """
+    Converts a python datetime to microseconds since epoch. Naive datetimes are considered as UTC.
+
+    Args:
+        value (datetime): Datetime to be converted
+
+    Returns:
+        micros (int): Microseconds since 1970-01-01T00:00:00
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_epoch_micros(value: int) -> datetime:
+    """
+    Converts microseconds since epoch to a naive python datetime
+
+    Args:
+        value (int): Microseconds since 1970-01-01T00:00:00
+
+    Returns:
+        datetime (datetime): The equivalent naive datetime
+    """
+    return EPOCH + timedelta(microseconds=value)
+
+
+class MerchantTable:
+    """
+    Dictionary encoding of merchant names into small integer ids.
+    Names are kept once, so events may share them instead of holding a copy each. See 'intern'.
+    """
+    def __init__(self):
+        """Constructor method for MerchantTable"""
+        self._ids: Dict[Hashable, int] = {}
+        self._names: List[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def encode(self, name: Hashable) -> int:
+        """
+        Gets the id of a merchant, assigning a new one if it wasn't seen yet
+
+        Args:
+            name (Hashable): Merchant name
+
+        Returns:
+            merchant_id (int): Merchant id
+        """
+        merchant_id = self._ids.get(name)
+        if merchant_id is None:
+            merchant_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+
+        return merchant_id
+
+    def intern(self, name: Hashable) -> Hashable:
+        """
+        Gets the name kept by the table for a merchant, assigning it an id if it wasn't seen yet.
+        Equal names become the same object, so later lookups of it are resolved by identity.
+
+        Args:
+            name (Hashable): Merchant name
+
+        Returns:
+            name (Hashable): The same name, as kept by the table
+        """
+        return self._names[self.encode(name)]
+
+    def lookup(self, name: Hashable) -> Optional[int]:
+        """
+        Gets the id of a merchant, without assigning new ones
+
+        Args:
+            name (Hashable): Merchant name
+
+        Returns:
+            merchant_id (Optional[int]): Merchant id, or None if it wasn't seen yet
+        """
+        return self._ids.get(name)
+
+    def decode(self, merchant_id: int) -> Hashable:
+        """
+        Gets the name of a merchant
+
+        Args:
+            merchant_id (int): Merchant id
+
+        Returns:
+            name (Hashable): Merchant name
+        """
+        return self._names[merchant_id]
+
+
+# Process wide merchant dictionary, shared by all accounts
+MERCHANTS = MerchantTable()
+
+
+class TransactionRecord:
+    """
+    Compact representation of a registered transaction. Keeps only the fields used by queries:
+    time as microseconds since epoch, amount and merchant id on 'MERCHANTS'.
+    """
+    __slots__ = ('time', 'amount', 'merchant')
+
+    FIELDS = ('merchant', 'amount', 'time')
+
+    def __init__(self, time: Any, amount: Any, merchant: int):
+        """
+        Constructor method for TransactionRecord
+
+        Args:
+            time (Any): Microseconds since epoch. Values that weren't python datetimes are kept as they are.
+            amount (Any): Transaction amount
+            merchant (int): Merchant id on 'MERCHANTS'
+        """
+        self.time = time
+        self.amount = amount
+        self.merchant = merchant
+
+    def __repr__(self) -> str:
+        return f"TransactionRecord(time={self.time!r}, amount={self.amount!r}, merchant={self.merchant!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TransactionRecord):
+            return NotImplemented
+
+        return (self.time, self.amount, self.merchant) == (other.time, other.amount, other.merchant)
+
+    @classmethod
+    def from_transaction(cls, transaction: Union[Transaction, dict]) -> 'TransactionRecord':
+        """
+        Builds a record from a transaction event
+
+        Args:
+            transaction (Union[Transaction, dict]): A transaction event, typed or as a dict
+
+        Returns:
+            record (TransactionRecord): The compact transaction
+        """
+        if isinstance(transaction, Transaction):
+            time, amount, merchant = transaction.time, transaction.amount, transaction.merchant
+
+        elif isinstance(transaction, TransactionRecord):
+            return transaction
+
+        else:
+            transaction_info = transaction.get('transaction', {})
+            time = transaction_info.get('time')
+            amount = transaction_info.get('amount', 0)
+            merchant = transaction_info.get('merchant', '')
+
+        return cls(
+            time=to_epoch_micros(time) if isinstance(time, datetime) else time,
+            amount=amount,
+            merchant=MERCHANTS.encode(merchant)
+        )
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """
+        Gets the value of a transaction field, as it was on the transaction event.
+        'transaction' gets all fields as a dict, the same as the payload of the event, so code written against
+        transaction events (e.g. "t.get('transaction', {}).get('merchant')") reads records as well.
+
+        Args:
+            field (str): One of 'merchant', 'amount', 'time' or 'transaction'
+            default (Any): Value returned for unknown fields
+
+        Returns:
+            value (Any): Field value
+        """
+        if field == 'transaction':
+            return {name: self.get(name) for name in self.FIELDS}
+
+        if field == 'merchant':
+            return MERCHANTS.decode(self.merchant)
+
+        if field == 'time':
+            return from_epoch_micros(self.time) if isinstance(self.time, int) else self.time
+
+        if field == 'amount':
+            return self.amount
+
+        return default
+
+    def __getitem__(self, field: str) -> Any:
+        if field != 'transaction' and field not in self.FIELDS:
+            raise KeyError(field)
+
+        return self.get(field)
+
+    def to_dict(self) -> dict:
+        """
+        Converts the record back to a transaction event
+
+        Returns:
+            transaction (dict): The transaction event
+        """
+        return {"transaction": self.get('transaction')}
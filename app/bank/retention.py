@@ -0,0 +1,134 @@
+# Built-in libraries
+import math
+from datetime import timedelta
+from typing import Optional, Union
+
+# Project libraries
+from app.bank.account import BankAccount
+from app.bank.records import MICROSECOND
+from app.storage.cold_storage import ColdStorage
+
+# Horizon derived from the longest interval validations query on each account
+AUTO = 'auto'
+
+# Default fraction of out of policy transactions kept, relative to the ones in policy, before evicting them at once
+DEFAULT_SLACK = 0.5
+
+
+class RetentionPolicy:
+    """
+    Bounds the transaction history kept on accounts. Applied by 'BankStatement.register' after each transaction.
+
+    Transactions are evicted, oldest registered first, when they got older than 'horizon' (relative to the newest
+    transaction of the account, plus 'lateness') or when the account has more than 'max_entries' transactions. With
+    the 'auto' horizon, transactions are kept as long as the account time window does, which grows to the longest
+    interval validations have queried. Validations then see the same transactions they would without retention, as
+    long as transactions are at most 'lateness' older than the newest one of their account.
+
+    Evictions are batched: transactions out of the policy are only evicted once they are at least 'slack' times as
+    many as the ones in policy, so shifting the rest of the history is O(1) amortised per evicted transaction. Until
+    then, they are still kept on the account (e.g. an account keeps up to 'max_entries * (1 + slack)' transactions).
+
+    Evicted transactions are written to a 'ColdStorage' sink, if provided, or dropped otherwise. Queries over
+    intervals older than the retained history only see retained transactions.
+    """
+    def __init__(
+        self,
+        horizon: Union[timedelta, str, None] = AUTO,
+        max_entries: Optional[int] = None,
+        sink: Optional[ColdStorage] = None,
+        lateness: timedelta = timedelta(0),
+        slack: float = DEFAULT_SLACK
+    ):
+        """
+        Constructor method for RetentionPolicy
+
+        Args:
+            horizon (Union[timedelta, str, None]): Time span of history kept, relative to the newest transaction.
+            'auto' derives it from validations and None doesn't evict by time.
+            max_entries (Optional[int]): Maximum amount of transactions kept per account. None doesn't limit it.
+            sink (Optional[ColdStorage]): Where evicted transactions are written, if provided
+            lateness (timedelta): How much older than the newest transaction of an account transactions may arrive
+            slack (float): Out of policy transactions kept before evicting them at once, relative to the ones in
+            policy. Zero evicts them right away, shifting the whole history on each eviction.
+        """
+        if not (horizon is None or horizon == AUTO or (isinstance(horizon, timedelta) and horizon >= timedelta(0))):
+            raise ValueError(f"Expected a non negative timedelta, '{AUTO}' or None as horizon, got: {horizon}")
+
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f"Expected a positive maximum amount of entries, got: {max_entries}")
+
+        if lateness < timedelta(0):
+            raise ValueError(f"Expected a non negative lateness, got: {lateness}")
+
+        if slack < 0:
+            raise ValueError(f"Expected a non negative slack, got: {slack}")
+
+        self.horizon = horizon
+        self.max_entries = max_entries
+        self.sink = sink
+        self.lateness = lateness
+        self.slack = slack
+        self.evicted = 0
+
+    def apply(self, account: BankAccount, archive: bool = True) -> int:
+        """
+        Evicts transactions of an account that are out of the policy, once they are enough for a batch
+
+        Args:
+            account (BankAccount): Account whose transactions are evicted
+            archive (bool): If evicted transactions are written to the sink. Transactions evicted while replaying a
+            write-ahead log were already written by the run that logged them.
+
+        Returns:
+            evicted (int): Amount of evicted transactions
+        """
+        transactions = account.transactions
+        length = len(transactions)
+        if not length:
+            return 0
+
+        # Smallest amount of out of policy transactions evicted at once
+        batch = max(1, math.ceil(self.slack * length / (1 + self.slack)))
+
+        count = 0
+        if self.max_entries is not None and length > self.max_entries:
+            count = length - self.max_entries
+
+        newest = account.window.newest
+        if self.horizon is not None and newest is not None:
+            horizon = account.window.horizon if self.horizon == AUTO else self.horizon
+            cutoff = newest - (horizon + self.lateness) // MICROSECOND
+
+            # Transactions are kept in registration order, so only the oldest registered ones are looked at.
+            # Unless the last one of a batch is out of the horizon, there aren't enough to evict by time.
+            time = transactions[batch - 1].time
+            if count >= batch or (isinstance(time, int) and time < cutoff):
+                expired = 0
+                while expired < length:
+                    time = transactions[expired].time
+                    if not isinstance(time, int) or time >= cutoff:
+                        break
+                    expired += 1
+                count = max(count, expired)
+
+        if count < batch:
+            return 0
+
+        if archive and self.sink is not None:
+            self.sink.write(account_id=account.account_id, records=transactions[:count])
+
+        del transactions[:count]
+        self.evicted += count
+
+        return count
+
+    def close(self) -> None:
+        """
+        Closes the sink, if any
+
+        Returns:
+            None
+        """
+        if self.sink is not None:
+            self.sink.close()
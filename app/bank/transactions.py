@@ -1,38 +1,56 @@
 # Built-in libraries
-from typing import Generator
+from typing import Generator, Optional
 from datetime import datetime
 
 # Project libraries
 from app.bank.account import BankAccount
+from app.bank.retention import RetentionPolicy
+from app.bank.records import MERCHANTS, TransactionRecord, to_epoch_micros
 
 
 class BankStatement:
-    """An helper class to register and read transactions from an 'BankAccount'"""
+    """
+    An helper class to register and read transactions from an 'BankAccount'.
+    Transactions are stored as 'TransactionRecord', which are also the results of queries.
+    """
     @classmethod
-    def register(cls, account: BankAccount, transaction: dict) -> None:
+    def register(
+        cls,
+        account: BankAccount,
+        transaction: dict,
+        retention: Optional[RetentionPolicy] = None
+    ) -> TransactionRecord:
         """
         Register a transaction to an 'BankAccount'
 
         Args:
             account (dict): Account where transactions will be registered
             transaction (dict): A transaction to be registered at account
+            retention (Optional[RetentionPolicy]): Policy applied to account transactions once registered, if provided
 
         Returns:
-            None
+            record (TransactionRecord): The registered transaction
         """
         try:
+            record = TransactionRecord.from_transaction(transaction)
+
             # Debit the amount from the available limit
-            transaction_amount = transaction.get('transaction', {}).get('amount', 0)
-            account.available_limit -= transaction_amount
+            account.available_limit -= record.amount
 
             # Register the transaction
-            account.transactions.append(transaction)
+            account.transactions.append(record)
+            account.window.add(record)
+
+            if retention is not None:
+                retention.apply(account)
+
+            return record
 
         except Exception as e:
             raise Exception(f"Could not registry transaction. Details: {e}")
 
     @classmethod
-    def query_by_field(cls, account: BankAccount, field: str, value: any) -> Generator[dict, None, None]:
+    def query_by_field(cls, account: BankAccount, field: str, value: any) -> Generator[TransactionRecord, None, None]:
         """
         Query transactions on a bank account based on key: value pair
 
@@ -42,11 +60,11 @@ class BankStatement:
             value (any): Value to be searched for
 
        Yield:
-            t (dict): Transactions that meet the criteria
+            t (TransactionRecord): Transactions that meet the criteria
         """
 
         for t in account.transactions:
-            if t.get('transaction', {}).get(field, '') == value:
+            if t.get(field, '') == value:
                 yield t
 
 
@@ -57,10 +75,12 @@ class BankStatement:
         field: str,
         start_date: datetime,
         end_date: datetime
-    ) -> Generator[dict, None, None]:
+    ) -> Generator[TransactionRecord, None, None]:
         """
         Query transactions from a bank account based on a time interval.
         Will me yielded transactions where que date field is gather or equals to start_date and lower than end_date.
+        Recent intervals of the 'time' field are served by the account time window in O(log n + k), older ones fall
+        back to a scan over all account transactions.
 
         Expression: start_date <= field < end_date
 
@@ -71,9 +91,63 @@ class BankStatement:
             end_date (datetime):  End date to search for
 
         Yield:
-            t (dict): Transactions that meet the criteria
+            t (TransactionRecord): Transactions that meet the criteria
         """
-
+        if field != 'time':
+            for t in account.transactions:
+                if start_date <= t.get(field) < end_date:
+                    yield t
+            return
+
+        transactions = account.window.query(start_date=start_date, end_date=end_date)
+        if transactions is not None:
+            yield from transactions
+            return
+
+        start, end = to_epoch_micros(start_date), to_epoch_micros(end_date)
         for t in account.transactions:
-            if start_date <= t.get('transaction', {}).get(field) < end_date:
+            # Times that weren't python datetimes aren't comparable, the window doesn't index them either
+            if isinstance(t.time, int) and start <= t.time < end:
                 yield t
+
+    @classmethod
+    def has_similar_transaction(
+        cls,
+        account: BankAccount,
+        merchant: any,
+        amount: any,
+        start_date: datetime,
+        end_date: datetime
+    ) -> bool:
+        """
+        Checks if a bank account has a transaction with the same merchant and amount on a time interval.
+        Recent intervals are answered by the (merchant, amount) index of the account time window, older ones fall
+        back to a scan over the transactions on the interval.
+
+        Expression: start_date <= time < end_date
+
+        Args:
+            account (BankAccount): Account where transactions will be searched
+            merchant (any): Merchant to be searched for
+            amount (any): Amount to be searched for
+            start_date (datetime): Start date to search for
+            end_date (datetime):  End date to search for
+
+        Returns:
+            found (bool): If a similar transaction was found
+        """
+        found = account.window.has_pair(
+            merchant=merchant,
+            amount=amount,
+            start_date=start_date,
+            end_date=end_date
+        )
+        if found is not None:
+            return found
+
+        merchant_id = MERCHANTS.lookup(merchant)
+        for t in cls.query_by_date(account=account, field='time', start_date=start_date, end_date=end_date):
+            if t.merchant == merchant_id and t.amount == amount:
+                return True
+
+        return False
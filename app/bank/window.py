@@ -0,0 +1,246 @@
+# Built-in libraries
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Project libraries
+from app.bank.records import MERCHANTS, MICROSECOND, TransactionRecord, to_epoch_micros
+
+
+class TransactionWindow:
+    """
+    Time ordered index of the most recent transactions of an account.
+
+    Transactions are kept sorted by their 'time' field, so interval queries cost O(log n + k). Entries older than
+    'horizon' (relative to the newest registered transaction) are evicted, keeping the window bounded. The horizon
+    grows to the longest interval ever queried, so it always fits the validations in use.
+
+    The window only indexes records also kept on the account transactions list (it holds references, not copies).
+    Evicting from the window doesn't trim that list: the full history of an account still grows with every
+    transaction, unless a 'RetentionPolicy' bounds it.
+
+    A secondary index maps each (merchant, amount) pair to the times it was seen, so looking for similar
+    transactions is a single hash lookup instead of an interval scan.
+
+    Transactions are stored as 'TransactionRecord', and times as microseconds since epoch.
+    """
+    def __init__(self, horizon: timedelta = timedelta(0)):
+        """
+        Constructor method for TransactionWindow
+
+        Args:
+            horizon (timedelta): Initial time span kept on the window, relative to the newest transaction
+        """
+        self.horizon = horizon
+        self.newest = None
+        # Entries with time lower than 'covered_from' may have been evicted
+        self.covered_from = None
+        self._times: List[int] = []
+        self._seqs: List[int] = []
+        self._items: List[TransactionRecord] = []
+        self._pairs: Dict[Tuple[int, Hashable], List[int]] = {}
+        self._next_seq = 0
+        self._ordered = True
+
+    @property
+    def horizon(self) -> timedelta:
+        """Property for horizon attribute"""
+        return self._horizon
+
+    @horizon.setter
+    def horizon(self, value: timedelta) -> None:
+        """
+        Setter for horizon attribute
+
+        Args:
+            value (timedelta): Time span kept on the window
+
+        Returns:
+            None
+        """
+        self._horizon = value
+        self._horizon_micros = value // MICROSECOND
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[TransactionRecord]) -> 'TransactionWindow':
+        """
+        Builds a window from already registered transactions
+
+        Args:
+            transactions (Iterable[TransactionRecord]): Transactions, in registration order
+
+        Returns:
+            window (TransactionWindow): A window containing the given transactions
+        """
+        window = cls()
+        for transaction in transactions:
+            window.add(transaction)
+
+        return window
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def records(self) -> List[TransactionRecord]:
+        """
+        Gets all transactions kept on the window
+
+        Returns:
+            transactions (List[TransactionRecord]): Transactions, in registration order
+        """
+        if self._ordered:
+            return list(self._items)
+
+        return [self._items[p] for p in sorted(range(len(self._items)), key=self._seqs.__getitem__)]
+
+    def add(self, record: TransactionRecord) -> None:
+        """
+        Adds a transaction to the window, evicting the ones that got older than the horizon.
+        Transactions without a python datetime 'time' field aren't indexed.
+
+        Args:
+            record (TransactionRecord): Transaction to be added
+
+        Returns:
+            None
+        """
+        time = record.time
+        if not isinstance(time, int):
+            return
+
+        # Transactions older than the evicted ones wouldn't be ever served by the window
+        if self.covered_from is not None and time < self.covered_from:
+            return
+
+        seq = self._next_seq
+        self._next_seq += 1
+
+        pair_times = self._pairs.setdefault((record.merchant, record.amount), [])
+        if not pair_times or time >= pair_times[-1]:
+            pair_times.append(time)
+        else:
+            pair_times.insert(bisect_right(pair_times, time), time)
+
+        if not self._times or time >= self._times[-1]:
+            self._times.append(time)
+            self._seqs.append(seq)
+            self._items.append(record)
+        else:
+            position = bisect_right(self._times, time)
+            self._times.insert(position, time)
+            self._seqs.insert(position, seq)
+            self._items.insert(position, record)
+            self._ordered = False
+
+        if self.newest is None or time > self.newest:
+            self.newest = time
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes transactions older than the horizon, relative to the newest transaction
+
+        Returns:
+            None
+        """
+        cutoff = self.newest - self._horizon_micros
+        if self.covered_from is None or cutoff > self.covered_from:
+            self.covered_from = cutoff
+
+        position = bisect_left(self._times, cutoff)
+        if position:
+            for pair in {(r.merchant, r.amount) for r in self._items[:position]}:
+                pair_times = self._pairs[pair]
+                del pair_times[:bisect_left(pair_times, cutoff)]
+                if not pair_times:
+                    del self._pairs[pair]
+
+            del self._times[:position]
+            del self._seqs[:position]
+            del self._items[:position]
+
+    def _covers(self, start_date: datetime, end_date: datetime) -> Optional[Tuple[int, int]]:
+        """
+        Widens the horizon to fit an interval, checking if the window has all its transactions
+
+        Args:
+            start_date (datetime): Interval start
+            end_date (datetime): Interval end
+
+        Returns:
+            interval (Optional[Tuple[int, int]]): Interval as microseconds since epoch, or None if some of its
+            transactions may have already been evicted
+        """
+        if end_date - start_date > self._horizon:
+            self.horizon = end_date - start_date
+
+        start = to_epoch_micros(start_date)
+        if self.covered_from is not None and start < self.covered_from:
+            return None
+
+        return start, to_epoch_micros(end_date)
+
+    def query(self, start_date: datetime, end_date: datetime) -> Optional[List[TransactionRecord]]:
+        """
+        Query transactions where 'start_date <= time < end_date', in registration order.
+        The horizon is widened to fit the queried interval, so next queries of the same size can be served.
+
+        Args:
+            start_date (datetime): Start date to search for
+            end_date (datetime): End date to search for
+
+        Returns:
+            transactions (Optional[List[TransactionRecord]]): Transactions that meet the criteria, or None if some
+            of them may have already been evicted from the window
+        """
+        interval = self._covers(start_date=start_date, end_date=end_date)
+        if interval is None:
+            return None
+
+        low = bisect_left(self._times, interval[0])
+        high = bisect_left(self._times, interval[1], lo=low)
+
+        if self._ordered:
+            return self._items[low:high]
+
+        # Out of order transactions were added, restore the registration order
+        positions = sorted(range(low, high), key=self._seqs.__getitem__)
+        return [self._items[p] for p in positions]
+
+    def has_pair(
+        self,
+        merchant: Hashable,
+        amount: Hashable,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[bool]:
+        """
+        Checks if there is a transaction with the same merchant and amount where 'start_date <= time < end_date'.
+        The horizon is widened to fit the queried interval, as in 'query'.
+
+        Args:
+            merchant (Hashable): Merchant name to search for
+            amount (Hashable): Amount to search for
+            start_date (datetime): Start date to search for
+            end_date (datetime): End date to search for
+
+        Returns:
+            found (Optional[bool]): If a similar transaction was found, or None if it may have already been evicted
+            from the window
+        """
+        interval = self._covers(start_date=start_date, end_date=end_date)
+        if interval is None:
+            return None
+
+        pair_times = self._pairs.get((MERCHANTS.lookup(merchant), amount))
+        if not pair_times:
+            return False
+
+        start, end = interval
+
+        # Most of the time, the last registered transaction is the only candidate
+        if start <= pair_times[-1] < end:
+            return True
+
+        position = bisect_left(pair_times, start)
+        return position < len(pair_times) and pair_times[position] < end
@@ -0,0 +1,380 @@
+# Built-in libraries
+import json
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Generator, Hashable, Iterable, List, Optional, Tuple, Type, Union
+
+# Project libraries
+from app.bank.account import AccountInfo
+from app.bank.records import MERCHANTS, MICROSECOND, to_epoch_micros
+from app.parse.events import Event, as_event
+from app.auth.validation.base_validation import BaseValidation
+from app.auth.validation.custom_validation import (
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+)
+
+# External libraries
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Default amount of events loaded into columns at once
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Violation found by each supported validation
+SUPPORTED_VALIDATIONS = {
+    CardNotActiveValidation: 'card-not-active',
+    InsufficientLimitValidation: 'insufficient-limit',
+    HighFreqSmallIntervalValidation: 'high-frequency-small-interval',
+    DoubledTransaction: 'doubled-transaction'
+}
+
+
+def window_bounds(groups: 'np.ndarray', times: 'np.ndarray', window: int) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Finds, for each row, the rows of the same group with time in '[time - window, time)'.
+
+    Rows are sorted by (group, time rank), so the rows of each interval are a contiguous range of the sorted order,
+    found with binary searches for all rows at once.
+
+    Args:
+        groups (np.ndarray): Group of each row, as non negative integers
+        times (np.ndarray): Time of each row, as integers
+        window (int): Interval length, on the same unit of times
+
+    Returns:
+        bounds (Tuple[np.ndarray, np.ndarray, np.ndarray]): Row indexes sorted by (group, time) and, for each row,
+        start and end positions of its interval on the sorted indexes
+    """
+    unique_times = np.unique(times)
+    span = len(unique_times) + 1
+
+    upper = groups * span + np.searchsorted(unique_times, times)
+    lower = groups * span + np.searchsorted(unique_times, times - window)
+
+    order = np.argsort(upper, kind='stable')
+    keys = upper[order]
+
+    return order, np.searchsorted(keys, lower), np.searchsorted(keys, upper)
+
+
+class ColumnarAuthorizer:
+    """
+    Authorizer for offline replay of large inputs, producing the same processed events as 'Authorizer.process'.
+
+    Events are loaded in chunks into NumPy columns (account, time, amount and merchant of transactions). For each
+    transaction, the amount of transactions of the same account (and of the same account, merchant and amount)
+    within the validations windows is computed with vectorized sorted array operations. Since only accepted
+    transactions count, these are upper bounds: 'high-frequency-small-interval' and 'doubled-transaction' are only
+    checked exactly, against the accepted transactions of the interval, when the bound allows them.
+    Limits, accepted transactions and processed events are then computed on a single sequential pass.
+
+    Only the built-in validations (with any parameters) are supported, along with integer amounts. Accepted transactions the next chunk may
+    look at (within the validations windows of its oldest transaction, plus 'lateness') are carried over to it.
+    A transaction older than the carried ones raises ValueError, since it could look at dropped ones.
+
+    Requires NumPy.
+    """
+    def __init__(
+        self,
+        events: Iterable[dict],
+        validations: Iterable[Union[Type[BaseValidation], BaseValidation]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        lateness: timedelta = timedelta(0)
+    ):
+        """
+        Constructor method for ColumnarAuthorizer
+
+        Args:
+            events (Iterable[dict]): Parsed events, as received by 'Authorizer'
+            validations (Iterable[Union[Type[BaseValidation], BaseValidation]]): Validations to be applied, in order.
+            Must be built-in validations.
+            chunk_size (int): Amount of events loaded into columns at once
+            lateness (timedelta): Additional time span of accepted transactions carried over to the next chunk, so
+            transactions older than the ones of previous chunks are supported
+        """
+        if np is None:
+            raise ImportError("Columnar mode requires NumPy. Install it with 'pip install numpy'.")
+
+        if chunk_size <= 0:
+            raise ValueError(f"Expected a positive chunk size, got: {chunk_size}")
+
+        self.events = events
+        self.chunk_size = chunk_size
+        self.lateness = lateness // MICROSECOND
+        self.rules: List[BaseValidation] = [
+            validation() if isinstance(validation, type) else validation
+            for validation in validations
+        ]
+
+        for rule in self.rules:
+            if type(rule) not in SUPPORTED_VALIDATIONS:
+                raise ValueError(f"Columnar mode doesn't support validation: {type(rule).__name__}")
+
+        self.violations = [SUPPORTED_VALIDATIONS[type(rule)] for rule in self.rules]
+
+        # Window of each validation looking at recent transactions, in microseconds, and its threshold
+        self.windows = [
+            rule.window // MICROSECOND if type(rule) in (HighFreqSmallIntervalValidation, DoubledTransaction) else None
+            for rule in self.rules
+        ]
+        self.thresholds = [getattr(rule, 'threshold', 1) for rule in self.rules]
+
+        # Account state, indexed by account position
+        self._positions: Dict[Hashable, int] = {}
+        self._ids: List[Hashable] = []
+        self._created: List[bool] = []
+        self._active: List[bool] = []
+        self._limits: List[int] = []
+        self._infos: List[Optional[AccountInfo]] = []
+        self._encoded_ids: List[str] = []
+
+        self.window = max((window for window in self.windows if window is not None), default=None)
+
+        # Accepted transactions of previous chunks, as (account, time, amount, merchant) columns.
+        # Older ones than 'cutoff' were dropped.
+        self._carry = None
+        self._cutoff = None
+
+    def _position_of(self, account_id: Hashable) -> int:
+        position = self._positions.get(account_id)
+        if position is None:
+            position = self._positions[account_id] = len(self._ids)
+            self._ids.append(account_id)
+            self._created.append(False)
+            self._active.append(False)
+            self._limits.append(0)
+            self._infos.append(None)
+            self._encoded_ids.append(
+                '' if account_id is None else f'"account-id": {json.dumps(account_id, default=str)}, '
+            )
+
+        return position
+
+    def _info(self, position: int) -> AccountInfo:
+        """Account fields of processed events, the same as 'BankAccount.info'"""
+        info = self._infos[position]
+        if info is None:
+            account_id = self._ids[position]
+            active, limit = self._active[position], self._limits[position]
+
+            fields = {"active-card": active, "available-limit": limit}
+            if account_id is not None:
+                fields["account-id"] = account_id
+
+            if type(limit) is int:
+                encoded = (
+                    f'{{{self._encoded_ids[position]}"active-card": {"true" if active else "false"}, '
+                    f'"available-limit": {limit}}}'
+                )
+            else:
+                # Subclasses of int (e.g. bool) aren't formatted as JSON
+                encoded = json.dumps(fields, default=str, sort_keys=True)
+            info = self._infos[position] = AccountInfo(fields=fields, encoded=encoded)
+
+        return info
+
+    def process(self) -> Generator[dict, None, None]:
+        """
+        Processes all events
+
+        Yield:
+            event (dict): Processed events, the same as 'Authorizer.process'
+        """
+        events = iter(self.events)
+        while True:
+            chunk = [as_event(event) for event in islice(events, self.chunk_size)]
+            if not chunk:
+                break
+
+            yield from self._process_chunk(chunk)
+
+    def _columns(self, chunk: List[Event]) -> Tuple[List[int], 'np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """Loads the transactions of a chunk into columns, along with the position of each one on the chunk"""
+        rows, accounts, times, amounts, merchants = [], [], [], [], []
+        position_of = self._position_of
+        encode_merchant = MERCHANTS.encode
+
+        for position, event in enumerate(chunk):
+            if event.event_type != 'transaction':
+                continue
+
+            time, amount = event.time, event.amount
+            if not isinstance(time, datetime) or type(amount) is not int:
+                raise ValueError(f"Columnar mode only supports transactions with integer amount and time, got: {event}")
+
+            rows.append(position)
+            accounts.append(position_of(event.account_id))
+            times.append(to_epoch_micros(time))
+            amounts.append(amount)
+            merchants.append(encode_merchant(event.merchant))
+
+        return (
+            rows,
+            np.array(accounts, dtype=np.int64),
+            np.array(times, dtype=np.int64),
+            np.array(amounts, dtype=np.int64),
+            np.array(merchants, dtype=np.int64)
+        )
+
+    def _candidates(
+        self,
+        accounts: 'np.ndarray',
+        times: 'np.ndarray',
+        amounts: 'np.ndarray',
+        merchants: 'np.ndarray'
+    ) -> List[Optional[tuple]]:
+        """
+        Computes, for each transaction, the transactions that may lead to its 'high-frequency-small-interval' and
+        'doubled-transaction' violations
+
+        Returns:
+            candidates (List[Optional[tuple]]): For each validation looking at recent transactions, the sorted row
+            indexes and the start and end positions of each row interval on them, as lists. None for other ones.
+        """
+        candidates, computed = [], {}
+        groups = None
+
+        for violation, window in zip(self.violations, self.windows):
+            if window is None:
+                candidates.append(None)
+                continue
+
+            # Validations of the same kind and window share their candidates
+            key = (violation, window)
+            if key not in computed:
+                if violation == 'high-frequency-small-interval':
+                    order, start, end = window_bounds(accounts, times, window)
+                else:
+                    if groups is None:
+                        _, groups = np.unique(
+                            np.stack([accounts, merchants, amounts], axis=1), axis=0, return_inverse=True
+                        )
+                    order, start, end = window_bounds(groups.reshape(-1), times, window)
+
+                computed[key] = (order.tolist(), start.tolist(), end.tolist())
+
+            candidates.append(computed[key])
+
+        return candidates
+
+    def _process_chunk(self, chunk: List[Event]) -> Generator[dict, None, None]:
+        rows, accounts, times, amounts, merchants = self._columns(chunk)
+
+        # Accepted transactions of previous chunks come first, so they precede every transaction of the chunk
+        carried = 0
+        if self.window is not None and len(rows):
+            required_from = int(times.min()) - self.window
+            if self._cutoff is not None and required_from < self._cutoff:
+                raise ValueError(
+                    'Columnar mode found a transaction older than the accepted transactions kept from previous '
+                    'chunks. Use a larger chunk size or lateness.'
+                )
+
+            if self._carry is not None:
+                keep = self._carry[1] >= required_from - self.lateness
+                carry = [column[keep] for column in self._carry]
+                carried = len(carry[0])
+                accounts, times, amounts, merchants = (
+                    np.concatenate([old, new]) for old, new in zip(carry, (accounts, times, amounts, merchants))
+                )
+
+            if self._carry is not None:
+                cutoff = required_from - self.lateness
+                self._cutoff = cutoff if self._cutoff is None else max(self._cutoff, cutoff)
+
+        checks = list(zip(self.violations, self.thresholds, self._candidates(accounts, times, amounts, merchants)))
+
+        accepted = [True] * carried + [False] * len(rows)
+        account_list = accounts.tolist()
+        amount_list = amounts.tolist()
+        transaction_rows = dict(zip(rows, range(carried, carried + len(rows))))
+
+        created, active, limits, infos = self._created, self._active, self._limits, self._infos
+
+        for position, event in enumerate(chunk):
+            event_type = event.event_type
+
+            if event_type == 'transaction':
+                row = transaction_rows[position]
+                account = account_list[row]
+
+                if not created[account]:
+                    account_id = self._ids[account]
+                    yield {
+                        "account": {} if account_id is None else {'account-id': account_id},
+                        'violations': ['account-not-initialized']
+                    }
+                    continue
+
+                amount = amount_list[row]
+                violations = []
+                for violation, threshold, candidates in checks:
+                    if violation == 'card-not-active':
+                        found = not active[account]
+
+                    elif violation == 'insufficient-limit':
+                        found = limits[account] < amount and active[account]
+
+                    else:
+                        # Recent transactions of the account (or repeated ones), up to the validation threshold
+                        order, starts, ends = candidates
+                        start, end = starts[row], ends[row]
+                        found = end - start >= threshold and self._count_accepted(
+                            order, start, end, row, accepted, threshold
+                        ) >= threshold
+
+                    if found:
+                        violations.append(violation)
+
+                if not violations:
+                    accepted[row] = True
+                    limits[account] -= amount
+                    infos[account] = None
+
+                yield {"account": self._info(account), 'violations': violations}
+
+            elif event_type == 'account_creation':
+                account = self._position_of(event.account_id)
+
+                if created[account]:
+                    yield {"account": self._info(account), 'violations': ["account-already-initialized"]}
+                    continue
+
+                active_card, available_limit = event.active_card, event.available_limit
+                if not isinstance(active_card, bool):
+                    raise TypeError(f"Expected type 'boolean', got: {type(active_card)} instead")
+                if not isinstance(available_limit, int):
+                    raise TypeError(f"Expected integer, but got: {type(available_limit)}")
+
+                created[account] = True
+                active[account] = active_card
+                limits[account] = available_limit
+                infos[account] = None
+
+                yield {"account": self._info(account), 'violations': []}
+
+            else:
+                data = event.to_dict()
+                data.update({'violations': ['unknown-error']})
+                yield data
+
+        if self.window is not None and len(rows):
+            keep = np.array(accepted, dtype=bool)
+            self._carry = (accounts[keep], times[keep], amounts[keep], merchants[keep])
+
+    @staticmethod
+    def _count_accepted(order: List[int], start: int, end: int, row: int, accepted: List[bool], limit: int) -> int:
+        """Counts, up to limit, the accepted rows of an interval that came before the given row"""
+        count = 0
+        for other in order[start:end]:
+            if other < row and accepted[other]:
+                count += 1
+                if count >= limit:
+                    break
+
+        return count
@@ -0,0 +1,305 @@
+# Built-in libraries
+import argparse
+from datetime import timedelta
+from typing import List, Optional
+
+# Project libraries
+from app.bank.retention import AUTO
+from app.storage.wal import FSYNC_POLICIES, DEFAULT_GROUP_INTERVAL, DEFAULT_GROUP_SIZE
+from app.parse.io import DEFAULT_BUFFER_SIZE, DEFAULT_FLUSH_SIZE, DEFAULT_FLUSH_INTERVAL
+
+# Flags of the modes run instead of authorizing input events, by precedence
+MODES = ('--submit', '--prefork', '--serve', '--route', '--what-if')
+
+
+def retention_horizon(value: str):
+    """
+    Parses the retention horizon command line argument
+
+    Args:
+        value (str): Amount of seconds or 'auto'
+
+    Returns:
+        horizon (Union[timedelta, str]): The horizon, as expected by 'RetentionPolicy'
+    """
+    if value == AUTO:
+        return AUTO
+
+    try:
+        return timedelta(seconds=float(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected an amount of seconds or '{AUTO}', got: {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the command line arguments parser
+
+    Returns:
+        parser (argparse.ArgumentParser): The parser
+    """
+    parser = argparse.ArgumentParser(description='Authorizes account events received on standard input (stdin)')
+    parser.add_argument(
+        '--input',
+        help='JSON lines file events are read from, memory-mapped, instead of standard input'
+    )
+    parser.add_argument(
+        '--buffer-size',
+        type=int,
+        default=DEFAULT_BUFFER_SIZE,
+        help='Maximum amount of characters read from standard input at once'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=0,
+        help='Amount of worker processes parsing events, alongside authorization. Zero parses them on the main process'
+    )
+    parser.add_argument(
+        '--parse-chunk-size',
+        type=int,
+        help='Amount of lines parsed at once by each parse worker. Defaults to 1000'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Amount of worker processes. Events are partitioned among workers by account id'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        help='Amount of events read before partitioning them among workers or router backends. Defaults to 1000'
+    )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='Loads events into NumPy columns, for offline replay of large inputs. Requires NumPy'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        help='Amount of events loaded into columns at once, on columnar mode. Defaults to 100000'
+    )
+    parser.add_argument(
+        '--max-lateness',
+        type=float,
+        default=0.0,
+        help='Amount of seconds a transaction may be older than the newest one, kept by columnar mode and retention'
+    )
+    parser.add_argument(
+        '--flush-size',
+        type=int,
+        default=DEFAULT_FLUSH_SIZE,
+        help='Amount of characters buffered before writing to standard output. Zero writes every event right away'
+    )
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help='Maximum amount of seconds between output flushes, checked on each write. Output is also flushed when '
+             'standard input stalls'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='Collects stage and validation timings, logging them when processing is done'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        help='Collects stage and validation timings, appending snapshots to this file as JSON lines'
+    )
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        help='Amount of seconds between metrics snapshots. If not provided, only the final snapshot is exported'
+    )
+
+    parser.add_argument(
+        '--snapshot',
+        help='Restores account state from this file, if it exists, and saves account state to it when done'
+    )
+
+    parser.add_argument(
+        '--wal',
+        help='Write-ahead log file. Changes logged on it are replayed before processing and new ones are appended'
+    )
+    parser.add_argument(
+        '--wal-fsync',
+        choices=FSYNC_POLICIES,
+        default='group',
+        help='When the write-ahead log is synced to disk: on every change, in groups of changes or never'
+    )
+    parser.add_argument(
+        '--wal-group-interval',
+        type=float,
+        default=DEFAULT_GROUP_INTERVAL,
+        help="Maximum amount of seconds a change waits to be synced to disk, on 'group' policy"
+    )
+    parser.add_argument(
+        '--wal-group-size',
+        type=int,
+        default=DEFAULT_GROUP_SIZE,
+        help="Maximum amount of changes synced to disk at once, on 'group' policy"
+    )
+
+    parser.add_argument(
+        '--retention-horizon',
+        type=retention_horizon,
+        help=f"Seconds of transaction history kept per account, or '{AUTO}' to keep what validations need. Without "
+             'retention options, the history of each account is never evicted'
+    )
+    parser.add_argument(
+        '--retention-max-entries',
+        type=int,
+        help='Maximum amount of transactions kept per account'
+    )
+    parser.add_argument(
+        '--cold-storage',
+        help='File where transactions evicted by the retention policy are appended, instead of being dropped'
+    )
+
+    parser.add_argument(
+        '--what-if',
+        help='JSON file of validation scenarios. Events are parsed once and authorized on every scenario, writing a '
+             'summary of the violations of each one, compared to the first, to standard output'
+    )
+    parser.add_argument(
+        '--what-if-output',
+        help='Directory where the processed events of each what-if scenario are written, as <scenario>.jsonl'
+    )
+
+    parser.add_argument(
+        '--async-logging',
+        action='store_true',
+        help='Writes log records on a background thread, so logging never blocks event processing on I/O'
+    )
+
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Runs as a server, receiving events over TCP or a Unix socket instead of standard input'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Server TCP host')
+    parser.add_argument('--port', type=int, default=8000, help='Server TCP port')
+    parser.add_argument(
+        '--unix-socket',
+        help='Server Unix socket path, used instead of TCP if provided. Required by --prefork and --submit'
+    )
+    parser.add_argument(
+        '--max-connections',
+        type=int,
+        help='Maximum amount of connections served at once. Further connections wait for a free slot. Defaults to 128'
+    )
+
+    parser.add_argument(
+        '--prefork',
+        type=int,
+        default=0,
+        help='Runs this amount of pre-forked workers, authorizing input files whose paths are sent over --unix-socket'
+    )
+    parser.add_argument(
+        '--submit',
+        help='Sends an input file to the pre-forked workers listening on --unix-socket, writing its output to stdout'
+    )
+
+    parser.add_argument(
+        '--handoff-token-file',
+        help="File holding the secret a 'Router' must send to hand off accounts of the server. Without it, the "
+             'server refuses handoff'
+    )
+    parser.add_argument(
+        '--route',
+        nargs='+',
+        metavar='BACKEND',
+        help='Routes events by account to authorizer backends on a consistent hash ring: "local" for a worker process, '
+             '"unix:PATH" or "HOST:PORT" for a server started with --serve'
+    )
+
+    return parser
+
+
+def mode_of(args: argparse.Namespace) -> Optional[str]:
+    """
+    Gets the mode requested on command line arguments, other than authorizing input events
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        mode (Optional[str]): Flag of the mode, None if input events are authorized
+    """
+    modes = _set_flags(args, MODES)
+
+    return modes[0] if modes else None
+
+
+def check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Checks that arguments can be used together, exiting with the parser usage if they can't.
+    Snapshots, write-ahead log and retention are only supported by sequential processing and servers, and metrics
+    only by sequential processing.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser of the arguments
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    modes = _set_flags(args, MODES)
+    if len(modes) > 1:
+        parser.error(f"{modes[0]} can't be used with {modes[1]}")
+    mode = modes[0] if modes else None
+
+    if mode in ('--prefork', '--submit') and not args.unix_socket:
+        parser.error(f"{mode} requires --unix-socket")
+
+    if args.what_if_output and mode != '--what-if':
+        parser.error('--what-if-output requires --what-if')
+
+    if args.handoff_token_file and mode != '--serve':
+        parser.error('--handoff-token-file requires --serve')
+
+    parallel = _set_flags(args, ('--workers', '--columnar'))
+    if len(parallel) > 1:
+        parser.error("--workers can't be used with --columnar")
+
+    if parallel and mode is not None:
+        parser.error(f"{parallel[0]} can't be used with {mode}")
+
+    state = _set_flags(args, ('--snapshot', '--wal', '--retention-horizon', '--retention-max-entries', '--cold-storage'))
+    if state and (parallel or mode not in (None, '--serve')):
+        parser.error(f"{state[0]} can't be used with {(parallel or [mode])[0]}")
+
+    metrics = _set_flags(args, ('--metrics', '--metrics-file'))
+    if metrics and (parallel or mode is not None):
+        parser.error(f"{metrics[0]} can't be used with {(parallel or [mode])[0]}")
+
+
+def _set_flags(args: argparse.Namespace, flags: tuple) -> List[str]:
+    """Flags of the given ones set on arguments, other than to their default. '--workers' is set above one."""
+    values = {flag: getattr(args, flag[2:].replace('-', '_')) for flag in flags}
+    if '--workers' in values:
+        values['--workers'] = values['--workers'] > 1
+
+    # Not truthiness, since a zero horizon (a falsy timedelta) is set
+    return [flag for flag, value in values.items() if value not in (None, False, 0, '')]
+
+
+def parse_args(args: list = None) -> argparse.Namespace:
+    """
+    Parses command line arguments, exiting if they can't be used together
+
+    Args:
+        args (list): Arguments to be parsed. If not provided, uses 'sys.argv'
+
+    Returns:
+        Parsed arguments
+    """
+    parser = build_parser()
+    parsed = parser.parse_args(args)
+    check_args(parser, parsed)
+
+    return parsed
@@ -0,0 +1,184 @@
+# Built-in libraries
+import os
+import time
+import argparse
+from datetime import timedelta
+from typing import Optional
+
+# Project libraries
+# Modules only needed by some modes (NumPy and process pools) are imported by the functions building them, so short
+# runs don't pay for their import. See 'benchmarks/bench_startup.py'.
+from app.service.logging import logger
+from app.service.metrics import Instrumentation, file_exporter, log_exporter
+from app.auth.authorizer import Authorizer
+from app.bank.retention import AUTO, RetentionPolicy
+from app.storage.cold_storage import ColdStorage
+from app.storage.wal import WriteAheadLog
+from app.auth.validation.custom_validation import (
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+)
+
+VALIDATIONS = [
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+]
+
+
+def build_instrumentation(args: argparse.Namespace) -> Optional[Instrumentation]:
+    """
+    Builds the instrumentation requested on command line arguments
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        instrumentation (Optional[Instrumentation]): The instrumentation, or None if metrics weren't requested
+    """
+    if not (args.metrics or args.metrics_file):
+        return None
+
+    return Instrumentation(
+        export_interval=args.metrics_interval,
+        exporter=file_exporter(args.metrics_file) if args.metrics_file else log_exporter(logger)
+    )
+
+
+def build_retention(args: argparse.Namespace) -> Optional[RetentionPolicy]:
+    """
+    Builds the retention policy requested on command line arguments
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        retention (Optional[RetentionPolicy]): The policy, or None if retention wasn't requested
+    """
+    if args.retention_horizon is None and args.retention_max_entries is None and not args.cold_storage:
+        return None
+
+    return RetentionPolicy(
+        horizon=args.retention_horizon if args.retention_horizon is not None else AUTO,
+        max_entries=args.retention_max_entries,
+        sink=ColdStorage(path=args.cold_storage) if args.cold_storage else None,
+        lateness=timedelta(seconds=args.max_lateness)
+    )
+
+
+def build_authorizer(args: argparse.Namespace, events, instrumentation: Optional[Instrumentation]):
+    """
+    Builds the authorizer requested on command line arguments: sequential, sharded among worker processes or
+    columnar. Snapshots, write-ahead log, retention and metrics are only supported by the sequential one, which
+    'check_args' already checked.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+        events: Parsed input events
+        instrumentation (Optional[Instrumentation]): Where timings are recorded, if requested
+
+    Returns:
+        auth (Union[Authorizer, ShardedAuthorizer, ColumnarAuthorizer]): The authorizer
+    """
+    if args.columnar:
+        from app.batch.columnar import ColumnarAuthorizer, DEFAULT_CHUNK_SIZE
+
+        return ColumnarAuthorizer(
+            events=events,
+            validations=VALIDATIONS,
+            chunk_size=DEFAULT_CHUNK_SIZE if args.chunk_size is None else args.chunk_size,
+            lateness=timedelta(seconds=args.max_lateness)
+        )
+
+    if args.workers > 1:
+        from app.auth.parallel import ShardedAuthorizer, DEFAULT_BATCH_SIZE
+
+        return ShardedAuthorizer(
+            events=events,
+            validations=VALIDATIONS,
+            workers=args.workers,
+            batch_size=DEFAULT_BATCH_SIZE if args.batch_size is None else args.batch_size
+        )
+
+    auth = Authorizer(
+        events=events,
+        validations=VALIDATIONS,
+        instrumentation=instrumentation,
+        retention=build_retention(args)
+    )
+    restore_snapshot(auth, path=args.snapshot)
+    open_wal(auth, args)
+
+    return auth
+
+
+def restore_snapshot(auth: Authorizer, path: Optional[str]) -> None:
+    """
+    Restores account state from a snapshot file, if it was provided and exists
+
+    Args:
+        auth (Authorizer): Authorizer where state is restored
+        path (Optional[str]): Snapshot file path
+
+    Returns:
+        None
+    """
+    if path and os.path.exists(path):
+        start = time.perf_counter()
+        auth.load_snapshot(path=path)
+        logger.info(f"Restored {len(auth.accounts)} accounts from {path} in {time.perf_counter() - start:.3f}s.")
+
+
+def open_wal(auth: Authorizer, args: argparse.Namespace) -> None:
+    """
+    Replays the write-ahead log requested on command line arguments, if any, and opens it for new changes
+
+    Args:
+        auth (Authorizer): Authorizer where changes are replayed and logged
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    if not args.wal:
+        return
+
+    if os.path.exists(args.wal):
+        start = time.perf_counter()
+        replayed = auth.recover(path=args.wal)
+        logger.info(f"Replayed {replayed} changes from {args.wal} in {time.perf_counter() - start:.3f}s.")
+
+    auth.wal = WriteAheadLog(
+        path=args.wal,
+        fsync=args.wal_fsync,
+        group_interval=args.wal_group_interval,
+        group_size=args.wal_group_size,
+        lsn=auth.lsn
+    )
+
+
+def close(auth: Authorizer, args: argparse.Namespace) -> None:
+    """
+    Saves the snapshot and closes the write-ahead log and the retention policy requested on command line arguments,
+    if any
+
+    Args:
+        auth (Authorizer): Authorizer holding account state
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    if args.snapshot:
+        auth.save_snapshot(path=args.snapshot)
+        logger.info(f"Snapshot saved to {args.snapshot}.")
+
+    if auth.wal is not None:
+        auth.wal.close()
+
+    if auth.retention is not None:
+        auth.retention.close()
+        logger.info(f"Evicted {auth.retention.evicted} transactions from account history.")
@@ -0,0 +1,395 @@
+# Built-in libraries
+import os
+import sys
+import json
+import time
+import inspect
+import argparse
+import importlib
+from contextlib import ExitStack
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, TextIO
+
+# Project libraries
+# Modules only needed by some modes (asyncio, process pools and memory-mapped files) are imported by the functions
+# running them, so short runs don't pay for their import. See 'benchmarks/bench_startup.py'.
+from app.service.logging import logger
+from app.auth.authorizer import Authorizer
+from app.parse.io import OutputWriter, read_lines, parse_input_events
+from app.cli.builders import (
+    VALIDATIONS,
+    build_instrumentation,
+    build_retention,
+    build_authorizer,
+    restore_snapshot,
+    open_wal,
+    close
+)
+
+
+def read_events(args: argparse.Namespace, on_wait: Optional[Callable[[], None]] = None):
+    """
+    Parses the input events: from the '--input' file, memory-mapped, or from stdin, on parse workers if requested
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+        on_wait (Optional[Callable[[], None]]): Called before blocking on stdin for more input, when it's read by
+        the calling thread
+
+    Returns:
+        events: Parsed input events
+    """
+    if args.input:
+        from app.parse.mapped import parse_file_events
+
+        return parse_file_events(path=args.input, workers=args.parse_workers)
+
+    if args.parse_workers:
+        from app.parse.parallel import parse_input_events_parallel, DEFAULT_CHUNK_SIZE
+
+        return parse_input_events_parallel(
+            buffer_size=args.buffer_size,
+            workers=args.parse_workers,
+            chunk_size=DEFAULT_CHUNK_SIZE if args.parse_chunk_size is None else args.parse_chunk_size
+        )
+
+    return parse_input_events(buffer_size=args.buffer_size, on_wait=on_wait)
+
+
+def authorize(args: argparse.Namespace) -> None:
+    """
+    Authorizes input events on the authorizer requested on command line arguments, writing processed events to stdout
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    instrumentation = build_instrumentation(args)
+    writer = OutputWriter(flush_size=args.flush_size, flush_interval=args.flush_interval)
+
+    # Output buffered when input stalls is written right away, unless events are read by a worker thread
+    events = read_events(args, on_wait=writer.flush if args.workers <= 1 else None)
+    if not events:
+        logger.warning('No events found. Skipping execution.')
+        return
+
+    logger.info('Starting events processing.')
+
+    auth = build_authorizer(args, events=events, instrumentation=instrumentation)
+    if isinstance(auth, Authorizer) and auth.wal is not None:
+        writer.barrier = auth.wal.commit
+
+    with writer:
+        if instrumentation is None:
+            for processed_event in auth.process():
+                # Write event to stdout
+                writer.write(processed_event)
+
+        else:
+            clock = time.perf_counter_ns
+            for processed_event in auth.process():
+                start = clock()
+                writer.write(processed_event)
+                instrumentation.record_stage('serialize', clock() - start)
+
+    if instrumentation is not None:
+        instrumentation.export()
+
+    if isinstance(auth, Authorizer):
+        close(auth, args)
+
+    logger.info("Done! All events have been processed.")
+
+
+def build_scenarios(spec: dict) -> Dict[str, list]:
+    """
+    Builds the validations of each what-if scenario. Scenarios start from the default validations, overriding the
+    parameters of the ones given by class name (with 'window' in seconds) or leaving out the ones given as null, e.g.:
+        {"baseline": {}, "strict": {"HighFreqSmallIntervalValidation": {"threshold": 2}, "DoubledTransaction": null}}
+
+    Args:
+        spec (dict): Overrides of each scenario, by name
+
+    Returns:
+        scenarios (Dict[str, list]): Validations of each scenario, by name
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"Expected an object of scenarios by name, got: {type(spec).__name__}")
+
+    by_name = {validation.__name__: validation for validation in VALIDATIONS}
+    scenarios = {}
+
+    for name, overrides in spec.items():
+        if not name or os.sep in name:
+            raise ValueError(f"Expected a scenario name usable as file name, got: {name!r}")
+
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Expected an object of validations on scenario {name!r}, got: {type(overrides).__name__}")
+
+        unknown = set(overrides) - set(by_name)
+        if unknown:
+            raise ValueError(f"Unknown validations on scenario {name!r}: {', '.join(sorted(unknown))}")
+
+        validations = []
+        for validation in VALIDATIONS:
+            if validation.__name__ not in overrides:
+                validations.append(validation)
+                continue
+
+            parameters = overrides[validation.__name__]
+            if parameters is None:
+                continue
+
+            validations.append(_build_validation(scenario=name, validation=validation, parameters=parameters))
+
+        scenarios[name] = validations
+
+    return scenarios
+
+
+def _build_validation(scenario: str, validation: type, parameters: dict):
+    """Builds a validation of a what-if scenario, checking its parameters are numbers the constructor takes"""
+    key = f"{validation.__name__!r} on scenario {scenario!r}"
+    if not isinstance(parameters, dict):
+        raise ValueError(f"Expected an object of parameters or null for {key}, got: {type(parameters).__name__}")
+
+    accepted = inspect.signature(validation).parameters
+    for parameter, value in parameters.items():
+        if parameter not in accepted:
+            raise ValueError(f"Unknown parameter {parameter!r} for {key}")
+
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Expected a number as {parameter!r} of {key}, got: {value!r}")
+
+    if 'window' in parameters:
+        parameters = {**parameters, 'window': timedelta(seconds=parameters['window'])}
+
+    try:
+        return validation(**parameters)
+    except ValueError as e:
+        raise ValueError(f"Invalid parameters for {key}: {e}")
+
+
+def what_if(args: argparse.Namespace) -> None:
+    """
+    Authorizes input events on every scenario of the what-if file, parsing them once. See 'WhatIfReplay'.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    from app.auth.whatif import WhatIfReplay
+
+    try:
+        with open(args.what_if) as f:
+            scenarios = build_scenarios(json.load(f))
+    except (ValueError, OSError) as e:
+        logger.error('Invalid what-if scenarios. Details: %s', e)
+        sys.exit(2)
+
+    logger.info('Starting events processing on what-if scenarios.')
+    replay = WhatIfReplay(events=read_events(args), scenarios=scenarios)
+
+    with ExitStack() as stack:
+        writers = {}
+        if args.what_if_output:
+            os.makedirs(args.what_if_output, exist_ok=True)
+            for name in scenarios:
+                stream = stack.enter_context(open(os.path.join(args.what_if_output, f"{name}.jsonl"), 'w'))
+                writers[name] = stack.enter_context(
+                    OutputWriter(stream=stream, flush_size=args.flush_size, flush_interval=args.flush_interval)
+                )
+
+        for processed_events in replay.process():
+            for name, writer in writers.items():
+                writer.write(processed_events[name])
+
+    sys.stdout.write(f"{json.dumps(replay.summary(), indent=2)}\n")
+    logger.info("Done! All events have been processed.")
+
+
+def read_handoff_token(args: argparse.Namespace) -> Optional[str]:
+    """
+    Reads the handoff token from the file requested on command line arguments, if any
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        token (Optional[str]): The token, without surrounding whitespace, or None if no file was provided
+    """
+    if not args.handoff_token_file:
+        return None
+
+    with open(args.handoff_token_file) as f:
+        token = f.read().strip()
+
+    if not token:
+        raise ValueError(f"Empty handoff token file: {args.handoff_token_file}")
+
+    return token
+
+
+def serve(args: argparse.Namespace) -> None:
+    """
+    Runs the authorizer as a server until interrupted
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    import asyncio
+    from app.server.server import AuthorizerServer, DEFAULT_MAX_CONNECTIONS
+
+    try:
+        handoff_token = read_handoff_token(args)
+    except (ValueError, OSError) as e:
+        logger.error('Invalid handoff token. Details: %s', e)
+        sys.exit(2)
+
+    server = AuthorizerServer(
+        validations=VALIDATIONS,
+        max_connections=DEFAULT_MAX_CONNECTIONS if args.max_connections is None else args.max_connections,
+        handoff_token=handoff_token
+    )
+    server.authorizer.retention = build_retention(args)
+    restore_snapshot(server.authorizer, path=args.snapshot)
+    open_wal(server.authorizer, args)
+
+    try:
+        asyncio.run(server.serve_forever(host=args.host, port=args.port, unix_socket=args.unix_socket))
+    except KeyboardInterrupt:
+        logger.info('Server stopped.')
+
+    close(server.authorizer, args)
+
+
+def authorize_file(path: str, stream: TextIO, args: argparse.Namespace) -> None:
+    """
+    Authorizes the events of an input file on a new 'Authorizer', as a run of its own, writing processed events to a
+    stream. Served by pre-forked workers.
+
+    Args:
+        path (str): Input file path
+        stream (TextIO): Text stream where processed events are written
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    from app.parse.mapped import parse_file_events
+
+    auth = Authorizer(events=parse_file_events(path=path), validations=VALIDATIONS)
+    with OutputWriter(stream=stream, flush_size=args.flush_size, flush_interval=args.flush_interval) as writer:
+        for processed_event in auth.process():
+            writer.write(processed_event)
+
+
+def prefork(args: argparse.Namespace) -> None:
+    """
+    Runs pre-forked workers authorizing input files until interrupted. See 'PreforkServer'.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    from app.server.prefork import PreforkServer
+
+    # Imported before forking, so workers inherit it instead of importing it on their first request
+    importlib.import_module('app.parse.mapped')
+
+    server = PreforkServer(
+        handler=lambda path, stream: authorize_file(path=path, stream=stream, args=args),
+        path=args.unix_socket,
+        workers=args.prefork
+    )
+    server.serve_forever()
+
+
+def submit(args: argparse.Namespace) -> None:
+    """
+    Sends the input file to pre-forked workers, writing its processed events to stdout. See 'PreforkServer'.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    from app.server.prefork import submit as submit_file
+
+    sys.stdout.writelines(submit_file(path=args.submit, unix_socket=args.unix_socket))
+
+
+def build_backends(specs: List[str]) -> dict:
+    """
+    Builds the router backends requested on command line arguments
+
+    Args:
+        specs (List[str]): Backend of each '--route' argument: 'local', 'unix:PATH' or 'HOST:PORT'
+
+    Returns:
+        backends (dict): Backends by name. Servers are named by their address, local ones by their position.
+    """
+    from app.server.router import LocalBackend, ServerBackend
+
+    backends = {}
+    for position, spec in enumerate(specs):
+        if spec in backends:
+            raise ValueError(f"Backend listed twice: {spec}")
+
+        if spec == 'local':
+            backends[f"local-{position}"] = LocalBackend(validations=VALIDATIONS)
+        elif spec.startswith('unix:'):
+            backends[spec] = ServerBackend(unix_socket=spec[len('unix:'):])
+        else:
+            host, _, port = spec.rpartition(':')
+            if not host or not port.isdigit():
+                raise ValueError(f"Invalid backend: {spec}")
+            backends[spec] = ServerBackend(host=host, port=int(port))
+
+    return backends
+
+
+def route(args: argparse.Namespace) -> None:
+    """
+    Authorizes input events on the router backends requested on command line arguments, writing processed events to
+    stdout. See 'Router'.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        None
+    """
+    from app.server.router import Router, DEFAULT_BATCH_SIZE
+
+    try:
+        backends = build_backends(args.route)
+    except (ValueError, OSError) as e:
+        logger.error('Invalid router backends. Details: %s', e)
+        sys.exit(2)
+
+    logger.info('Starting events processing on %d backends.', len(backends))
+    router = Router(
+        backends=backends,
+        batch_size=DEFAULT_BATCH_SIZE if args.batch_size is None else args.batch_size
+    )
+
+    with ExitStack() as stack:
+        stream = stack.enter_context(open(args.input)) if args.input else sys.stdin
+        writer = stack.enter_context(OutputWriter(flush_size=args.flush_size, flush_interval=args.flush_interval))
+        stack.callback(router.close)
+
+        for line in router.process(read_lines(stream=stream, buffer_size=args.buffer_size)):
+            writer.write_line(line)
+
+    logger.info("Done! All events have been processed.")
@@ -0,0 +1,158 @@
+# Built-in libraries
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+
+class Event(Mapping):
+    """
+    Base of parsed events. Fields are slotted attributes, read directly by the 'Authorizer', validations and
+    'BankStatement'.
+
+    Events are also read-only mappings with the same keys and values as the dicts events used to be (e.g.
+    'event.get("transaction")' or 'event["order"]'), so code written against dict events keeps working, only slower.
+    """
+    __slots__ = ()
+
+    event_type = 'unknown'
+
+    def to_dict(self) -> dict:
+        """
+        Gets the event as a dict, the same as 'parse_event' used to return
+
+        Returns:
+            event (dict): Event payload along with 'event_type' and 'order'
+        """
+        raise NotImplementedError
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class AccountCreation(Event):
+    """Account creation event"""
+    __slots__ = ('order', 'account_id', 'active_card', 'available_limit', 'payload')
+
+    event_type = 'account_creation'
+
+    def __init__(self, payload: dict, order: int = None):
+        """
+        Constructor method for AccountCreation
+
+        Args:
+            payload (dict): The 'account' field of the event
+            order (int): Position of the event on its input
+        """
+        self.order = order
+        self.payload = payload
+        self.account_id = payload.get('account-id')
+        self.active_card = payload.get('active-card')
+        self.available_limit = payload.get('available-limit')
+
+    def __reduce__(self):
+        return AccountCreation, (self.payload, self.order)
+
+    def to_dict(self) -> dict:
+        return {'account': self.payload, 'event_type': self.event_type, 'order': self.order}
+
+
+class Transaction(Event):
+    """Transaction event. 'time' is a python datetime, once parsed."""
+    __slots__ = ('order', 'account_id', 'merchant', 'amount', 'time', 'payload')
+
+    event_type = 'transaction'
+
+    def __init__(self, payload: dict, order: int = None):
+        """
+        Constructor method for Transaction
+
+        Args:
+            payload (dict): The 'transaction' field of the event
+            order (int): Position of the event on its input
+        """
+        self.order = order
+        self.payload = payload
+        self.account_id = payload.get('account-id')
+        self.merchant = payload.get('merchant', '')
+        self.amount = payload.get('amount', 0)
+        self.time = payload.get('time')
+
+    def __reduce__(self):
+        return Transaction, (self.payload, self.order)
+
+    def to_dict(self) -> dict:
+        return {'transaction': self.payload, 'event_type': self.event_type, 'order': self.order}
+
+
+class UnknownEvent(Event):
+    """Event that isn't an account creation nor a transaction. Keeps the whole event, since it's echoed on output."""
+    __slots__ = ('data',)
+
+    account_id = None
+
+    def __init__(self, data: dict):
+        """
+        Constructor method for UnknownEvent
+
+        Args:
+            data (dict): The event, along with 'event_type' and 'order'
+        """
+        self.data = data
+
+    def __reduce__(self):
+        return UnknownEvent, (self.data,)
+
+    @property
+    def order(self) -> int:
+        """Property for the position of the event on its input"""
+        return self.data.get('order')
+
+    @order.setter
+    def order(self, value: int) -> None:
+        """
+        Setter for the position of the event on its input
+
+        Args:
+            value (int): Position of the event
+
+        Returns:
+            None
+        """
+        self.data['order'] = value
+
+    def to_dict(self) -> dict:
+        return self.data
+
+
+def as_event(event: Mapping) -> Event:
+    """
+    Gets a typed event from an event given as a dict, classified by its 'event_type' field. Typed events are returned
+    as they are.
+
+    Args:
+        event (Mapping): An event, typed or as a dict
+
+    Returns:
+        event (Event): The typed event
+    """
+    if isinstance(event, Event):
+        return event
+
+    event_type = event.get('event_type', 'unknown')
+
+    if event_type == 'transaction':
+        return Transaction(payload=event.get('transaction', {}), order=event.get('order'))
+
+    if event_type == 'account_creation':
+        return AccountCreation(payload=event.get('account', {}), order=event.get('order'))
+
+    return UnknownEvent(data=event)
+
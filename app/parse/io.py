@@ -1,40 +1,304 @@
 # Built-in libraries
 import sys
 import json
-from datetime import datetime
-from typing import Generator
+import time
+import codecs
+import select
+from typing import BinaryIO, Callable, Dict, Generator, Optional, TextIO, Tuple
 
+# Project libraries
+from app.bank.account import AccountInfo
+from app.bank.records import MERCHANTS
+from app.parse.events import AccountCreation, Event, Transaction, UnknownEvent
+from app.parse.timestamp import parse_timestamp
 
-def parse_input_events() -> Generator[dict, None, None]:
+# Default maximum amount of characters read from the input stream at once
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Default amount of characters buffered before writing to the output stream
+DEFAULT_FLUSH_SIZE = 64 * 1024
+
+# Default maximum amount of seconds output is buffered
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+def _readable(binary: BinaryIO) -> Callable[[], bool]:
+    """Gets a function telling if reading a binary stream won't block. Unknown streams are never told readable."""
+    try:
+        fd = binary.fileno()
+    except (AttributeError, OSError, ValueError):
+        return lambda: False
+
+    def readable() -> bool:
+        try:
+            return bool(select.select([fd], [], [], 0)[0])
+        except (OSError, ValueError):
+            return False
+
+    return readable
+
+
+def read_lines(
+    stream: TextIO,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    on_wait: Optional[Callable[[], None]] = None
+) -> Generator[str, None, None]:
+    """
+    Lazily reads lines from a text stream using bounded reads.
+    Each read takes at most 'buffer_size' characters, but only what is already available, so a line is yielded as
+    soon as it arrives, without waiting for more input (e.g. on pipes fed by slow producers). Memory usage doesn't
+    depend on the input size. Empty lines are skipped.
+
+    Text streams over a binary buffer (e.g. stdin and files) are read in chunks from the buffer, decoded
+    incrementally, so the stream must not have been read from before. Since line breaks are split after decoding,
+    '\r\n' and '\r' line breaks are taken as '\n'. Before a read that would block, 'on_wait' is called, e.g. to
+    flush output buffered while input was flowing. Other streams (e.g. 'StringIO') are read line by line with
+    'readline' and never call 'on_wait'.
+
+    Args:
+        stream (TextIO): Text stream to read lines from
+        buffer_size (int): Maximum amount of characters read from the stream at once. Must be greater than zero.
+        on_wait (Optional[Callable[[], None]]): Called before waiting for input, if provided
+
+    Yield:
+        line (str): Each line of the stream, without the trailing line break
+    """
+    if buffer_size <= 0:
+        raise ValueError(f"Expected a positive buffer size, got: {buffer_size}")
+
+    binary = getattr(stream, 'buffer', None)
+    if binary is None or not hasattr(binary, 'read1'):
+        yield from _read_lines_by_line(stream=stream, buffer_size=buffer_size)
+        return
+
+    decoder = codecs.getincrementaldecoder(stream.encoding or 'utf-8')(errors=stream.errors or 'strict')
+    readable = _readable(binary)
+    remainder = ''
+
+    while True:
+        if on_wait is not None and not readable():
+            on_wait()
+
+        data = binary.read1(buffer_size)
+        chunk = decoder.decode(data, final=not data)
+        if '\r' in chunk:
+            # Empty lines left by '\r\n' are skipped
+            chunk = chunk.replace('\r', '\n')
+
+        lines = (remainder + chunk).split('\n')
+        # Last piece may be an incomplete line, keep it until the next read
+        remainder = lines.pop()
+
+        for line in lines:
+            if line.strip():
+                yield line
+
+        if not data:
+            break
+
+    if remainder.strip():
+        yield remainder
+
+
+def _read_lines_by_line(stream: TextIO, buffer_size: int) -> Generator[str, None, None]:
+    """Reads lines with 'readline', at most 'buffer_size' characters at once. See 'read_lines'."""
+    readline = stream.readline
+    remainder = ''
+    while True:
+        piece = readline(buffer_size)
+        if not piece:
+            break
+
+        if piece[-1] != '\n':
+            # Line longer than a read, keep it until its line break
+            remainder += piece
+            continue
+
+        line = remainder + piece[:-1] if remainder else piece[:-1]
+        remainder = ''
+        if line.strip():
+            yield line
+
+    if remainder.strip():
+        yield remainder
+
+
+def parse_event(value: str, order: int) -> Event:
+    """
+    Parses a single event. Classify the event into a type and converts time fields to python datetime format.
+    Merchant names are interned on 'MERCHANTS', so events of the same merchant share its name.
+
+    Args:
+        value (str): Event encoded as JSON
+        order (int): Position of the event on its input
+
+    Returns:
+        event (Event): Typed event: 'AccountCreation', 'Transaction' or 'UnknownEvent'
+    """
+    data = json.loads(value)
+
+    if 'account' in data:
+        return AccountCreation(payload=data['account'], order=order)
+
+    if 'transaction' in data:
+        # Converting time field to python datetime
+        t = data['transaction']
+        t['time'] = parse_timestamp(t.get('time', ''))
+
+        merchant = t.get('merchant')
+        if isinstance(merchant, str):
+            t['merchant'] = MERCHANTS.intern(merchant)
+
+        return Transaction(payload=t, order=order)
+
+    data['event_type'] = 'unknown'
+    data['order'] = order
+
+    return UnknownEvent(data=data)
+
+
+def parse_input_events(
+    stream: Optional[TextIO] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    on_wait: Optional[Callable[[], None]] = None
+) -> Generator[Event, None, None]:
     """
-    Generates a list from received events from standard input (stdin).
+    Generates events from an input stream, standard input (stdin) by default.
+    Input is read line by line, so each event is yielded as soon as its line is available.
     Classify events into a type and converts time fields to python datetime format.
 
+    Args:
+        stream (Optional[TextIO]): Text stream to read events from. If not provided, uses standard input (stdin).
+        buffer_size (int): Maximum amount of characters read from the stream at once
+        on_wait (Optional[Callable[[], None]]): Called before waiting for input, if provided. See 'read_lines'.
+
     Yield:
-        data (dict): Formatted events received from standard input (stdin).
+        event (Event): Typed events received from standard input (stdin).
     """
+    stream = stream if stream is not None else sys.stdin
+
+    for order, value in enumerate(read_lines(stream=stream, buffer_size=buffer_size, on_wait=on_wait)):
+        yield parse_event(value=value, order=order)
+
+
+class EventEncoder:
+    """
+    Encodes processed events as JSON lines, the same as 'json.dumps(event, default=str, sort_keys=True)'.
+    Account fields are taken from their cached encoding ('AccountInfo') and violations lists are encoded once.
+    """
+    def __init__(self):
+        """Constructor method for EventEncoder"""
+        self._violations: Dict[Tuple[str, ...], str] = {}
+
+    def encode(self, event: dict) -> str:
+        """
+        Encodes a processed event as a JSON line
+
+        Args:
+            event (dict): Processed event
+
+        Returns:
+            line (str): Encoded event, with sorted keys and a trailing line break
+        """
+        account = event.get('account')
+        if isinstance(account, AccountInfo) and len(event) == 2 and 'violations' in event:
+            violations = tuple(event['violations'])
+            encoded_violations = self._violations.get(violations)
+            if encoded_violations is None:
+                encoded_violations = self._violations[violations] = json.dumps(list(violations), default=str)
+
+            return f'{{"account": {account.encoded}, "violations": {encoded_violations}}}\n'
+
+        return f"{json.dumps(event, default=str, sort_keys=True)}\n"
+
+
+class OutputWriter:
+    """
+    Writes processed events to an output stream, standard output (stdout) by default, as JSON lines.
+
+    Encoded events are buffered and written at once when the buffer reaches 'flush_size' characters or, on a write,
+    when 'flush_interval' seconds have passed since the last flush. Events are encoded by 'EventEncoder'.
+
+    The interval is only checked on writes, so output buffered when input stalls waits for the next event. Readers
+    flush the writer before waiting for input (see the 'on_wait' argument of 'read_lines'), so processed events are
+    written as soon as input stalls, instead.
+
+    A barrier may be called right before buffered events are written, e.g. to commit a write-ahead log, so events
+    are only answered once their changes are durable.
+    """
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        barrier: Optional[Callable[[], None]] = None
+    ):
+        """
+        Constructor method for OutputWriter
+
+        Args:
+            stream (Optional[TextIO]): Text stream to write events to. If not provided, uses standard output (stdout).
+            flush_size (int): Amount of characters buffered before writing. Zero writes every event right away.
+            flush_interval (float): Maximum amount of seconds between flushes, checked on each write
+            barrier (Optional[Callable[[], None]]): Called before buffered events are written, if provided
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.barrier = barrier
+        self._buffer = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self.encode = EventEncoder().encode
+
+    def __enter__(self) -> 'OutputWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.flush()
+
+    def write(self, event: dict) -> None:
+        """
+        Buffers a processed event, flushing the buffer if needed
+
+        Args:
+            event (dict): Processed event
+
+        Returns:
+            None
+        """
+        self.write_line(self.encode(event))
+
+    def write_line(self, line: str) -> None:
+        """
+        Buffers an already encoded event, flushing the buffer if needed
 
-    for order, value in enumerate(sys.stdin.readlines()):
-        data = json.loads(value)
+        Args:
+            line (str): Processed event encoded as a JSON line, with a trailing line break
 
-        if 'account' in data:
-            event_type = 'account_creation'
+        Returns:
+            None
+        """
+        self._buffer.append(line)
+        self._buffered += len(line)
 
-        elif 'transaction' in data:
-            event_type = 'transaction'
+        if self._buffered >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
 
-            # Converting time field to python datetime
-            t = data.get('transaction', {})
-            t.update(
-                {'time': datetime.strptime(t.get('time', ''), '%Y-%m-%dT%H:%M:%S.%fZ')}
-            )
+    def flush(self) -> None:
+        """
+        Writes buffered events to the output stream
 
-        else:
-            event_type = 'unknown'
+        Returns:
+            None
+        """
+        if self._buffer:
+            if self.barrier is not None:
+                self.barrier()
 
-        data.update({
-            'event_type': event_type,
-            'order': order
-        })
+            self.stream.write(''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
 
-        yield data
+        self.stream.flush()
+        self._last_flush = time.monotonic()
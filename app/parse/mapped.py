@@ -0,0 +1,172 @@
+# Built-in libraries
+import os
+import mmap
+from contextlib import contextmanager
+from typing import Generator, List, Optional, Tuple
+
+# Project libraries
+from app.parse.events import Event
+from app.parse.io import DEFAULT_BUFFER_SIZE, parse_event
+from app.parse.parallel import DEFAULT_QUEUE_SIZE, ordered_map
+
+# Default amount of bytes of each region parsed at once by a worker
+DEFAULT_REGION_SIZE = 1024 * 1024
+
+
+@contextmanager
+def map_file(path: str) -> Generator[Optional[mmap.mmap], None, None]:
+    """
+    Memory-maps a file for reading
+
+    Args:
+        path (str): File path
+
+    Yield:
+        mapped (Optional[mmap.mmap]): The mapped file, or None if it's empty, since empty files can't be mapped
+    """
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield None
+            return
+
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def split_regions(path: str, region_size: int = DEFAULT_REGION_SIZE) -> List[Tuple[int, int]]:
+    """
+    Splits a file into regions of about 'region_size' bytes, ending at line breaks, so each region has whole lines
+
+    Args:
+        path (str): File path
+        region_size (int): Minimum amount of bytes of each region, apart from the last one
+
+    Returns:
+        regions (List[Tuple[int, int]]): Start and end offsets of each region, covering the whole file
+    """
+    if region_size <= 0:
+        raise ValueError(f"Expected a positive region size, got: {region_size}")
+
+    regions = []
+    with map_file(path) as mapped:
+        if mapped is None:
+            return regions
+
+        start, size = 0, len(mapped)
+        while start < size:
+            line_break = mapped.find(b'\n', min(start + region_size, size) - 1)
+            end = size if line_break < 0 else line_break + 1
+            regions.append((start, end))
+            start = end
+
+    return regions
+
+
+def read_region_lines(
+    mapped: mmap.mmap,
+    start: int,
+    end: int,
+    block_size: int = DEFAULT_BUFFER_SIZE
+) -> Generator[str, None, None]:
+    """
+    Reads the lines of a region of a mapped file. The region is decoded (UTF-8) in blocks of about 'block_size' bytes
+    ending at line breaks, straight from 'memoryview' slices of the mapping, so no copy of the whole region is made.
+    Empty lines are skipped.
+
+    The generator must be closed (or exhausted) before the mapped file is, since it holds a view of it.
+
+    Args:
+        mapped (mmap.mmap): Mapped file
+        start (int): Region start offset, at the beginning of a line
+        end (int): Region end offset, right after a line break or at the end of the file
+        block_size (int): Amount of bytes decoded at once
+
+    Yield:
+        line (str): Each line of the region, without the trailing line break
+    """
+    with memoryview(mapped) as view:
+        position = start
+        while position < end:
+            line_break = mapped.find(b'\n', min(position + block_size, end) - 1, end)
+            block_end = end if line_break < 0 else line_break + 1
+
+            for line in str(view[position:block_end], 'utf-8').split('\n'):
+                if line.strip():
+                    yield line
+
+            position = block_end
+
+
+def parse_region(path: str, start: int, end: int) -> List[Event]:
+    """
+    Parses the events of a region of a file, mapping it on the calling process. See 'parse_event'.
+    Events are numbered from zero, since the amount of lines before the region isn't known.
+
+    Args:
+        path (str): File path
+        start (int): Region start offset, at the beginning of a line
+        end (int): Region end offset, right after a line break or at the end of the file
+
+    Returns:
+        events (List[Event]): Typed events
+    """
+    with map_file(path) as mapped:
+        if mapped is None:
+            return []
+
+        lines = read_region_lines(mapped=mapped, start=start, end=end)
+        return [parse_event(value=line, order=order) for order, line in enumerate(lines)]
+
+
+def parse_file_events(
+    path: str,
+    workers: int = 0,
+    region_size: int = DEFAULT_REGION_SIZE,
+    queue_size: int = DEFAULT_QUEUE_SIZE
+) -> Generator[Event, None, None]:
+    """
+    Same as 'parse_input_events', reading events from a memory-mapped file instead of a stream, so lines are read
+    straight from the page cache, without the extra copy of piping the file.
+
+    With 'workers', the file is split into regions of about 'region_size' bytes, ending at line breaks. Each worker
+    maps the file by itself and parses whole regions, so only region offsets and parsed events are sent between
+    processes. Regions are yielded in file order and their events renumbered, keeping the 'order' field assigned by
+    'parse_input_events'.
+
+    Args:
+        path (str): File path
+        workers (int): Amount of worker processes. Zero parses events on the calling process.
+        region_size (int): Amount of bytes of each region parsed at once by a worker
+        queue_size (int): Amount of regions being parsed at once, per worker
+
+    Yield:
+        event (Event): Typed events, in the same order they are on the file
+    """
+    if workers < 0:
+        raise ValueError(f"Expected a non negative amount of workers, got: {workers}")
+
+    if not workers:
+        with map_file(path) as mapped:
+            if mapped is None:
+                return
+
+            lines = read_region_lines(mapped=mapped, start=0, end=len(mapped))
+            try:
+                for order, line in enumerate(lines):
+                    yield parse_event(value=line, order=order)
+            finally:
+                lines.close()
+        return
+
+    tasks = ((path, start, end) for start, end in split_regions(path=path, region_size=region_size))
+    base = 0
+
+    for events in ordered_map(function=parse_region, tasks=tasks, workers=workers, queue_size=queue_size):
+        for event in events:
+            event.order += base
+            yield event
+
+        base += len(events)
@@ -0,0 +1,120 @@
+# Built-in libraries
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Generator, Iterable, List, Optional, TextIO, Tuple
+
+# Project libraries
+from app.parse.events import Event
+from app.parse.io import DEFAULT_BUFFER_SIZE, parse_event, read_lines
+
+# Default amount of lines parsed at once by a worker
+DEFAULT_CHUNK_SIZE = 1000
+
+# Default amount of chunks being parsed at once, per worker
+DEFAULT_QUEUE_SIZE = 4
+
+
+def parse_chunk(start: int, lines: List[str]) -> List[Event]:
+    """
+    Parses a chunk of lines. See 'parse_event'.
+
+    Args:
+        start (int): Position of the first line of the chunk on its input
+        lines (List[str]): Events encoded as JSON
+
+    Returns:
+        events (List[Event]): Typed events
+    """
+    return [parse_event(value=line, order=start + position) for position, line in enumerate(lines)]
+
+
+def ordered_map(
+    function: Callable,
+    tasks: Iterable[tuple],
+    workers: int,
+    queue_size: int = DEFAULT_QUEUE_SIZE
+) -> Generator[Any, None, None]:
+    """
+    Calls a function for each task on a pool of worker processes, yielding results in the order tasks were read.
+    At most 'queue_size' tasks per worker are in flight, so tasks are read lazily and memory usage stays bounded.
+
+    Args:
+        function (Callable): Function called on workers. Must be defined at module level, so it can be pickled.
+        tasks (Iterable[tuple]): Arguments of each call
+        workers (int): Amount of worker processes
+        queue_size (int): Amount of tasks in flight at once, per worker
+
+    Yield:
+        result (Any): Result of each call, in the same order as tasks
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    max_pending = queue_size * workers
+
+    try:
+        for args in tasks:
+            pending.append(executor.submit(function, *args))
+
+            # Waits for the oldest task before reading further, so the queue stays bounded
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        # Tasks whose results won't be consumed anymore aren't waited for
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_input_events_parallel(
+    stream: Optional[TextIO] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    queue_size: int = DEFAULT_QUEUE_SIZE
+) -> Generator[Event, None, None]:
+    """
+    Same as 'parse_input_events', parsing events on a pool of worker processes.
+
+    Lines are read on the calling process and sent to workers in chunks of 'chunk_size' lines, so JSON decoding and
+    timestamp parsing run alongside the stages consuming events. At most 'queue_size' chunks per worker are in flight,
+    bounding memory usage, and chunks are yielded in the order they were read, so events keep the 'order' field
+    assigned by 'parse_input_events'.
+
+    Args:
+        stream (Optional[TextIO]): Text stream to read events from. If not provided, uses standard input (stdin).
+        buffer_size (int): Maximum amount of characters read from the stream at once
+        workers (Optional[int]): Amount of worker processes. If not provided, uses one per CPU.
+        chunk_size (int): Amount of lines parsed at once by a worker
+        queue_size (int): Amount of chunks being parsed at once, per worker
+
+    Yield:
+        event (Event): Typed events, in the same order they were read
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 0:
+        raise ValueError(f"Expected a positive amount of workers, got: {workers}")
+
+    if chunk_size <= 0 or queue_size <= 0:
+        raise ValueError(f"Expected positive chunk and queue sizes, got: {chunk_size} and {queue_size}")
+
+    stream = stream if stream is not None else sys.stdin
+
+    def chunks() -> Generator[Tuple[int, List[str]], None, None]:
+        start, chunk = 0, []
+        for line in read_lines(stream=stream, buffer_size=buffer_size):
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield start, chunk
+                start, chunk = start + len(chunk), []
+
+        if chunk:
+            yield start, chunk
+
+    for events in ordered_map(function=parse_chunk, tasks=chunks(), workers=workers, queue_size=queue_size):
+        yield from events
@@ -0,0 +1,78 @@
+# Built-in libraries
+from datetime import datetime
+from typing import Dict, Tuple
+
+# Layout of timestamps on input events
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+
+class TimestampParser:
+    """
+    Fast parser for timestamps on the fixed 'YYYY-MM-DDTHH:MM:SS.fffZ' layout.
+
+    Events are usually close in time, so the date and hour prefix of timestamps is parsed once and cached.
+    Timestamps on any other layout accepted by 'TIMESTAMP_FORMAT' fall back to 'datetime.strptime'.
+    """
+    def __init__(self, cache_size: int = 4096):
+        """
+        Constructor method for TimestampParser
+
+        Args:
+            cache_size (int): Maximum amount of cached date and hour prefixes
+        """
+        self.cache_size = cache_size
+        self._prefixes: Dict[str, Tuple[int, int, int, int]] = {}
+
+    def _parse_prefix(self, prefix: str) -> Tuple[int, int, int, int]:
+        """
+        Parses and caches a 'YYYY-MM-DDTHH' prefix
+
+        Args:
+            prefix (str): Date and hour prefix of a timestamp
+
+        Returns:
+            fields (Tuple[int, int, int, int]): Year, month, day and hour
+        """
+        digits = prefix[:4] + prefix[5:7] + prefix[8:10] + prefix[11:]
+        if prefix[4] != '-' or prefix[7] != '-' or prefix[10] != 'T' or not digits.isdigit():
+            raise ValueError(f"Unexpected timestamp prefix: {prefix}")
+
+        fields = (int(prefix[:4]), int(prefix[5:7]), int(prefix[8:10]), int(prefix[11:]))
+        # Checks if it's a valid date and hour
+        datetime(*fields)
+
+        if len(self._prefixes) >= self.cache_size:
+            self._prefixes.clear()
+        self._prefixes[prefix] = fields
+
+        return fields
+
+    def parse(self, value: str) -> datetime:
+        """
+        Converts a timestamp to python datetime
+
+        Args:
+            value (str): Timestamp on 'TIMESTAMP_FORMAT' layout
+
+        Returns:
+            timestamp (datetime): The equivalent naive datetime
+        """
+        if len(value) == 24 and value[13] == ':' and value[16] == ':' and value[19] == '.' and value[23] == 'Z':
+            try:
+                prefix = value[:13]
+                fields = self._prefixes.get(prefix) or self._parse_prefix(prefix)
+
+                # Minutes, seconds and milliseconds as a single 7 digits number
+                rest = value[14:16] + value[17:19] + value[20:23]
+                if rest.isdigit():
+                    minute_second, millisecond = divmod(int(rest), 1000)
+                    return datetime(*fields, *divmod(minute_second, 100), millisecond * 1000)
+
+            except ValueError:
+                pass
+
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+# Default parser, used when parsing input events
+parse_timestamp = TimestampParser().parse
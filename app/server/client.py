@@ -0,0 +1,153 @@
+"""
+Test client for the authorization server, to measure latency and throughput locally.
+
+Input events are partitioned among connections by account id, so events of an account keep their order.
+Each connection sends its events while concurrently reading the answers.
+
+Usage:
+    python -m app.server.client --port 8000 --connections 4 < events.jsonl
+"""
+# Built-in libraries
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import List, Optional
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.auth.parallel import shard_of
+
+
+class AuthorizerClient:
+    """Sends events to an 'AuthorizerServer' over a single connection, timing each answer"""
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, unix_socket: Optional[str] = None):
+        """
+        Constructor method for AuthorizerClient
+
+        Args:
+            host (Optional[str]): Server TCP host
+            port (Optional[int]): Server TCP port
+            unix_socket (Optional[str]): Server Unix socket path, used instead of TCP if provided
+        """
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+
+    async def _connect(self):
+        if self.unix_socket:
+            return await asyncio.open_unix_connection(path=self.unix_socket)
+
+        return await asyncio.open_connection(host=self.host, port=self.port)
+
+    async def send(self, lines: List[str]) -> dict:
+        """
+        Sends events, waiting for all answers
+
+        Args:
+            lines (List[str]): Events encoded as JSON, one per line
+
+        Returns:
+            result (dict): 'answers' with the received lines and 'latencies' with the seconds each one took
+        """
+        reader, writer = await self._connect()
+        sent_at = []
+
+        async def send_lines():
+            try:
+                for line in lines:
+                    sent_at.append(time.perf_counter())
+                    writer.write(f"{line.rstrip()}\n".encode())
+                    await writer.drain()
+
+            except ConnectionError:
+                # Server closed the connection, answers received so far are kept
+                pass
+
+        sender = asyncio.ensure_future(send_lines())
+        answers, latencies = [], []
+        for position in range(len(lines)):
+            answer = await reader.readline()
+            if not answer:
+                break
+            latencies.append(time.perf_counter() - sent_at[position])
+            answers.append(answer.decode())
+
+        await sender
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+        return {'answers': answers, 'latencies': latencies}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Gets a percentile of values, zero if there are no values"""
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+async def run(lines: List[str], connections: int, **address) -> dict:
+    """
+    Sends events through many concurrent connections, partitioning them by account id
+
+    Args:
+        lines (List[str]): Events encoded as JSON, one per line
+        connections (int): Amount of concurrent connections
+        **address: Server address, as accepted by 'AuthorizerClient'
+
+    Returns:
+        result (dict): Latency and throughput statistics
+    """
+    partitions = [[] for _ in range(connections)]
+    for line in lines:
+        if line.strip():
+            partitions[shard_of(Authorizer.account_id_of(json.loads(line)), connections)].append(line)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        AuthorizerClient(**address).send(partition) for partition in partitions if partition
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for result in results for latency in result['latencies']]
+
+    return {
+        'connections': connections,
+        'events': len(latencies),
+        'total_s': round(elapsed, 4),
+        'events_per_sec': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(max(latencies, default=0) * 1000, 3)
+        }
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='Server TCP host')
+    parser.add_argument('--port', type=int, default=8000, help='Server TCP port')
+    parser.add_argument('--unix-socket', help='Server Unix socket path, used instead of TCP if provided')
+    parser.add_argument('--connections', type=int, default=1, help='Amount of concurrent connections')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(
+        lines=sys.stdin.readlines(),
+        connections=args.connections,
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket
+    ))
+    sys.stdout.write(f"{json.dumps(result)}\n")
+
+
+if __name__ == '__main__':
+    main()
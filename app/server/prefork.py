@@ -0,0 +1,199 @@
+# Built-in libraries
+import os
+import json
+import signal
+import socket
+from typing import Callable, Generator, List, TextIO
+
+# Project libraries
+from app.service.logging import logger
+
+# Default maximum amount of connections waiting to be accepted by a worker
+DEFAULT_BACKLOG = 64
+
+
+class PreforkServer:
+    """
+    Serves requests on pre-forked worker processes, over a Unix socket. Meant for short batch runs: modules are
+    imported once, on the parent process, and inherited by workers when they're forked, so each request is served by
+    a warm interpreter instead of paying for its startup.
+
+    Each connection is a single request: a line with an input file path, answered with the output written by
+    'handler' for it, after which the connection is closed. Errors are answered with a '{"error": ...}' line.
+    Workers accept connections from the same listening socket, so requests are served one at a time per worker, and
+    workers that die are replaced.
+    """
+    def __init__(
+        self,
+        handler: Callable[[str, TextIO], None],
+        path: str,
+        workers: int = 1,
+        backlog: int = DEFAULT_BACKLOG
+    ):
+        """
+        Constructor method for PreforkServer
+
+        Args:
+            handler (Callable[[str, TextIO], None]): Serves a request, given its input file path and the text stream
+            where its output is written
+            path (str): Unix socket path
+            workers (int): Amount of worker processes
+            backlog (int): Maximum amount of connections waiting to be accepted by a worker
+        """
+        if workers <= 0:
+            raise ValueError(f"Expected a positive amount of workers, got: {workers}")
+
+        self.handler = handler
+        self.path = path
+        self.workers = workers
+        self.backlog = backlog
+        self.pids: List[int] = []
+        self._socket = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """
+        Starts listening on the Unix socket and forks the workers
+
+        Returns:
+            None
+        """
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.path)
+        self._socket.listen(self.backlog)
+
+        for _ in range(self.workers):
+            self._fork()
+
+        logger.info('Pre-forked %d workers listening on %s.', self.workers, self.path)
+
+    def serve_forever(self) -> None:
+        """
+        Starts the workers and supervises them, replacing the ones that die, until interrupted or terminated
+
+        Returns:
+            None
+        """
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self.start()
+
+        try:
+            while self.pids:
+                pid, _ = os.wait()
+                if pid in self.pids and not self._stopping:
+                    self.pids.remove(pid)
+                    logger.warning('Worker %d died. Forking a new one.', pid)
+                    self._fork()
+
+        except KeyboardInterrupt:
+            logger.info('Server stopped.')
+
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Terminates the workers, waiting for them, and removes the Unix socket
+
+        Returns:
+            None
+        """
+        self._stopping = True
+
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        for pid in self.pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+        self.pids = []
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def _fork(self) -> None:
+        """Forks a worker, which serves connections until terminated"""
+        pid = os.fork()
+        if pid:
+            self.pids.append(pid)
+            return
+
+        # Worker process: never returns to the caller, so the parent flow isn't run twice
+        status = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            self._work()
+
+        except KeyboardInterrupt:
+            pass
+
+        except BaseException as e:
+            logger.error('Worker %d failed. Details: %s', os.getpid(), e)
+            status = 1
+
+        finally:
+            logger.stop()
+            os._exit(status)
+
+    def _work(self) -> None:
+        """Serves connections accepted on the listening socket, one at a time"""
+        while True:
+            connection, _ = self._socket.accept()
+            with connection:
+                self.handle(connection)
+
+    def handle(self, connection: socket.socket) -> None:
+        """
+        Serves a single request
+
+        Args:
+            connection (socket.socket): Accepted connection
+
+        Returns:
+            None
+        """
+        with connection.makefile('r', encoding='utf-8') as reader, \
+                connection.makefile('w', encoding='utf-8') as stream:
+            path = reader.readline().strip()
+
+            try:
+                self.handler(path, stream)
+
+            except (ConnectionError, KeyboardInterrupt):
+                raise
+
+            except Exception as e:
+                logger.error('Failed to serve %s. Details: %s', path, e)
+                stream.write(f"{json.dumps({'error': str(e)})}\n")
+
+
+def submit(path: str, unix_socket: str) -> Generator[str, None, None]:
+    """
+    Sends an input file to a 'PreforkServer', reading its output
+
+    Args:
+        path (str): Input file path. Relative paths are resolved on the caller working directory.
+        unix_socket (str): Server Unix socket path
+
+    Yield:
+        line (str): Each line of the output, with its trailing line break
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(unix_socket)
+        connection.sendall(f"{os.path.abspath(path)}\n".encode())
+
+        with connection.makefile('r', encoding='utf-8') as reader:
+            yield from reader
@@ -0,0 +1,604 @@
+# Built-in libraries
+import json
+import queue
+import base64
+import socket
+import bisect
+import hashlib
+import threading
+import multiprocessing
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Generator, Hashable, Iterable, List, Optional, Tuple
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.storage.snapshot import Snapshot
+from app.auth.parallel import canonical_id, get_result
+from app.parse.io import EventEncoder, parse_event
+from app.server.server import DEFAULT_LINE_LIMIT
+from app.auth.validation.base_validation import BaseValidation
+
+# Default amount of points each backend takes on the hash ring
+DEFAULT_VNODES = 128
+
+# Default amount of events read before partitioning them among backends
+DEFAULT_BATCH_SIZE = 1000
+
+# Default amount of batches sent to backends before waiting for the answers of the oldest one
+DEFAULT_DEPTH = 2
+
+
+def ring_hash(key: str) -> int:
+    """
+    Hashes a key to a point of the ring. Unlike 'hash', the result is stable across processes and runs.
+
+    Args:
+        key (str): Key hashed
+
+    Returns:
+        point (int): A 64 bits number
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """
+    Consistent hash ring, mapping keys (account ids) to nodes (backends).
+
+    Each node takes 'vnodes' points of the ring, and a key belongs to the node of the first point after its hash.
+    Adding or removing a node only moves the keys between the points it takes or leaves and the previous ones, about
+    1/N of all keys, while the rest stay on their nodes. Virtual nodes spread keys evenly among nodes.
+    """
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        """
+        Constructor method for HashRing
+
+        Args:
+            nodes (Iterable[str]): Names of the initial nodes
+            vnodes (int): Amount of points each node takes on the ring
+        """
+        if vnodes <= 0:
+            raise ValueError(f"Expected a positive amount of virtual nodes, got: {vnodes}")
+
+        self.vnodes = vnodes
+        self.nodes: List[str] = []
+        self._points: List[int] = []
+        self._owners: List[str] = []
+
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        """
+        Adds a node to the ring
+
+        Args:
+            node (str): Node name
+
+        Returns:
+            None
+        """
+        if node in self.nodes:
+            raise ValueError(f"Node already on the ring: {node}")
+
+        self.nodes.append(node)
+        self._build()
+
+    def remove(self, node: str) -> None:
+        """
+        Removes a node from the ring
+
+        Args:
+            node (str): Node name
+
+        Returns:
+            None
+        """
+        if node not in self.nodes:
+            raise ValueError(f"Node not on the ring: {node}")
+
+        self.nodes.remove(node)
+        self._build()
+
+    def _build(self) -> None:
+        """Places the points of every node, sorted by position"""
+        points = sorted((ring_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(self.vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_of(self, key: Hashable) -> str:
+        """
+        Gets the node a key belongs to
+
+        Args:
+            key (Hashable): Key, hashed by the 'repr' of its canonical form, so equal ids (e.g. 1, 1.0 and True) belong
+            to the same node. See 'canonical_id'.
+
+        Returns:
+            node (str): Node name
+        """
+        if not self._points:
+            raise LookupError('No nodes on the ring')
+
+        index = bisect.bisect(self._points, ring_hash(repr(canonical_id(key))))
+
+        return self._owners[index % len(self._owners)]
+
+
+class Backend(ABC):
+    """
+    Authorizer a 'Router' sends events to, owning the state of the accounts routed to it.
+
+    Batches are answered in the order they were sent, so a few batches may be in flight at once. Accounts are only
+    handed off ('export_accounts' and 'import_accounts') when no batches are in flight.
+    """
+    @abstractmethod
+    def send(self, lines: List[str]) -> None:
+        """
+        Sends a batch of events, without waiting for their answers
+
+        Args:
+            lines (List[str]): Events encoded as JSON, one per line
+
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def receive(self) -> List[str]:
+        """
+        Waits for the answers of the oldest batch in flight
+
+        Returns:
+            lines (List[str]): Processed events encoded as JSON lines, in the order they were sent
+        """
+        pass
+
+    @abstractmethod
+    def export_accounts(self, account_ids: List[Hashable]) -> bytes:
+        """
+        Removes accounts, returning their state. See 'Authorizer.export_accounts'.
+
+        Args:
+            account_ids (List[Hashable]): Ids of the accounts handed off
+
+        Returns:
+            data (bytes): State of the removed accounts
+        """
+        pass
+
+    @abstractmethod
+    def import_accounts(self, data: bytes) -> int:
+        """
+        Takes over accounts exported by another backend. See 'Authorizer.import_accounts'.
+
+        Args:
+            data (bytes): State of the accounts
+
+        Returns:
+            imported (int): Amount of imported accounts
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases the backend, e.g. stopping its process or closing its connection"""
+        pass
+
+
+def _serve_local(
+    validations: Iterable[BaseValidation],
+    inbox: multiprocessing.Queue,
+    outbox: multiprocessing.Queue
+) -> None:
+    """
+    Local backend loop. Owns the state of the accounts routed to it, serving commands until receives None.
+    For each command, puts on 'outbox' its result, or the exception raised while serving it.
+
+    Args:
+        validations (Iterable[BaseValidation]): Validations used by the backend 'Authorizer'
+        inbox (multiprocessing.Queue): Queue where commands are received, as (name, argument)
+        outbox (multiprocessing.Queue): Queue where results are sent
+
+    Returns:
+        None
+    """
+    authorizer = Authorizer(events=[], validations=validations)
+    encode = EventEncoder().encode
+
+    for command, argument in iter(inbox.get, None):
+        try:
+            if command == 'events':
+                # Orders are only shown by unknown events, which the router answers itself
+                result = [encode(authorizer.process_event(event=parse_event(value=line, order=0))) for line in argument]
+            elif command == 'export':
+                result = authorizer.export_accounts(account_ids=argument)
+            else:
+                result = authorizer.import_accounts(data=argument)
+
+        except Exception as e:
+            result = e
+
+        outbox.put(result)
+
+
+class LocalBackend(Backend):
+    """Backend running an 'Authorizer' on a worker process of its own"""
+    def __init__(self, validations: Iterable[BaseValidation]):
+        """
+        Constructor method for LocalBackend
+
+        Args:
+            validations (Iterable[BaseValidation]): Validations used by the backend 'Authorizer'
+        """
+        self._inbox = multiprocessing.Queue()
+        self._outbox = multiprocessing.Queue()
+        self._pending = 0
+        self._process = multiprocessing.Process(
+            target=_serve_local, args=(list(validations), self._inbox, self._outbox), daemon=True
+        )
+        self._process.start()
+
+    def _result(self):
+        # Raises if the worker process died, instead of waiting forever for its result
+        return get_result(outbox=self._outbox, process=self._process)
+
+    def send(self, lines: List[str]) -> None:
+        self._inbox.put(('events', lines))
+        self._pending += 1
+
+    def receive(self) -> List[str]:
+        self._pending -= 1
+        return self._result()
+
+    def export_accounts(self, account_ids: List[Hashable]) -> bytes:
+        self._inbox.put(('export', list(account_ids)))
+        return self._result()
+
+    def import_accounts(self, data: bytes) -> int:
+        self._inbox.put(('import', data))
+        return self._result()
+
+    def close(self) -> None:
+        if self._pending or not self._process.is_alive():
+            # Don't wait for answers that won't be received anymore, nor for a dead process to read its inbox
+            self._inbox.cancel_join_thread()
+            self._process.terminate()
+        else:
+            self._inbox.put(None)
+
+        self._process.join()
+
+
+class ServerBackend(Backend):
+    """
+    Backend on an 'AuthorizerServer', over a single connection. Batches are written by a thread of their own, so
+    sending a batch doesn't wait for the server to read the previous ones (whose answers are only read later).
+
+    Handoff state is sent as 'handoff' control messages, holding the token the server was started with. Since the
+    server limits the length of a line, state larger than 'line_limit' is imported in parts.
+    """
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        unix_socket: Optional[str] = None,
+        line_limit: int = DEFAULT_LINE_LIMIT,
+        handoff_token: Optional[str] = None
+    ):
+        """
+        Constructor method for ServerBackend
+
+        Args:
+            host (Optional[str]): Server TCP host
+            port (Optional[int]): Server TCP port
+            unix_socket (Optional[str]): Server Unix socket path, used instead of TCP if provided
+            line_limit (int): Maximum length of an input line accepted by the server, in bytes
+            handoff_token (Optional[str]): Handoff token of the server. Without it, accounts can't be handed off.
+        """
+        if unix_socket:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(unix_socket)
+        else:
+            self._socket = socket.create_connection((host, port))
+
+        self.line_limit = line_limit
+        self.handoff_token = handoff_token
+        self._reader = self._socket.makefile('r', encoding='utf-8', newline='\n')
+        self._outgoing = queue.Queue()
+        self._pending: Deque[int] = deque()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def _write(self) -> None:
+        """Writes outgoing data to the connection until receives None"""
+        for data in iter(self._outgoing.get, None):
+            try:
+                self._socket.sendall(data)
+            except OSError:
+                # Answers won't come, which is raised by 'receive'
+                return
+
+    def _readline(self) -> str:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError('Backend server closed the connection')
+
+        return line
+
+    def send(self, lines: List[str]) -> None:
+        self._pending.append(len(lines))
+        self._outgoing.put(''.join(f"{line}\n" for line in lines).encode())
+
+    def receive(self) -> List[str]:
+        return [self._readline() for _ in range(self._pending.popleft())]
+
+    def _request(self, message: dict) -> dict:
+        """Sends a handoff control message, waiting for its answer"""
+        if self.handoff_token is None:
+            raise RuntimeError('Accounts can only be handed off to backend servers with a handoff token')
+
+        self._outgoing.put(f"{json.dumps({'handoff': {**message, 'token': self.handoff_token}})}\n".encode())
+        answer = json.loads(self._readline())
+        if 'violations' in answer:
+            # Processed as an unknown event: the server has no handoff token, or a different one
+            raise RuntimeError('Handoff refused by backend server, check its handoff token')
+
+        answer = answer['handoff']
+        if 'error' in answer:
+            raise RuntimeError(f"Handoff failed on backend server: {answer['error']}")
+
+        return answer
+
+    def export_accounts(self, account_ids: List[Hashable]) -> bytes:
+        return base64.b64decode(self._request({'export': list(account_ids)})['state'])
+
+    def import_accounts(self, data: bytes) -> int:
+        state = base64.b64encode(data).decode()
+        # Room for the message around the state
+        if len(state) + len(self.handoff_token or '') + 64 <= self.line_limit:
+            return self._request({'import': state})['imported']
+
+        accounts, lsn = Snapshot.loads(data)
+        if len(accounts) <= 1:
+            raise ValueError(f"Account state too large to be handed off: {len(state)} bytes")
+
+        items = list(accounts.items())
+        half = len(items) // 2
+
+        return sum(
+            self.import_accounts(Snapshot.dumps(accounts=dict(part), lsn=lsn, history=True))
+            for part in (items[:half], items[half:])
+        )
+
+    def close(self) -> None:
+        self._outgoing.put(None)
+        self._writer.join()
+        self._socket.close()
+
+
+class Router:
+    """
+    Spreads events among authorizer backends by account id, with a consistent hash ring ('HashRing'), so each
+    backend owns the state of its accounts and throughput grows with the amount of backends.
+
+    Events are read in batches, each one partitioned among backends and sent to all of them at once. Up to 'depth'
+    batches are in flight, so backends keep working while the next batch is partitioned. Answers are merged back
+    following the order events were read, so the output is identical to the one of a single 'Authorizer': events of
+    an account go to the same backend, in order. Unknown events have no account, so the router answers them itself.
+
+    Backends may be added or removed between answers ('add_backend' and 'remove_backend'). In-flight batches are
+    answered first, then only the accounts whose owner changed on the ring are handed off, from their previous
+    backend to the new one, so they keep their state and whole retained history.
+    """
+    def __init__(
+        self,
+        backends: Dict[str, Backend],
+        vnodes: int = DEFAULT_VNODES,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        depth: int = DEFAULT_DEPTH
+    ):
+        """
+        Constructor method for Router
+
+        Args:
+            backends (Dict[str, Backend]): Backends by name. Names place backends on the ring, so the same names
+            spread accounts the same way.
+            vnodes (int): Amount of points each backend takes on the ring
+            batch_size (int): Amount of events read before partitioning them among backends
+            depth (int): Amount of batches sent to backends before waiting for the answers of the oldest one
+        """
+        if not backends:
+            raise ValueError('Expected at least one backend')
+
+        if batch_size <= 0:
+            raise ValueError(f"Expected a positive batch size, got: {batch_size}")
+
+        if depth <= 0:
+            raise ValueError(f"Expected a positive depth, got: {depth}")
+
+        self.backends = dict(backends)
+        self.ring = HashRing(nodes=self.backends, vnodes=vnodes)
+        self.batch_size = batch_size
+        self.depth = depth
+        # Backend owning each created account
+        self.accounts: Dict[Hashable, str] = {}
+        self.moved = 0
+        self._order = 0
+        # Ring lookups, dropped when backends change
+        self._nodes: Dict[Hashable, str] = {}
+        # For each batch in flight: backend of each event (None when answered by the router) and router answers
+        self._in_flight: Deque[Tuple[List[Optional[str]], List[str]]] = deque()
+        self._ready: Deque[str] = deque()
+        self.encode = EventEncoder().encode
+
+    def node_of(self, account_id: Hashable) -> str:
+        """
+        Gets the backend an account is routed to
+
+        Args:
+            account_id (Hashable): Account identifier
+
+        Returns:
+            node (str): Backend name
+        """
+        node = self._nodes.get(account_id)
+        if node is None:
+            node = self._nodes[account_id] = self.ring.node_of(account_id)
+
+        return node
+
+    def process(self, lines: Iterable[str]) -> Generator[str, None, None]:
+        """
+        Authorizes events on the backends
+
+        Args:
+            lines (Iterable[str]): Events encoded as JSON, one per line
+
+        Yield:
+            line (str): Processed events encoded as JSON lines, in the same order they were read
+        """
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= self.batch_size:
+                self._dispatch(batch)
+                batch = []
+
+                while len(self._in_flight) > self.depth:
+                    self._receive()
+                yield from self._answers()
+
+        if batch:
+            self._dispatch(batch)
+
+        self._wait()
+        yield from self._answers()
+
+    def _dispatch(self, batch: List[str]) -> None:
+        """Partitions a batch of events among backends, sending each one its partition"""
+        partitions: Dict[str, List[str]] = {}
+        route = []
+        answers = []
+
+        for line in batch:
+            order = self._order
+            self._order += 1
+            data = json.loads(line)
+
+            if isinstance(data, dict) and ('account' in data or 'transaction' in data):
+                # Classified the same as 'parse_event'
+                payload = data['account'] if 'account' in data else data['transaction']
+                account_id = payload.get('account-id') if isinstance(payload, dict) else None
+                node = self.node_of(account_id)
+                if 'account' in data:
+                    self.accounts.setdefault(account_id, node)
+
+                partitions.setdefault(node, []).append(line)
+                route.append(node)
+            else:
+                # The same answer as 'Authorizer.process_unknown'
+                processed_event = parse_event(value=line, order=order).to_dict()
+                processed_event['violations'] = ['unknown-error']
+                answers.append(self.encode(processed_event))
+                route.append(None)
+
+        for node, partition in partitions.items():
+            self.backends[node].send(partition)
+
+        self._in_flight.append((route, answers))
+
+    def _receive(self) -> None:
+        """Merges the answers of the oldest batch in flight"""
+        route, answers = self._in_flight.popleft()
+        processed = {node: iter(self.backends[node].receive()) for node in set(route) if node is not None}
+        answers = iter(answers)
+
+        self._ready.extend(next(answers) if node is None else next(processed[node]) for node in route)
+
+    def _wait(self) -> None:
+        """Waits for all batches in flight"""
+        while self._in_flight:
+            self._receive()
+
+    def _answers(self) -> Generator[str, None, None]:
+        # Backends may change while answers are consumed, adding the answers of the batches in flight
+        while self._ready:
+            yield self._ready.popleft()
+
+    def add_backend(self, name: str, backend: Backend) -> int:
+        """
+        Adds a backend, handing off to it the accounts it takes over
+
+        Args:
+            name (str): Backend name
+            backend (Backend): New backend
+
+        Returns:
+            moved (int): Amount of accounts handed off
+        """
+        if name in self.backends:
+            raise ValueError(f"Backend already added: {name}")
+
+        self._wait()
+        self.backends[name] = backend
+        self.ring.add(name)
+
+        return self._rebalance()
+
+    def remove_backend(self, name: str) -> int:
+        """
+        Removes a backend, handing off its accounts to the remaining ones, and closes it
+
+        Args:
+            name (str): Backend name
+
+        Returns:
+            moved (int): Amount of accounts handed off
+        """
+        if name not in self.backends:
+            raise ValueError(f"Unknown backend: {name}")
+
+        if len(self.backends) == 1:
+            raise ValueError("Can't remove the last backend")
+
+        self._wait()
+        self.ring.remove(name)
+        moved = self._rebalance()
+        self.backends.pop(name).close()
+
+        return moved
+
+    def _rebalance(self) -> int:
+        """Hands off the accounts whose backend changed on the ring"""
+        self._nodes = {}
+        moves: Dict[Tuple[str, str], List[Hashable]] = {}
+
+        for account_id, owner in self.accounts.items():
+            node = self.node_of(account_id)
+            if node != owner:
+                moves.setdefault((owner, node), []).append(account_id)
+
+        moved = 0
+        for (owner, node), account_ids in moves.items():
+            data = self.backends[owner].export_accounts(account_ids)
+            self.backends[node].import_accounts(data)
+
+            for account_id in account_ids:
+                self.accounts[account_id] = node
+            moved += len(account_ids)
+
+        self.moved += moved
+
+        return moved
+
+    def close(self) -> None:
+        """
+        Closes all backends
+
+        Returns:
+            None
+        """
+        for backend in self.backends.values():
+            backend.close()
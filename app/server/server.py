@@ -0,0 +1,243 @@
+# Built-in libraries
+import hmac
+import json
+import base64
+import asyncio
+from typing import Iterable, Optional
+
+# Project libraries
+from app.service.logging import logger
+from app.auth.authorizer import Authorizer
+from app.parse.io import EventEncoder, parse_event
+from app.parse.events import UnknownEvent
+from app.auth.validation.base_validation import BaseValidation
+
+# Default maximum amount of concurrent connections
+DEFAULT_MAX_CONNECTIONS = 128
+
+# Default maximum length of an input line, in bytes
+DEFAULT_LINE_LIMIT = 64 * 1024
+
+
+class AuthorizerServer:
+    """
+    Authorization server. Receives events as JSON lines over TCP or Unix sockets and answers each one with its
+    processed event, on the same layout as 'run.py'.
+
+    Connections are handled concurrently, sharing a single 'Authorizer', so account state is kept between connections.
+    Events are processed one at a time on the event loop, so events of an account are processed in the same order
+    they arrive, as on a single input. Each connection reads a new line only after its previous answers were flushed
+    to the socket buffer (backpressure), and at most 'max_connections' connections are served at once. Further
+    connections wait for a free slot.
+
+    When the authorizer has a write-ahead log, events are answered only after their changes are committed. On 'group'
+    fsync policy, connections waiting for a commit share a single one, made 'group_interval' seconds after the first
+    of them started waiting.
+
+    When a 'handoff_token' is given, lines with a 'handoff' key holding that token are control messages of a 'Router',
+    moving accounts between servers instead of being processed as events: '{"handoff": {"export": [ids], "token":
+    token}}' removes accounts, answered with their state as '{"handoff": {"state": ...}}', and '{"handoff": {"import":
+    state, "token": token}}' takes them over, answered with '{"handoff": {"imported": amount}}'. State is a base64
+    encoded 'Snapshot'. Failures are answered as '{"handoff": {"error": ...}}'. Without the token (or without a
+    'handoff_token', the default), those lines are processed as any other unknown event, so clients sending events
+    can't export, and so remove, accounts.
+    """
+    def __init__(
+        self,
+        validations: Iterable[BaseValidation],
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        line_limit: int = DEFAULT_LINE_LIMIT,
+        authorizer: Optional[Authorizer] = None,
+        handoff_token: Optional[str] = None
+    ):
+        """
+        Constructor method for AuthorizerServer
+
+        Args:
+            validations (Iterable[BaseValidation]): Validations applied to transactions
+            max_connections (int): Maximum amount of connections served at once
+            line_limit (int): Maximum length of an input line, in bytes
+            authorizer (Optional[Authorizer]): Authorizer holding account state. If not provided, a new one is created.
+            handoff_token (Optional[str]): Secret handoff control messages must hold. If not provided, handoff is
+            disabled.
+        """
+        self.authorizer = authorizer or Authorizer(events=[], validations=validations)
+        self.max_connections = max_connections
+        self.line_limit = line_limit
+        self.handoff_token = handoff_token
+        self.encoder = EventEncoder()
+        self.active_connections = 0
+        self._slots = None
+        self._group = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves a single connection, answering each received event until the client closes it
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader
+            writer (asyncio.StreamWriter): Connection writer
+
+        Returns:
+            None
+        """
+        async with self._slots:
+            self.active_connections += 1
+            try:
+                await self._serve(reader=reader, writer=writer)
+
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+
+            except Exception as e:
+                logger.error('Closing connection. Details: %s', e)
+
+            finally:
+                self.active_connections -= 1
+                writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        order = 0
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            if not line.strip():
+                continue
+
+            event = parse_event(value=line, order=order)
+            if type(event) is UnknownEvent and self.is_handoff(event.data):
+                writer.write(f"{json.dumps(self.handoff(event.data['handoff']))}\n".encode())
+                await writer.drain()
+                continue
+
+            processed_event = self.authorizer.process_event(event=event)
+            order += 1
+
+            if self.authorizer.wal is not None:
+                await self._durable()
+
+            writer.write(self.encoder.encode(processed_event).encode())
+            await writer.drain()
+
+    def is_handoff(self, data: dict) -> bool:
+        """
+        Checks if an unknown event is a handoff control message, holding the handoff token
+
+        Args:
+            data (dict): Unknown event data
+
+        Returns:
+            handoff (bool): Whether handoff is enabled and the event holds its token
+        """
+        message = data.get('handoff')
+        if self.handoff_token is None or not isinstance(message, dict):
+            return False
+
+        # Constant time comparison, so answer times don't tell how much of the token was right
+        return hmac.compare_digest(str(message.get('token', '')).encode(), self.handoff_token.encode())
+
+    def handoff(self, message: dict) -> dict:
+        """
+        Serves a handoff control message, exporting or importing accounts. See 'Authorizer.export_accounts'.
+        The message token is checked by 'is_handoff' beforehand.
+
+        Args:
+            message (dict): Either '{"export": [ids]}' or '{"import": state}'
+
+        Returns:
+            answer (dict): Answer to the message, under the 'handoff' key
+        """
+        try:
+            if 'export' in message:
+                data = self.authorizer.export_accounts(account_ids=message['export'])
+                return {'handoff': {'state': base64.b64encode(data).decode()}}
+
+            if 'import' in message:
+                imported = self.authorizer.import_accounts(data=base64.b64decode(message['import']))
+                return {'handoff': {'imported': imported}}
+
+            raise ValueError(f"Unknown handoff message: {sorted(message)}")
+
+        except Exception as e:
+            logger.error('Handoff failed. Details: %s', e)
+            return {'handoff': {'error': str(e)}}
+
+    async def _durable(self) -> None:
+        """Waits until the changes made so far are committed to the write-ahead log"""
+        wal = self.authorizer.wal
+        if wal.committed_lsn >= wal.lsn:
+            return
+
+        if wal.fsync != 'group':
+            wal.commit()
+            return
+
+        if self._group is None:
+            loop = asyncio.get_running_loop()
+            self._group = loop.create_future()
+            loop.call_later(wal.group_interval, self._commit_group)
+
+        # Shielded, so a cancelled connection doesn't cancel the commit other connections wait for
+        await asyncio.shield(self._group)
+
+    def _commit_group(self) -> None:
+        """Commits the write-ahead log, waking up the connections waiting for it"""
+        group, self._group = self._group, None
+        try:
+            self.authorizer.wal.commit()
+        except Exception as e:
+            group.set_exception(e)
+        else:
+            group.set_result(None)
+
+    async def start(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        unix_socket: Optional[str] = None
+    ) -> asyncio.AbstractServer:
+        """
+        Starts listening for connections, on a Unix socket if 'unix_socket' is provided, otherwise on TCP
+
+        Args:
+            host (Optional[str]): TCP host
+            port (Optional[int]): TCP port. Zero picks a free port.
+            unix_socket (Optional[str]): Unix socket path
+
+        Returns:
+            server (asyncio.AbstractServer): The listening server
+        """
+        self._slots = asyncio.Semaphore(self.max_connections)
+
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle, path=unix_socket, limit=self.line_limit)
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port, limit=self.line_limit)
+
+        addresses = ', '.join(str(s.getsockname()) for s in server.sockets)
+        logger.info('Authorizer server listening on %s.', addresses)
+
+        return server
+
+    async def serve_forever(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        unix_socket: Optional[str] = None
+    ) -> None:
+        """
+        Starts listening for connections and serves them until cancelled
+
+        Args:
+            host (Optional[str]): TCP host
+            port (Optional[int]): TCP port
+            unix_socket (Optional[str]): Unix socket path
+
+        Returns:
+            None
+        """
+        server = await self.start(host=host, port=port, unix_socket=unix_socket)
+        async with server:
+            await server.serve_forever()
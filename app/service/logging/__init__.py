@@ -1,3 +1,3 @@
-from app.service.logging.local_logging import LocalLogging
+from app.service.logging.local_logging import LocalLogging, CRITICAL, ERROR, WARNING, INFO, DEBUG
 
 logger = LocalLogging()
\ No newline at end of file
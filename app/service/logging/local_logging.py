@@ -1,12 +1,29 @@
-import logging
-import logging.config
+import os
+import atexit
 from typing import Optional
 
+# Severity levels, the same as the 'logging' module ones, which is only imported once logging is set up
+CRITICAL = 50
+ERROR = 40
+WARNING = 30
+INFO = 20
+DEBUG = 10
+
 
 class LocalLogging:
-    """Local logging class that abstract default logging class"""
+    """
+    Local logging class that abstract default logging class.
+
+    Setup is lazy: the 'logging' module is only imported and configured on the first message, so importing this module
+    costs nothing. Messages may take %-style arguments, which are only formatted if their level is enabled.
+
+    On asynchronous mode, records are put on a queue and written by the configured handlers on a background thread
+    (a 'QueueListener'), so logging doesn't block the caller on I/O. Forked processes start a listener of their own.
+    """
     DEFAULT_CONFIG = {
             'version': 1,
+            # Setup is lazy, so loggers other modules created before the first message (e.g. asyncio) are kept
+            'disable_existing_loggers': False,
             'formatters': {'default': {
                 'format': '[%(asctime)s] %(levelname)s: %(message)s',
             }},
@@ -24,10 +41,36 @@ class LocalLogging:
 
     def __init__(
         self,
-        logging_config: Optional[dict] = None
+        logging_config: Optional[dict] = None,
+        asynchronous: bool = False
     ):
-        self.setup(config=logging_config or self.DEFAULT_CONFIG)
-        self.logger = logging.getLogger(__name__)
+        """
+        Constructor method for LocalLogging
+
+        Args:
+            logging_config (Optional[dict]): Configuration dictionary, as taken by 'logging.config.dictConfig'
+            asynchronous (bool): Whether records are written on a background thread
+        """
+        self.config = logging_config or self.DEFAULT_CONFIG
+        self.asynchronous = asynchronous
+        self._logger = None
+        self._listener = None
+        self._handlers = []
+        self._fork_hook = False
+
+    @property
+    def logger(self):
+        """Property for the underlying 'logging.Logger', set up on first access"""
+        if self._logger is None:
+            import logging
+
+            self.setup(config=self.config)
+            self._logger = logging.getLogger(__name__)
+
+            if self.asynchronous:
+                self._start_listener()
+
+        return self._logger
 
     @staticmethod
     def setup(config: dict) -> None:
@@ -39,65 +82,153 @@ class LocalLogging:
         Returns:
             None
         """
+        import logging.config
 
         logging.config.dictConfig(config)
 
-    def info(self, message: str, **kwargs) -> None:
+    def start_async(self) -> None:
+        """
+        Switches to asynchronous mode, writing records on a background thread from now on.
+        Pending records are written on 'stop' or when the interpreter exits.
+
+        Returns:
+            None
+        """
+        self.asynchronous = True
+
+        if self._logger is not None and self._listener is None:
+            self._start_listener()
+
+    def _start_listener(self) -> None:
+        """Moves the handlers of the logger to a 'QueueListener', replacing them with a 'QueueHandler'"""
+        from queue import SimpleQueue
+        from logging.handlers import QueueHandler, QueueListener
+
+        records = SimpleQueue()
+        self._handlers = list(self._logger.handlers)
+        self._listener = QueueListener(records, *self._handlers, respect_handler_level=True)
+        self._logger.handlers = [QueueHandler(records)]
+
+        self._listener.start()
+        atexit.register(self.stop)
+
+        if not self._fork_hook and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+            self._fork_hook = True
+
+    def _after_fork(self) -> None:
+        """Starts a new listener on a forked process, since the listener thread isn't forked along"""
+        if self._listener is not None:
+            self._logger.handlers = self._handlers
+            self._listener = None
+            self._start_listener()
+
+    def stop(self) -> None:
+        """
+        Leaves asynchronous mode, waiting for pending records to be written. Further records are written right away.
+
+        Returns:
+            None
+        """
+        self.asynchronous = False
+
+        if self._listener is None:
+            return
+
+        atexit.unregister(self.stop)
+        self._listener.stop()
+        self._logger.handlers = self._handlers
+        self._listener, self._handlers = None, []
+
+    def enabled(self, level: int) -> bool:
+        """
+        Checks whether messages of a level are logged, so callers may skip building expensive messages
+
+        Args:
+            level (int): Severity level, e.g. 'DEBUG'
+
+        Returns:
+            enabled (bool): Whether messages of the level are logged
+        """
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, message: str, *args, **kwargs) -> None:
+        """
+        Log 'msg % args' with the given severity. Nothing is formatted if the level isn't enabled.
+        Args:
+            level: Severity level, e.g. 'INFO'
+            message: Message to be logged
+            *args: Arguments merged into the message
+            **kwargs: keyword arguments
+
+        Returns:
+            None
+        """
+        logger = self.logger
+        if logger.isEnabledFor(level):
+            logger.log(level, message, *args, **kwargs)
+
+    def info(self, message: str, *args, **kwargs) -> None:
         """
-        Log 'msg' with severity 'INFO'.
+        Log 'msg % args' with severity 'INFO'.
         Args:
             message: Message to be logged
+            *args: Arguments merged into the message
             **kwargs: keyword arguments
 
         Returns:
             None
         """
-        self.logger.info(msg=message, **kwargs)
+        self.log(INFO, message, *args, **kwargs)
 
-    def warning(self, message: str, **kwargs) -> None:
+    def warning(self, message: str, *args, **kwargs) -> None:
         """
-        Log 'msg' with severity 'WARNING'.
+        Log 'msg % args' with severity 'WARNING'.
         Args:
             message: Message to be logged
+            *args: Arguments merged into the message
             **kwargs: keyword arguments
 
         Returns:
             None
         """
-        self.logger.warning(msg=message, **kwargs)
+        self.log(WARNING, message, *args, **kwargs)
 
-    def error(self, message: str, **kwargs) -> None:
+    def error(self, message: str, *args, **kwargs) -> None:
         """
-        Log 'msg' with severity 'ERROR'.
+        Log 'msg % args' with severity 'ERROR'.
         Args:
             message: Message to be logged
+            *args: Arguments merged into the message
             **kwargs: keyword arguments
 
         Returns:
             None
         """
-        self.logger.error(msg=message, **kwargs)
+        self.log(ERROR, message, *args, **kwargs)
 
-    def critical(self, message: str, **kwargs) -> None:
+    def critical(self, message: str, *args, **kwargs) -> None:
         """
-        Log 'msg' with severity 'CRITICAL'.
+        Log 'msg % args' with severity 'CRITICAL'.
         Args:
             message: Message to be logged
+            *args: Arguments merged into the message
             **kwargs: keyword arguments
 
         Returns:
             None
         """
-        self.logger.critical(msg=message, **kwargs)
+        self.log(CRITICAL, message, *args, **kwargs)
 
-    def debug(self, message: str, **kwargs) -> None:
+    def debug(self, message: str, *args, **kwargs) -> None:
         """
-        Log 'msg' with severity 'DEBUG'.
+        Log 'msg % args' with severity 'DEBUG'.
         Args:
             message: Message to be logged
+            *args: Arguments merged into the message
             **kwargs: keyword arguments
 
         Returns:
             None
         """
-        self.logger.debug(msg=message, **kwargs)
+        self.log(DEBUG, message, *args, **kwargs)
@@ -0,0 +1 @@
+from app.service.metrics.instrumentation import Instrumentation, LatencyRecorder, file_exporter, log_exporter
@@ -0,0 +1,217 @@
+# Built-in libraries
+import json
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+# Project libraries
+from app.service.logging import INFO
+
+
+class LatencyRecorder:
+    """Records call counts and latencies of a stage or validation, keeping the most recent samples for percentiles"""
+    __slots__ = ('count', 'total_ns', 'violations', 'samples')
+
+    def __init__(self, sample_size: int = 4096):
+        """
+        Constructor method for LatencyRecorder
+
+        Args:
+            sample_size (int): Amount of most recent latencies used to compute percentiles
+        """
+        self.count = 0
+        self.total_ns = 0
+        self.violations = 0
+        self.samples = deque(maxlen=sample_size)
+
+    def record(self, elapsed_ns: int) -> None:
+        """
+        Records a single call
+
+        Args:
+            elapsed_ns (int): Call latency, in nanoseconds
+
+        Returns:
+            None
+        """
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.samples.append(elapsed_ns)
+
+    def percentile(self, q: float) -> float:
+        """
+        Gets a latency percentile of the most recent calls, in microseconds
+
+        Args:
+            q (float): Percentile, between 0 and 100
+
+        Returns:
+            latency (float): Latency in microseconds, zero if there are no calls
+        """
+        if not self.samples:
+            return 0.0
+
+        samples = sorted(self.samples)
+        position = min(len(samples) - 1, int(len(samples) * q / 100))
+
+        return samples[position] / 1000
+
+    def snapshot(self) -> dict:
+        """
+        Gets the recorded statistics
+
+        Returns:
+            statistics (dict): Call count, cumulative and mean latency and p50/p99 latency
+        """
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ns / 10 ** 6, 3),
+            'mean_us': round(self.total_ns / self.count / 1000, 3) if self.count else 0.0,
+            'p50_us': round(self.percentile(50), 3),
+            'p99_us': round(self.percentile(99), 3)
+        }
+
+
+class Instrumentation:
+    """
+    Collects timings of the authorizer stages (e.g. parse, dispatch, validate, register and serialize) and of each
+    validation, along with their violation rates.
+
+    Snapshots may be exported periodically, through a callable receiving the snapshot dict. See 'log_exporter' and
+    'file_exporter'.
+    """
+    def __init__(
+        self,
+        sample_size: int = 4096,
+        export_interval: Optional[float] = None,
+        exporter: Optional[Callable[[dict], None]] = None
+    ):
+        """
+        Constructor method for Instrumentation
+
+        Args:
+            sample_size (int): Amount of most recent latencies used to compute percentiles
+            export_interval (Optional[float]): Amount of seconds between exported snapshots. If not provided,
+            snapshots are only exported by calling 'export'.
+            exporter (Optional[Callable[[dict], None]]): Function receiving exported snapshots
+        """
+        self.sample_size = sample_size
+        self.export_interval = export_interval
+        self.exporter = exporter
+        self.stages: Dict[str, LatencyRecorder] = {}
+        self.validations: Dict[str, LatencyRecorder] = {}
+        self._started = time.monotonic()
+        self._last_export = self._started
+
+    def _recorder(self, recorders: Dict[str, LatencyRecorder], name: str) -> LatencyRecorder:
+        recorder = recorders.get(name)
+        if recorder is None:
+            recorder = recorders[name] = LatencyRecorder(sample_size=self.sample_size)
+
+        return recorder
+
+    def record_stage(self, name: str, elapsed_ns: int) -> None:
+        """
+        Records the latency of a stage
+
+        Args:
+            name (str): Stage name
+            elapsed_ns (int): Latency, in nanoseconds
+
+        Returns:
+            None
+        """
+        self._recorder(self.stages, name).record(elapsed_ns)
+
+    def record_validation(self, name: str, elapsed_ns: int, violation: str) -> None:
+        """
+        Records a validation call
+
+        Args:
+            name (str): Validation name
+            elapsed_ns (int): Latency, in nanoseconds
+            violation (str): Violation found, or an empty string
+
+        Returns:
+            None
+        """
+        recorder = self._recorder(self.validations, name)
+        recorder.record(elapsed_ns)
+        if violation:
+            recorder.violations += 1
+
+    def snapshot(self) -> dict:
+        """
+        Gets the statistics recorded so far
+
+        Returns:
+            snapshot (dict): Statistics of stages and validations
+        """
+        validations = {}
+        for name, recorder in self.validations.items():
+            statistics = recorder.snapshot()
+            statistics['violations'] = recorder.violations
+            statistics['violation_rate'] = round(recorder.violations / recorder.count, 6) if recorder.count else 0.0
+            validations[name] = statistics
+
+        return {
+            'elapsed_s': round(time.monotonic() - self._started, 3),
+            'stages': {name: recorder.snapshot() for name, recorder in self.stages.items()},
+            'validations': validations
+        }
+
+    def tick(self) -> None:
+        """
+        Exports a snapshot if 'export_interval' seconds have passed since the last export
+
+        Returns:
+            None
+        """
+        if self.export_interval is not None and time.monotonic() - self._last_export >= self.export_interval:
+            self.export()
+
+    def export(self) -> None:
+        """
+        Exports a snapshot through the exporter, if any
+
+        Returns:
+            None
+        """
+        self._last_export = time.monotonic()
+        if self.exporter is not None:
+            self.exporter(self.snapshot())
+
+
+def log_exporter(logger) -> Callable[[dict], None]:
+    """
+    Builds an exporter that logs snapshots as JSON, with severity 'INFO'. Snapshots aren't encoded unless the
+    severity is enabled.
+
+    Args:
+        logger: A logger like 'app.service.logging.logger'
+
+    Returns:
+        exporter (Callable[[dict], None]): The exporter
+    """
+    def export(snapshot: dict) -> None:
+        if logger.enabled(INFO):
+            logger.info("Metrics: %s", json.dumps(snapshot, sort_keys=True))
+
+    return export
+
+
+def file_exporter(path: str) -> Callable[[dict], None]:
+    """
+    Builds an exporter that appends snapshots to a file, as JSON lines
+
+    Args:
+        path (str): Metrics file path
+
+    Returns:
+        exporter (Callable[[dict], None]): The exporter
+    """
+    def export(snapshot: dict) -> None:
+        with open(path, 'a') as f:
+            f.write(f"{json.dumps(snapshot, sort_keys=True)}\n")
+
+    return export
@@ -0,0 +1,76 @@
+# Built-in libraries
+import json
+import struct
+from typing import Any, Tuple
+
+# Value tags
+NONE, INT, STR, JSON = range(4)
+
+TAG = struct.Struct('<B')
+INT64 = struct.Struct('<q')
+LENGTH = struct.Struct('<I')
+
+_INT64_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+def pack_value(buffer: bytearray, value: Any) -> None:
+    """
+    Appends a tagged value to a buffer. Strings and 64 bits integers are packed, other values are encoded as JSON.
+
+    Args:
+        buffer (bytearray): Buffer where the value is appended
+        value (Any): None, or a value that can be encoded as JSON
+
+    Returns:
+        None
+    """
+    if value is None:
+        buffer += TAG.pack(NONE)
+
+    elif type(value) is int and value in _INT64_RANGE:
+        buffer += TAG.pack(INT)
+        buffer += INT64.pack(value)
+
+    else:
+        if type(value) is str:
+            tag, encoded = STR, value.encode()
+        else:
+            tag, encoded = JSON, json.dumps(value).encode()
+
+        buffer += TAG.pack(tag)
+        buffer += LENGTH.pack(len(encoded))
+        buffer += encoded
+
+
+def unpack_value(data: bytes, offset: int) -> Tuple[Any, int]:
+    """
+    Reads a tagged value, as appended by 'pack_value'
+
+    Args:
+        data (bytes): Buffer where the value is read from
+        offset (int): Position of the value on buffer
+
+    Returns:
+        result (Tuple[Any, int]): The value and the position right after it
+    """
+    tag = data[offset]
+    offset += 1
+
+    if tag == NONE:
+        return None, offset
+
+    if tag == INT:
+        return INT64.unpack_from(data, offset)[0], offset + INT64.size
+
+    length, = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    encoded = bytes(data[offset:offset + length])
+    offset += length
+
+    if tag == STR:
+        return encoded.decode(), offset
+
+    if tag == JSON:
+        return json.loads(encoded), offset
+
+    raise ValueError(f"Unknown value tag: {tag}")
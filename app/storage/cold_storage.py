@@ -0,0 +1,121 @@
+# Built-in libraries
+import json
+from typing import Generator, Hashable, List
+
+# Project libraries
+from app.bank.records import TransactionRecord, from_epoch_micros
+
+# Default amount of evicted transactions buffered before writing to the file
+DEFAULT_FLUSH_SIZE = 1000
+
+
+class ColdStorage:
+    """
+    Keeps transactions evicted from account history on a file, so they are moved out of memory instead of dropped.
+
+    Transactions are appended as JSON lines on the input layout (with times to the millisecond, as on input events)
+    and their 'account-id', so the file may be read back with 'ColdStorage.read' or replayed as input events. Lines
+    are buffered and written at once when 'flush_size' transactions are pending, on 'flush' or on 'close'.
+
+    Transactions evicted while replaying a write-ahead log on recovery aren't written again, since the run that logged
+    them already did. The ones it still had buffered when it crashed are lost.
+    """
+    def __init__(self, path: str, flush_size: int = DEFAULT_FLUSH_SIZE):
+        """
+        Constructor method for ColdStorage
+
+        Args:
+            path (str): File path. Transactions are appended to it if it already exists.
+            flush_size (int): Amount of transactions buffered before writing. Zero writes them right away.
+        """
+        self.path = path
+        self.flush_size = flush_size
+        self.written = 0
+        self._buffer = []
+        self._file = open(path, 'a')
+
+    def __enter__(self) -> 'ColdStorage':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def encode(account_id: Hashable, record: TransactionRecord) -> str:
+        """
+        Encodes an evicted transaction as a JSON line
+
+        Args:
+            account_id (Hashable): Account the transaction was registered to
+            record (TransactionRecord): Evicted transaction
+
+        Returns:
+            line (str): Transaction event encoded as JSON, with a trailing line break
+        """
+        transaction = record.to_dict()
+        payload = transaction['transaction']
+        if isinstance(record.time, int):
+            # Milliseconds, as on input timestamps ('%f' would write microseconds), so reading them back is fast
+            time = from_epoch_micros(record.time).strftime('%Y-%m-%dT%H:%M:%S.')
+            payload['time'] = f"{time}{record.time // 1000 % 1000:03d}Z"
+        if account_id is not None:
+            payload['account-id'] = account_id
+
+        return f"{json.dumps(transaction, default=str)}\n"
+
+    def write(self, account_id: Hashable, records: List[TransactionRecord]) -> None:
+        """
+        Buffers transactions evicted from an account, flushing the buffer if needed
+
+        Args:
+            account_id (Hashable): Account the transactions were registered to
+            records (List[TransactionRecord]): Evicted transactions, in registration order
+
+        Returns:
+            None
+        """
+        self._buffer.extend(self.encode(account_id, record) for record in records)
+        self.written += len(records)
+
+        if len(self._buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes buffered transactions to the file
+
+        Returns:
+            None
+        """
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self._buffer = []
+
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Writes buffered transactions and closes the file
+
+        Returns:
+            None
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    @staticmethod
+    def read(path: str) -> Generator[dict, None, None]:
+        """
+        Reads transactions kept on a file
+
+        Args:
+            path (str): File path
+
+        Yield:
+            transaction (dict): Transaction event, on the input layout
+        """
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
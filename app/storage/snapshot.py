@@ -0,0 +1,199 @@
+# Built-in libraries
+import os
+import struct
+from datetime import timedelta
+from typing import Dict, Hashable, List, Tuple
+
+# Project libraries
+from app.bank.account import BankAccount, FastBankAccount
+from app.bank.window import TransactionWindow
+from app.bank.records import MERCHANTS, MICROSECOND, TransactionRecord
+from app.storage.codec import pack_value, unpack_value
+
+_HEADER = struct.Struct('<8sHQII')
+_ACCOUNT = struct.Struct('<?qBqI')
+_RECORD = struct.Struct('<qI')
+
+
+class Snapshot:
+    """
+    Compact binary encoding of account state, so an authorizer restarts without replaying its whole history.
+
+    For each account, keeps its fields and the transactions still on its time window, which are the ones validations
+    look at. Older transactions are dropped, so the snapshot size and the time to load it depend on live state only.
+    Restored accounts answer window queries the same as before, while scans over older history (e.g. transactions
+    registered out of order, older than the window) only see the restored transactions.
+
+    Accounts handed off to another authorizer ('history') keep their whole retained history instead, so they answer
+    transactions registered out of order after the handoff the same as they would have on their previous authorizer.
+
+    Snapshots also keep the log sequence number (LSN) of the last change they include, so a write-ahead log is
+    replayed from there on. See 'WriteAheadLog'.
+
+    Layout, little endian: a header (magic, version, LSN, amount of merchants and accounts), the merchant names used by
+    the restored transactions and then each account: id, active card, available limit, window horizon and coverage
+    and its transactions as (time, merchant, amount). Window transactions are the restored ones inside its coverage.
+    """
+    MAGIC = b'AUTHSNAP'
+    VERSION = 2
+
+    @classmethod
+    def dumps(cls, accounts: Dict[Hashable, BankAccount], lsn: int = 0, history: bool = False) -> bytes:
+        """
+        Encodes accounts
+
+        Args:
+            accounts (Dict[Hashable, BankAccount]): Accounts indexed by their ids
+            lsn (int): Log sequence number of the last change included
+            history (bool): If the whole retained history of each account is encoded, instead of its time window only
+
+        Returns:
+            data (bytes): Encoded snapshot
+        """
+        merchants: Dict[int, int] = {}
+        body = bytearray()
+
+        for account_id, account in accounts.items():
+            window = account.window
+            records = cls._history(account) if history else window.records()
+
+            pack_value(body, account_id)
+            pack_value(body, account.available_limit)
+            body += _ACCOUNT.pack(
+                account.active_card,
+                window.horizon // MICROSECOND,
+                window.covered_from is not None,
+                window.covered_from or 0,
+                len(records)
+            )
+
+            for record in records:
+                merchant = merchants.setdefault(record.merchant, len(merchants))
+                body += _RECORD.pack(record.time, merchant)
+                pack_value(body, record.amount)
+
+        data = bytearray(_HEADER.pack(cls.MAGIC, cls.VERSION, lsn, len(merchants), len(accounts)))
+        for merchant_id in merchants:
+            pack_value(data, MERCHANTS.decode(merchant_id))
+        data += body
+
+        return bytes(data)
+
+    @classmethod
+    def loads(cls, data: bytes) -> Tuple[Dict[Hashable, BankAccount], int]:
+        """
+        Decodes accounts
+
+        Args:
+            data (bytes): Encoded snapshot, as made by 'dumps'
+
+        Returns:
+            snapshot (Tuple[Dict[Hashable, BankAccount], int]): Accounts indexed by their ids and the log sequence
+            number of the last change included
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError('Not an authorizer snapshot: too short')
+
+        magic, version, lsn, merchant_count, account_count = _HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError('Not an authorizer snapshot: unknown magic number')
+
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+
+        offset = _HEADER.size
+        merchants: List[int] = []
+        for _ in range(merchant_count):
+            name, offset = unpack_value(data, offset)
+            merchants.append(MERCHANTS.encode(name))
+
+        accounts = {}
+        for _ in range(account_count):
+            account_id, offset = unpack_value(data, offset)
+            available_limit, offset = unpack_value(data, offset)
+            active_card, horizon, covered, covered_from, record_count = _ACCOUNT.unpack_from(data, offset)
+            offset += _ACCOUNT.size
+
+            records = []
+            for _ in range(record_count):
+                time, merchant = _RECORD.unpack_from(data, offset)
+                amount, offset = unpack_value(data, offset + _RECORD.size)
+                records.append(TransactionRecord(time=time, amount=amount, merchant=merchants[merchant]))
+
+            # Transactions older than the coverage were evicted from the window, so they aren't added back
+            window = TransactionWindow(horizon=timedelta(microseconds=horizon))
+            if covered:
+                window.covered_from = covered_from
+            for record in records:
+                window.add(record)
+
+            account = FastBankAccount(active_card=active_card, available_limit=available_limit, account_id=account_id)
+            account.transactions.extend(records)
+            account.window = window
+            accounts[account_id] = account
+
+        return accounts, lsn
+
+    @staticmethod
+    def _history(account: BankAccount) -> List[TransactionRecord]:
+        """Transactions of an account in registration order, with the ones retention evicted while on its window"""
+        retained = {id(record) for record in account.transactions}
+        evicted = [record for record in account.window.records() if id(record) not in retained]
+
+        # Retention evicts the oldest registered transactions first
+        return evicted + account.transactions
+
+    @classmethod
+    def save(cls, accounts: Dict[Hashable, BankAccount], path: str, lsn: int = 0) -> None:
+        """
+        Writes a snapshot to a file. The snapshot is written to a temporary file, synced to disk and renamed to
+        'path', so 'path' always holds a complete snapshot, even if the process crashes while saving.
+
+        Args:
+            accounts (Dict[Hashable, BankAccount]): Accounts indexed by their ids
+            path (str): Snapshot file path
+            lsn (int): Log sequence number of the last change included
+
+        Returns:
+            None
+        """
+        # Only needed when saving, so loading and short runs don't pay for its import
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary_path = tempfile.mkstemp(prefix='.snapshot-', dir=directory)
+
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(cls.dumps(accounts, lsn=lsn))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(temporary_path, path)
+
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+        # Persists the rename itself
+        if hasattr(os, 'O_DIRECTORY'):
+            directory_descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_descriptor)
+            finally:
+                os.close(directory_descriptor)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple[Dict[Hashable, BankAccount], int]:
+        """
+        Reads a snapshot from a file
+
+        Args:
+            path (str): Snapshot file path
+
+        Returns:
+            snapshot (Tuple[Dict[Hashable, BankAccount], int]): Accounts indexed by their ids and the log sequence
+            number of the last change included
+        """
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
@@ -0,0 +1,268 @@
+# Built-in libraries
+import os
+import time
+import zlib
+import struct
+from typing import Generator, Hashable, Tuple
+
+# Project libraries
+from app.bank.account import BankAccount
+from app.bank.records import MERCHANTS, TransactionRecord
+from app.storage.codec import pack_value, unpack_value
+
+# Entry kinds
+ACCOUNT_CREATION = 1
+TRANSACTION = 2
+CHECKPOINT = 3
+
+# fsync policies
+FSYNC_POLICIES = ('always', 'group', 'never')
+
+# Default maximum amount of seconds an entry waits to be synced to disk, on 'group' policy
+DEFAULT_GROUP_INTERVAL = 0.01
+
+# Default maximum amount of entries synced to disk at once, on 'group' policy
+DEFAULT_GROUP_SIZE = 1000
+
+# Payload length, checksum and log sequence number
+_HEADER = struct.Struct('<IIQ')
+_LSN = struct.Struct('<Q')
+_KIND = struct.Struct('<BB')
+
+
+def _sync(descriptor: int) -> None:
+    """Flushes file data to disk, skipping metadata when the platform allows it"""
+    if hasattr(os, 'fdatasync'):
+        os.fdatasync(descriptor)
+    else:
+        os.fsync(descriptor)
+
+
+class WriteAheadLog:
+    """
+    Append-only log of the changes made to accounts: account creations and accepted transactions.
+
+    Each entry gets a log sequence number (LSN) and a checksum, so an entry partially written by a crash is detected
+    and dropped. Entries are buffered and written to the file on 'commit'. How often the file is synced to disk
+    depends on the fsync policy:
+
+    * always: every entry is synced as soon as it's appended, so no accepted change is ever lost
+    * group: entries are synced in groups, once 'group_size' entries are pending or the oldest pending entry waited
+      'group_interval' seconds (the latency budget), so a single fsync is shared by many entries
+    * never: entries are written to the file as on 'group' policy, but syncing is left to the operating system
+
+    Changes should be answered only after their entries are committed. See 'OutputWriter' barrier.
+    """
+    def __init__(
+        self,
+        path: str,
+        fsync: str = 'group',
+        group_interval: float = DEFAULT_GROUP_INTERVAL,
+        group_size: int = DEFAULT_GROUP_SIZE,
+        lsn: int = 0
+    ):
+        """
+        Constructor method for WriteAheadLog. Opens the log for appending, dropping any partially written entry.
+
+        Args:
+            path (str): Log file path
+            fsync (str): fsync policy, one of 'always', 'group' or 'never'
+            group_interval (float): Maximum amount of seconds an entry waits to be synced, on 'group' policy
+            group_size (int): Maximum amount of entries synced at once, on 'group' policy
+            lsn (int): Log sequence number of the last change already persisted elsewhere (e.g. on a snapshot).
+            Sequence numbers continue from it or from the last entry of the log, whichever is greater.
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Expected fsync policy to be one of {FSYNC_POLICIES}, got: {fsync}")
+
+        self.path = path
+        self.fsync = fsync
+        self.group_interval = group_interval
+        self.group_size = group_size
+        self.syncs = 0
+
+        end, last_lsn = 0, 0
+        if os.path.exists(path):
+            for end, last_lsn, _, _ in self._scan(path):
+                pass
+
+        self.lsn = max(lsn, last_lsn)
+        self.committed_lsn = self.lsn
+        self._file = open(path, 'ab')
+        # Drops a partially written entry
+        self._file.truncate(end)
+
+        self._buffer = bytearray()
+        self._pending = 0
+        self._pending_since = 0.0
+
+    def __enter__(self) -> 'WriteAheadLog':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Property for the amount of entries not committed yet"""
+        return self._pending
+
+    def append_account(self, account: BankAccount) -> int:
+        """
+        Appends an account creation
+
+        Args:
+            account (BankAccount): Created account
+
+        Returns:
+            lsn (int): Log sequence number of the entry
+        """
+        payload = bytearray(_KIND.pack(ACCOUNT_CREATION, account.active_card))
+        pack_value(payload, account.account_id)
+        pack_value(payload, account.available_limit)
+
+        return self._append(payload)
+
+    def append_transaction(self, account_id: Hashable, record: TransactionRecord) -> int:
+        """
+        Appends an accepted transaction
+
+        Args:
+            account_id (Hashable): Id of the account where the transaction was registered
+            record (TransactionRecord): Registered transaction
+
+        Returns:
+            lsn (int): Log sequence number of the entry
+        """
+        payload = bytearray(_KIND.pack(TRANSACTION, 0))
+        pack_value(payload, account_id)
+        pack_value(payload, record.time)
+        pack_value(payload, record.amount)
+        pack_value(payload, MERCHANTS.decode(record.merchant))
+
+        return self._append(payload)
+
+    @staticmethod
+    def _entry(lsn: int, payload: bytes) -> bytes:
+        return _HEADER.pack(len(payload), zlib.crc32(payload, zlib.crc32(_LSN.pack(lsn))), lsn) + payload
+
+    def _append(self, payload: bytearray) -> int:
+        self.lsn += 1
+        self._buffer += self._entry(self.lsn, payload)
+
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending += 1
+
+        if (
+            self.fsync == 'always'
+            or self._pending >= self.group_size
+            or time.monotonic() - self._pending_since >= self.group_interval
+        ):
+            self.commit()
+
+        return self.lsn
+
+    def commit(self) -> None:
+        """
+        Writes pending entries to the log, syncing it to disk unless fsync policy is 'never'
+
+        Returns:
+            None
+        """
+        if not self._pending:
+            return
+
+        self._file.write(self._buffer)
+        self._file.flush()
+        if self.fsync != 'never':
+            _sync(self._file.fileno())
+            self.syncs += 1
+
+        self._buffer = bytearray()
+        self._pending = 0
+        self.committed_lsn = self.lsn
+
+    def truncate(self) -> None:
+        """
+        Drops all entries, once their changes were persisted elsewhere (e.g. on a snapshot).
+        A checkpoint entry is left in their place, so sequence numbers keep growing when the log is opened again.
+
+        Returns:
+            None
+        """
+        self._buffer = bytearray()
+        self._pending = 0
+        self.committed_lsn = self.lsn
+
+        self._file.truncate(0)
+        self._file.write(self._entry(self.lsn, _KIND.pack(CHECKPOINT, 0)))
+        self._file.flush()
+        _sync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Commits pending entries and closes the log
+
+        Returns:
+            None
+        """
+        if not self._file.closed:
+            self.commit()
+            self._file.close()
+
+    @staticmethod
+    def _scan(path: str) -> Generator[Tuple[int, int, int, tuple], None, None]:
+        """Reads entries until the end of the log or the first partially written entry, along with their end offset"""
+        with open(path, 'rb') as f:
+            offset = 0
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+
+                length, checksum, lsn = _HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload, zlib.crc32(_LSN.pack(lsn))) != checksum:
+                    return
+
+                offset += _HEADER.size + length
+                kind, active_card = _KIND.unpack_from(payload, 0)
+                if kind == CHECKPOINT:
+                    yield offset, lsn, kind, ()
+                    continue
+
+                account_id, position = unpack_value(payload, _KIND.size)
+
+                if kind == ACCOUNT_CREATION:
+                    available_limit, _ = unpack_value(payload, position)
+                    values = (account_id, bool(active_card), available_limit)
+
+                elif kind == TRANSACTION:
+                    record_time, position = unpack_value(payload, position)
+                    amount, position = unpack_value(payload, position)
+                    merchant, _ = unpack_value(payload, position)
+                    values = (account_id, record_time, amount, merchant)
+
+                else:
+                    raise ValueError(f"Unknown log entry kind: {kind}")
+
+                yield offset, lsn, kind, values
+
+    @classmethod
+    def read(cls, path: str, after: int = 0) -> Generator[Tuple[int, int, tuple], None, None]:
+        """
+        Reads the entries of a log, stopping at the first partially written one
+
+        Args:
+            path (str): Log file path
+            after (int): Only entries with a greater log sequence number are read
+
+        Yield:
+            entry (Tuple[int, int, tuple]): Log sequence number, kind and values of the entry. Values of account
+            creations are (account id, active card, available limit) and of transactions are
+            (account id, time, amount, merchant), with time as on 'TransactionRecord'.
+        """
+        for _, lsn, kind, values in cls._scan(path):
+            if lsn > after and kind != CHECKPOINT:
+                yield lsn, kind, values
@@ -0,0 +1,204 @@
+"""
+End-to-end throughput benchmark for the authorizer.
+
+Generates events with 'EventGenerator' and drives them through 'parse_input_events', 'Authorizer.process' and
+'OutputWriter', timing each stage. Results are written as JSON, so runs can be compared.
+With '--columnar', events are parsed up front and authorized by 'ColumnarAuthorizer' instead. With '--parse-workers',
+events are parsed by 'parse_input_events_parallel', alongside authorization.
+
+Usage:
+    python -m benchmarks.bench_authorizer --events 200000 --accounts 1000 --doubled-rate 0.01 --output result.json
+"""
+# Built-in libraries
+import io
+import sys
+import json
+import time
+import argparse
+import resource
+import platform
+from collections import Counter
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.batch.columnar import ColumnarAuthorizer
+from app.parse.io import OutputWriter, parse_input_events
+from app.parse.parallel import parse_input_events_parallel
+from app.auth.validation.custom_validation import (
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+)
+from benchmarks.generator import EventGenerator, add_generator_arguments, generator_from_arguments
+
+VALIDATIONS = [
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process, in megabytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_sequential(input_stream: io.StringIO, writer: OutputWriter, violations: Counter, parse_workers: int = 0) -> dict:
+    """
+    Drives events through 'parse_input_events', 'Authorizer.process_event' and 'OutputWriter', one at a time.
+    With 'parse_workers', parse time is the time spent waiting for parsed events.
+    """
+    if parse_workers:
+        parsed = parse_input_events_parallel(stream=input_stream, workers=parse_workers)
+    else:
+        parsed = parse_input_events(stream=input_stream)
+    auth = Authorizer(events=[], validations=VALIDATIONS)
+    clock = time.perf_counter
+    parse_time = authorize_time = serialize_time = 0.0
+    count = 0
+
+    start = clock()
+    while True:
+        t0 = clock()
+        event = next(parsed, None)
+        t1 = clock()
+        parse_time += t1 - t0
+        if event is None:
+            break
+
+        processed_event = auth.process_event(event=event)
+        t2 = clock()
+        authorize_time += t2 - t1
+
+        writer.write(processed_event)
+        serialize_time += clock() - t2
+
+        violations.update(processed_event.get('violations', []))
+        count += 1
+
+    writer.flush()
+
+    return {
+        'events': count,
+        'total': clock() - start,
+        'parse': parse_time,
+        'authorize': authorize_time,
+        'serialize': serialize_time,
+        'accounts': len(auth.accounts)
+    }
+
+
+def run_columnar(input_stream: io.StringIO, writer: OutputWriter, violations: Counter) -> dict:
+    """Same as 'run_sequential', with events parsed up front and authorized by 'ColumnarAuthorizer'"""
+    clock = time.perf_counter
+    authorize_time = serialize_time = 0.0
+    count = 0
+
+    start = clock()
+    parsed = list(parse_input_events(stream=input_stream))
+    parse_time = clock() - start
+
+    processed = ColumnarAuthorizer(events=parsed, validations=VALIDATIONS).process()
+    while True:
+        t0 = clock()
+        processed_event = next(processed, None)
+        t1 = clock()
+        authorize_time += t1 - t0
+        if processed_event is None:
+            break
+
+        writer.write(processed_event)
+        serialize_time += clock() - t1
+
+        violations.update(processed_event.get('violations', []))
+        count += 1
+
+    writer.flush()
+
+    return {
+        'events': count,
+        'total': clock() - start,
+        'parse': parse_time,
+        'authorize': authorize_time,
+        'serialize': serialize_time,
+        'accounts': None
+    }
+
+
+def run(generator: EventGenerator, events: int, columnar: bool = False, parse_workers: int = 0) -> dict:
+    """
+    Runs the benchmark
+
+    Args:
+        generator (EventGenerator): Generator of input events
+        events (int): Amount of events
+        columnar (bool): If events are authorized by 'ColumnarAuthorizer'
+        parse_workers (int): Amount of worker processes parsing events. Zero parses them along with authorization.
+
+    Returns:
+        result (dict): Benchmark results
+    """
+    input_stream = io.StringIO(''.join(generator.lines(events)))
+    output_stream = io.StringIO()
+    writer = OutputWriter(stream=output_stream, flush_size=1024 * 1024, flush_interval=float('inf'))
+    violations = Counter()
+
+    if columnar:
+        timings = run_columnar(input_stream=input_stream, writer=writer, violations=violations)
+    else:
+        timings = run_sequential(
+            input_stream=input_stream,
+            writer=writer,
+            violations=violations,
+            parse_workers=parse_workers
+        )
+
+    count, total = timings['events'], timings['total']
+
+    return {
+        'python': platform.python_version(),
+        'mode': 'columnar' if columnar else 'sequential',
+        'parse_workers': parse_workers,
+        'config': generator.config(),
+        'events': count,
+        'total_s': round(total, 4),
+        'events_per_sec': round(count / total, 1) if total else None,
+        'stages': {
+            'parse_s': round(timings['parse'], 4),
+            'authorize_s': round(timings['authorize'], 4),
+            'serialize_s': round(timings['serialize'], 4)
+        },
+        'accounts': timings['accounts'],
+        'violations': dict(sorted(violations.items())),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    parser.add_argument('--columnar', action='store_true', help='Authorizes events with ColumnarAuthorizer')
+    parser.add_argument('--parse-workers', type=int, default=0, help='Amount of worker processes parsing events')
+    parser.add_argument('--output', help='File where results are written. If not provided, uses standard output')
+    args = parser.parse_args()
+
+    result = json.dumps(run(
+        generator=generator_from_arguments(args),
+        events=args.events,
+        columnar=args.columnar,
+        parse_workers=args.parse_workers
+    ), indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(f"{result}\n")
+    else:
+        sys.stdout.write(f"{result}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Scale-out benchmark for the consistent-hash router.
+
+Generated events are authorized by a 'Router' over 1, 2, 4... local backends (worker processes), reporting the
+throughput of each run and the CPU time spent by the router itself and by the backends. Since the router partitions
+and merges events on a single process, its CPU time per event bounds the speedup: throughput grows close to linearly
+while backends are the bottleneck and there are CPUs enough for all of them.
+
+Then a backend is added and another one removed in the middle of a run, reporting the amount of accounts handed off.
+
+Usage:
+    python -m benchmarks.bench_router --events 200000 --accounts 1000 --backends 4
+"""
+# Built-in libraries
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+from typing import List
+
+# Project libraries
+from app.server.router import LocalBackend, Router
+from app.auth.validation.custom_validation import (
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+)
+from benchmarks.generator import add_generator_arguments, generator_from_arguments
+
+VALIDATIONS = [
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+]
+
+
+def cpu_seconds(who: int) -> float:
+    """CPU time (user and system) of this process or of its finished children"""
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_router(lines: List[str], backends: int) -> dict:
+    """
+    Authorizes events on a router over local backends
+
+    Args:
+        lines (List[str]): Events encoded as JSON
+        backends (int): Amount of local backends
+
+    Returns:
+        result (dict): Throughput and CPU time of the router and of the backends
+    """
+    router_cpu = cpu_seconds(resource.RUSAGE_SELF)
+    backends_cpu = cpu_seconds(resource.RUSAGE_CHILDREN)
+
+    router = Router(backends={f"local-{i}": LocalBackend(validations=VALIDATIONS) for i in range(backends)})
+    start = time.perf_counter()
+    for _ in router.process(lines):
+        pass
+    elapsed = time.perf_counter() - start
+    # Backend CPU time is only reported once their processes end
+    router.close()
+
+    return {
+        'backends': backends,
+        'seconds': round(elapsed, 3),
+        'events_per_second': round(len(lines) / elapsed),
+        'router_cpu_seconds': round(cpu_seconds(resource.RUSAGE_SELF) - router_cpu, 3),
+        'backends_cpu_seconds': round(cpu_seconds(resource.RUSAGE_CHILDREN) - backends_cpu, 3)
+    }
+
+
+def run_handoff(lines: List[str], backends: int) -> dict:
+    """
+    Adds a backend at a third of the events and removes one at two thirds, timing the handoffs
+
+    Args:
+        lines (List[str]): Events encoded as JSON
+        backends (int): Amount of local backends at the start
+
+    Returns:
+        result (dict): Amount of accounts handed off on each change and the time each one took
+    """
+    router = Router(backends={f"local-{i}": LocalBackend(validations=VALIDATIONS) for i in range(backends)})
+    result = {}
+
+    for position, _ in enumerate(router.process(lines)):
+        if position == len(lines) // 3:
+            start = time.perf_counter()
+            result['added'] = {'moved_accounts': router.add_backend(
+                f"local-{backends}", LocalBackend(validations=VALIDATIONS)
+            )}
+            result['added']['seconds'] = round(time.perf_counter() - start, 3)
+
+        elif position == 2 * len(lines) // 3:
+            start = time.perf_counter()
+            result['removed'] = {'moved_accounts': router.remove_backend('local-0')}
+            result['removed']['seconds'] = round(time.perf_counter() - start, 3)
+
+    result['accounts'] = len(router.accounts)
+    router.close()
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    parser.add_argument('--backends', type=int, default=4, help='Maximum amount of local backends')
+    parser.set_defaults(accounts=1000)
+    args = parser.parse_args()
+
+    generator = generator_from_arguments(args)
+    lines = [line.rstrip('\n') for line in generator.lines(args.events)]
+
+    counts = [1]
+    while counts[-1] * 2 <= args.backends:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.backends:
+        counts.append(args.backends)
+
+    output = {
+        'config': generator.config(),
+        'events': args.events,
+        'cpus': os.cpu_count(),
+        'results': [run_router(lines=lines, backends=count) for count in counts],
+        'handoff': run_handoff(lines=lines, backends=max(args.backends, 2))
+    }
+    sys.stdout.write(f"{json.dumps(output, indent=2)}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Warm start benchmark: time to rebuild authorizer state by replaying the event history versus loading a snapshot.
+
+Generates events with 'EventGenerator', replays them through 'Authorizer', saves a snapshot and loads it back.
+
+Usage:
+    python -m benchmarks.bench_snapshot --events 1000000 --accounts 10000
+"""
+# Built-in libraries
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.io import parse_input_events
+from app.storage.snapshot import Snapshot
+from benchmarks.bench_authorizer import VALIDATIONS
+from benchmarks.generator import EventGenerator, add_generator_arguments, generator_from_arguments
+
+
+def run(generator: EventGenerator, events: int) -> dict:
+    """
+    Runs the benchmark
+
+    Args:
+        generator (EventGenerator): Generator of input events
+        events (int): Amount of events
+
+    Returns:
+        result (dict): Benchmark results
+    """
+    history = ''.join(generator.lines(events))
+
+    start = time.perf_counter()
+    auth = Authorizer(events=parse_input_events(stream=io.StringIO(history)), validations=VALIDATIONS)
+    for _ in auth.process():
+        pass
+    replay_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.snap')
+
+        start = time.perf_counter()
+        auth.save_snapshot(path=path)
+        save_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = Snapshot.load(path=path)
+        load_time = time.perf_counter() - start
+
+        size = os.path.getsize(path)
+
+    return {
+        'config': generator.config(),
+        'events': events,
+        'history_bytes': len(history),
+        'snapshot_bytes': size,
+        'accounts': len(restored),
+        'transactions': sum(len(account.transactions) for account in auth.accounts.values()),
+        'window_transactions': sum(len(account.window) for account in restored.values()),
+        'replay_s': round(replay_time, 4),
+        'save_s': round(save_time, 4),
+        'load_s': round(load_time, 4)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    result = run(generator=generator_from_arguments(args), events=args.events)
+    sys.stdout.write(f"{json.dumps(result, indent=2)}\n")
+
+
+if __name__ == '__main__':
+    main()
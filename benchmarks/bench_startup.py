@@ -0,0 +1,156 @@
+"""
+Startup benchmark: import profile of 'run.py' and per-batch latency of cold runs against pre-forked warm workers.
+
+The import profile comes from 'python -X importtime', listing the slowest imports made by 'run.py' itself
+(cumulative time) and the slowest modules overall (self time).
+
+Generated events are written to a temporary file, which is then authorized:
+    - cold: 'python run.py --input FILE', a new interpreter per batch
+    - warm: sent to a 'PreforkServer' ('python run.py --prefork 1'), on the benchmark process ('submit') and with
+      'python run.py --submit FILE', which also pays for the client interpreter startup
+
+Usage:
+    python -m benchmarks.bench_startup --events 1000 --runs 10
+"""
+# Built-in libraries
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Callable
+
+# Project libraries
+from app.server.prefork import submit
+from benchmarks.generator import add_generator_arguments, generator_from_arguments
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN = os.path.join(ROOT, 'run.py')
+
+
+def import_profile(module: str = 'run', top: int = 10) -> dict:
+    """
+    Profiles the imports of a module with 'python -X importtime'
+
+    Args:
+        module (str): Module imported
+        top (int): Amount of imports listed
+
+    Returns:
+        profile (dict): Import time of the module and its slowest imports, in milliseconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level, below the module importing them
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    total = sum(cumulative for name, depth, _, cumulative in imports if name == module and not depth)
+    direct = sorted(((name, cumulative) for name, depth, _, cumulative in imports if depth == 1), key=lambda i: -i[1])
+    direct = direct[:top]
+    slowest = sorted(imports, key=lambda i: -i[2])[:top]
+
+    return {
+        'total_ms': round(total / 1000, 1),
+        'modules': len(imports),
+        'slowest_imports_ms': {name: round(cumulative / 1000, 1) for name, cumulative in direct},
+        'slowest_modules_ms': {name: round(self_us / 1000, 1) for name, _, self_us, _ in slowest}
+    }
+
+
+def best_of(function: Callable[[], None], runs: int) -> float:
+    """Fastest of 'runs' calls to a function, in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return round(min(timings) * 1000, 1)
+
+
+def wait_for(path: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Waits for a Unix socket to be created by a server process"""
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError('Pre-forked workers did not start')
+        time.sleep(0.01)
+
+
+def run(path: str, directory: str, runs: int) -> dict:
+    """
+    Runs the benchmark
+
+    Args:
+        path (str): Input file authorized on each run
+        directory (str): Directory where the Unix socket is placed
+        runs (int): Amount of runs of each mode. The fastest one is reported.
+
+    Returns:
+        results (dict): Latency of each mode, in milliseconds
+    """
+    def run_command(*args: str) -> Callable[[], None]:
+        return lambda: subprocess.run([sys.executable, RUN, *args], stdout=subprocess.DEVNULL, check=True)
+
+    unix_socket = os.path.join(directory, 'bench.sock')
+    results = {
+        'interpreter_ms': best_of(lambda: subprocess.run([sys.executable, '-c', 'pass'], check=True), runs),
+        'help_ms': best_of(run_command('--help'), runs),
+        'cold_ms': best_of(run_command('--input', path), runs)
+    }
+
+    server = subprocess.Popen(
+        [sys.executable, RUN, '--prefork', '1', '--unix-socket', unix_socket],
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for(path=unix_socket, process=server)
+        results['warm_ms'] = best_of(lambda: list(submit(path=path, unix_socket=unix_socket)), runs)
+        results['warm_cli_ms'] = best_of(run_command('--submit', path, '--unix-socket', unix_socket), runs)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    parser.add_argument('--runs', type=int, default=10, help='Amount of runs of each mode. The fastest one is reported')
+    parser.add_argument('--top', type=int, default=10, help='Amount of imports listed on the import profile')
+    parser.set_defaults(events=1000)
+    args = parser.parse_args()
+
+    generator = generator_from_arguments(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'events.jsonl')
+        with open(path, 'w') as f:
+            f.writelines(generator.lines(args.events))
+
+        results = run(path=path, directory=directory, runs=args.runs)
+
+    output = {
+        'config': generator.config(),
+        'events': args.events,
+        'imports': import_profile(top=args.top),
+        'results': results
+    }
+    sys.stdout.write(f"{json.dumps(output, indent=2)}\n")
+
+
+if __name__ == '__main__':
+    main()
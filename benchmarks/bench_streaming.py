@@ -0,0 +1,138 @@
+"""
+Memory and latency benchmark for the input reader.
+
+Compares the streaming 'parse_input_events' against the previous implementation, which loaded the whole input
+with 'sys.stdin.readlines()' before yielding the first event. Each reader runs on a fresh interpreter, so peak
+memory (max RSS) isn't shared between runs.
+
+Usage:
+    python -m benchmarks.bench_streaming --lines 10000000
+"""
+# Built-in libraries
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Project libraries
+from app.parse.io import parse_input_events, DEFAULT_BUFFER_SIZE
+
+TRANSACTION_LINE = '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T11:00:00.000Z"}}\n'
+ACCOUNT_LINE = '{"account": {"active-card": true, "available-limit": 100}}\n'
+
+
+def generate_input(path: str, lines: int) -> None:
+    """
+    Writes an input file with one account creation followed by 'lines - 1' transactions
+
+    Args:
+        path (str): Path of the file to be written
+        lines (int): Total amount of lines
+
+    Returns:
+        None
+    """
+    with open(path, 'w') as f:
+        f.write(ACCOUNT_LINE)
+        remaining = lines - 1
+        block = TRANSACTION_LINE * 10000
+        while remaining >= 10000:
+            f.write(block)
+            remaining -= 10000
+        f.write(TRANSACTION_LINE * remaining)
+
+
+def parse_with_readlines():
+    """Previous reader implementation, kept as the benchmark baseline"""
+    for order, value in enumerate(sys.stdin.readlines()):
+        data = json.loads(value)
+        if 'transaction' in data:
+            t = data.get('transaction', {})
+            t.update({'time': datetime.strptime(t.get('time', ''), '%Y-%m-%dT%H:%M:%S.%fZ')})
+        data.update({'order': order})
+        yield data
+
+
+def measure(reader: str, buffer_size: int) -> dict:
+    """
+    Consumes standard input with the given reader, measuring time to the first event and total time
+
+    Args:
+        reader (str): Either 'readlines' or 'streaming'
+        buffer_size (int): Read buffer size used by the streaming reader
+
+    Returns:
+        A dict with the measured values
+    """
+    start = time.perf_counter()
+    if reader == 'readlines':
+        events = parse_with_readlines()
+    else:
+        events = parse_input_events(buffer_size=buffer_size)
+
+    first_event = None
+    count = 0
+    for _ in events:
+        if first_event is None:
+            first_event = time.perf_counter() - start
+        count += 1
+
+    return {
+        'reader': reader,
+        'buffer_size': buffer_size if reader == 'streaming' else None,
+        'events': count,
+        'first_event_ms': round((first_event or 0) * 1000, 3),
+        'total_s': round(time.perf_counter() - start, 3),
+        # ru_maxrss is reported in kilobytes on Linux
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def run_child(path: str, reader: str, buffer_size: int) -> dict:
+    """Runs a single measurement on a fresh interpreter, using the input file as standard input"""
+    with open(path) as f:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_streaming', '--child', reader, '--buffer-size', str(buffer_size)],
+            stdin=f,
+            stdout=subprocess.PIPE,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout
+
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=10_000_000, help='Amount of lines of the generated input')
+    parser.add_argument('--buffer-size', type=int, nargs='+', default=[DEFAULT_BUFFER_SIZE],
+                        help='Read buffer sizes to benchmark for the streaming reader')
+    parser.add_argument('--input', help='Use an existing JSONL file instead of generating one')
+    parser.add_argument('--child', choices=['readlines', 'streaming'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.stdout.write(json.dumps(measure(reader=args.child, buffer_size=args.buffer_size[0])))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if not path:
+            path = os.path.join(tmp, 'events.jsonl')
+            generate_input(path=path, lines=args.lines)
+
+        results = [run_child(path=path, reader='readlines', buffer_size=0)]
+        for buffer_size in args.buffer_size:
+            results.append(run_child(path=path, reader='streaming', buffer_size=buffer_size))
+
+    for result in results:
+        sys.stdout.write(f"{json.dumps(result)}\n")
+
+
+if __name__ == '__main__':
+    main()
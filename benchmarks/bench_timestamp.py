@@ -0,0 +1,77 @@
+"""
+Microbenchmark for timestamp parsing.
+
+Compares 'datetime.strptime', used before, against 'TimestampParser' on timestamps spread over a configurable
+amount of distinct days and hours.
+
+Usage:
+    python -m benchmarks.bench_timestamp --timestamps 100000 --hours 24
+"""
+# Built-in libraries
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.parse.timestamp import TimestampParser, TIMESTAMP_FORMAT
+
+
+def generate_timestamps(amount: int, hours: int, seed: int = 0) -> list:
+    """
+    Generates timestamps on the input events layout
+
+    Args:
+        amount (int): Amount of timestamps
+        hours (int): Amount of distinct hours timestamps are spread over
+        seed (int): Seed of the random generator
+
+    Returns:
+        timestamps (list): Sorted timestamps
+    """
+    rand = random.Random(seed)
+    start = datetime(2019, 2, 13)
+    values = sorted(start + timedelta(microseconds=rand.randrange(hours * 3600 * 10 ** 6)) for _ in range(amount))
+
+    return [v.strftime('%Y-%m-%dT%H:%M:%S.') + f"{v.microsecond // 1000:03d}Z" for v in values]
+
+
+def measure(name: str, parse, timestamps: list, repeat: int) -> dict:
+    """Measures the best time to parse all timestamps, out of 'repeat' runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in timestamps:
+            parse(value)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        'parser': name,
+        'timestamps': len(timestamps),
+        'total_s': round(best, 4),
+        'per_call_ns': round(best / len(timestamps) * 10 ** 9, 1)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--timestamps', type=int, default=100_000, help='Amount of parsed timestamps')
+    parser.add_argument('--hours', type=int, default=24, help='Amount of distinct hours of timestamps')
+    parser.add_argument('--repeat', type=int, default=5, help='Amount of runs of each parser')
+    args = parser.parse_args()
+
+    timestamps = generate_timestamps(amount=args.timestamps, hours=args.hours)
+
+    results = [
+        measure('strptime', lambda v: datetime.strptime(v, TIMESTAMP_FORMAT), timestamps, args.repeat),
+        measure('TimestampParser', TimestampParser().parse, timestamps, args.repeat)
+    ]
+
+    for result in results:
+        sys.stdout.write(f"{json.dumps(result)}\n")
+
+
+if __name__ == '__main__':
+    main()
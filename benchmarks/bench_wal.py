@@ -0,0 +1,119 @@
+"""
+Write-ahead log benchmark: authorizer throughput and amount of fsync calls with each fsync policy.
+
+Generates events with 'EventGenerator' and processes them through 'Authorizer', logging changes on a temporary
+write-ahead log ('always', 'group' with each of the given latency budgets and 'never'), and without a log as baseline.
+The log is placed on the given directory, so the disk being measured can be chosen.
+
+Usage:
+    python -m benchmarks.bench_wal --events 20000 --group-intervals 0.001 0.01 --directory /var/tmp
+"""
+# Built-in libraries
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import List, Optional
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.io import parse_input_events
+from app.storage.wal import WriteAheadLog, DEFAULT_GROUP_INTERVAL, DEFAULT_GROUP_SIZE
+from benchmarks.bench_authorizer import VALIDATIONS
+from benchmarks.generator import add_generator_arguments, generator_from_arguments
+
+
+def run_policy(history: str, directory: str, fsync: Optional[str], group_interval: float, group_size: int) -> dict:
+    """
+    Processes events logging changes with a fsync policy
+
+    Args:
+        history (str): Events encoded as JSON lines
+        directory (str): Directory where the log is placed
+        fsync (Optional[str]): fsync policy. If not provided, changes aren't logged.
+        group_interval (float): Latency budget, on 'group' policy. On 'never' policy, interval between writes.
+        group_size (int): Maximum amount of entries synced at once, on 'group' policy
+
+    Returns:
+        result (dict): Policy results
+    """
+    wal = None
+    if fsync is not None:
+        path = os.path.join(directory, 'bench.wal')
+        if os.path.exists(path):
+            os.unlink(path)
+        wal = WriteAheadLog(path=path, fsync=fsync, group_interval=group_interval, group_size=group_size)
+
+    auth = Authorizer(events=parse_input_events(stream=io.StringIO(history)), validations=VALIDATIONS, wal=wal)
+
+    start = time.perf_counter()
+    count = 0
+    for _ in auth.process():
+        count += 1
+    if wal is not None:
+        wal.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'fsync': fsync or 'no-log',
+        'group_interval': group_interval if fsync == 'group' else None,
+        'total_s': round(elapsed, 4),
+        'events_per_sec': round(count / elapsed, 1) if elapsed else None,
+        'changes': auth.lsn,
+        'syncs': wal.syncs if wal is not None else 0,
+        'log_bytes': os.path.getsize(wal.path) if wal is not None else 0
+    }
+
+
+def run(history: str, directory: str, group_intervals: List[float], group_size: int) -> List[dict]:
+    """
+    Runs the benchmark for all fsync policies
+
+    Args:
+        history (str): Events encoded as JSON lines
+        directory (str): Directory where the log is placed
+        group_intervals (List[float]): Latency budgets measured on 'group' policy
+        group_size (int): Maximum amount of entries synced at once, on 'group' policy
+
+    Returns:
+        results (List[dict]): Results of each policy
+    """
+    policies = [(None, 0.0), ('never', DEFAULT_GROUP_INTERVAL)]
+    policies += [('group', interval) for interval in group_intervals]
+    policies += [('always', 0.0)]
+
+    return [
+        run_policy(history=history, directory=directory, fsync=fsync, group_interval=interval, group_size=group_size)
+        for fsync, interval in policies
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    parser.add_argument('--group-intervals', type=float, nargs='+', default=[0.001, 0.01, 0.1],
+                        help="Latency budgets measured on 'group' policy, in seconds")
+    parser.add_argument('--group-size', type=int, default=DEFAULT_GROUP_SIZE,
+                        help="Maximum amount of entries synced at once, on 'group' policy")
+    parser.add_argument('--directory', help='Directory where the log is placed. If not provided, uses a temporary one')
+    args = parser.parse_args()
+
+    generator = generator_from_arguments(args)
+    history = ''.join(generator.lines(args.events))
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        results = run(
+            history=history,
+            directory=directory,
+            group_intervals=args.group_intervals,
+            group_size=args.group_size
+        )
+
+    sys.stdout.write(f"{json.dumps({'config': generator.config(), 'events': args.events, 'results': results}, indent=2)}\n")
+
+
+if __name__ == '__main__':
+    main()
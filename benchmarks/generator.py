@@ -0,0 +1,238 @@
+"""
+Seeded synthetic event generator for benchmarks.
+
+Generates account creations and transactions on the input layout, with configurable amount of accounts,
+merchant cardinality, amount distribution, bursts of transactions and mix of violations.
+
+Usage:
+    python -m benchmarks.generator --events 1000000 --accounts 1000 --burst-probability 0.01 > events.jsonl
+"""
+# Built-in libraries
+import sys
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, Generator
+
+
+def amount_sampler(spec: str, rand: random.Random) -> Callable[[], int]:
+    """
+    Builds a function that samples transaction amounts from a distribution
+
+    Args:
+        spec (str): Distribution, one of 'fixed:VALUE', 'uniform:LOW:HIGH' or 'lognormal:MU:SIGMA'
+        rand (random.Random): Random generator
+
+    Returns:
+        sampler (Callable[[], int]): Function returning a positive amount on each call
+    """
+    name, *params = spec.split(':')
+
+    if name == 'fixed' and len(params) == 1:
+        value = int(params[0])
+        return lambda: value
+
+    if name == 'uniform' and len(params) == 2:
+        low, high = int(params[0]), int(params[1])
+        return lambda: rand.randint(low, high)
+
+    if name == 'lognormal' and len(params) == 2:
+        mu, sigma = float(params[0]), float(params[1])
+        return lambda: max(1, int(rand.lognormvariate(mu, sigma)))
+
+    raise ValueError(f"Unknown amount distribution: {spec}")
+
+
+class EventGenerator:
+    """
+    Generates a reproducible stream of input events.
+
+    Each account is created before its first transaction, unless the event is picked to be a transaction of an
+    account that doesn't exist. Transactions may start bursts (many transactions of an account within seconds,
+    leading to 'high-frequency-small-interval'), repeat the previous transaction of the account
+    ('doubled-transaction') or exceed any limit ('insufficient-limit'). Accounts may be created with inactive cards.
+    """
+    def __init__(
+        self,
+        accounts: int = 1,
+        merchants: int = 100,
+        amounts: str = 'uniform:1:100',
+        mean_gap: float = 1.0,
+        burst_probability: float = 0.0,
+        burst_size: int = 5,
+        inactive_card_rate: float = 0.0,
+        insufficient_limit_rate: float = 0.0,
+        doubled_rate: float = 0.0,
+        uninitialized_rate: float = 0.0,
+        unknown_rate: float = 0.0,
+        initial_limit: int = 10 ** 9,
+        seed: int = 0
+    ):
+        """
+        Constructor method for EventGenerator
+
+        Args:
+            accounts (int): Amount of accounts. With a single account, events don't have 'account-id'.
+            merchants (int): Amount of distinct merchants
+            amounts (str): Amount distribution, see 'amount_sampler'
+            mean_gap (float): Mean amount of seconds between events
+            burst_probability (float): Probability of a transaction starting a burst
+            burst_size (int): Amount of transactions of a burst
+            inactive_card_rate (float): Probability of an account having an inactive card
+            insufficient_limit_rate (float): Probability of a transaction exceeding any limit
+            doubled_rate (float): Probability of a transaction repeating the previous one of the account
+            uninitialized_rate (float): Probability of a transaction of an account that doesn't exist
+            unknown_rate (float): Probability of an unknown event
+            initial_limit (int): Available limit of created accounts
+            seed (int): Seed of the random generator
+        """
+        self.accounts = accounts
+        self.merchants = [f"Merchant {i}" for i in range(merchants)]
+        self.amounts = amounts
+        self.mean_gap = mean_gap
+        self.burst_probability = burst_probability
+        self.burst_size = burst_size
+        self.inactive_card_rate = inactive_card_rate
+        self.insufficient_limit_rate = insufficient_limit_rate
+        self.doubled_rate = doubled_rate
+        self.uninitialized_rate = uninitialized_rate
+        self.unknown_rate = unknown_rate
+        self.initial_limit = initial_limit
+        self.seed = seed
+
+    def config(self) -> dict:
+        """Gets the generator parameters, so benchmark results can be reproduced"""
+        config = dict(vars(self))
+        config['merchants'] = len(self.merchants)
+
+        return config
+
+    def _with_account_id(self, payload: dict, account_id: int) -> dict:
+        if self.accounts > 1:
+            payload['account-id'] = account_id
+
+        return payload
+
+    def events(self, count: int) -> Generator[dict, None, None]:
+        """
+        Generates events
+
+        Args:
+            count (int): Amount of events
+
+        Yield:
+            event (dict): Event on the input layout, with time as a string
+        """
+        rand = random.Random(self.seed)
+        sample_amount = amount_sampler(self.amounts, rand)
+        time = datetime(2019, 2, 13)
+        created = set()
+        previous = {}
+        burst_account, burst_left = None, 0
+
+        for _ in range(count):
+            if burst_left:
+                account_id = burst_account
+                burst_left -= 1
+                time += timedelta(milliseconds=rand.randint(1, 2000))
+            else:
+                account_id = rand.randrange(self.accounts)
+                time += timedelta(seconds=rand.expovariate(1 / self.mean_gap)) if self.mean_gap else timedelta(0)
+
+            if rand.random() < self.unknown_rate:
+                yield {"unknown": {"value": rand.random()}}
+                continue
+
+            if rand.random() < self.uninitialized_rate:
+                account_id = self.accounts + rand.randrange(self.accounts)
+
+            elif account_id not in created:
+                created.add(account_id)
+                yield {"account": self._with_account_id({
+                    "active-card": rand.random() >= self.inactive_card_rate,
+                    "available-limit": self.initial_limit
+                }, account_id)}
+                continue
+
+            if account_id in previous and rand.random() < self.doubled_rate:
+                merchant, amount = previous[account_id]
+            else:
+                merchant = rand.choice(self.merchants)
+                amount = sample_amount()
+                if rand.random() < self.insufficient_limit_rate:
+                    amount += self.initial_limit
+
+            previous[account_id] = (merchant, amount)
+
+            if not burst_left and rand.random() < self.burst_probability:
+                burst_account, burst_left = account_id, self.burst_size - 1
+
+            yield {"transaction": self._with_account_id({
+                "merchant": merchant,
+                "amount": amount,
+                "time": time.strftime('%Y-%m-%dT%H:%M:%S.') + f"{time.microsecond // 1000:03d}Z"
+            }, account_id)}
+
+    def lines(self, count: int) -> Generator[str, None, None]:
+        """
+        Generates events as JSON lines
+
+        Args:
+            count (int): Amount of events
+
+        Yield:
+            line (str): Event encoded as JSON, with a trailing line break
+        """
+        for event in self.events(count):
+            yield f"{json.dumps(event)}\n"
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the 'EventGenerator' parameters to a command line parser"""
+    parser.add_argument('--events', type=int, default=100_000, help='Amount of generated events')
+    parser.add_argument('--accounts', type=int, default=1, help='Amount of accounts')
+    parser.add_argument('--merchants', type=int, default=100, help='Amount of distinct merchants')
+    parser.add_argument('--amounts', default='uniform:1:100',
+                        help="Amount distribution: 'fixed:VALUE', 'uniform:LOW:HIGH' or 'lognormal:MU:SIGMA'")
+    parser.add_argument('--mean-gap', type=float, default=1.0, help='Mean amount of seconds between events')
+    parser.add_argument('--burst-probability', type=float, default=0.0, help='Probability of starting a burst')
+    parser.add_argument('--burst-size', type=int, default=5, help='Amount of transactions of a burst')
+    parser.add_argument('--inactive-card-rate', type=float, default=0.0, help='Rate of accounts with inactive card')
+    parser.add_argument('--insufficient-limit-rate', type=float, default=0.0,
+                        help='Rate of transactions exceeding any limit')
+    parser.add_argument('--doubled-rate', type=float, default=0.0, help='Rate of repeated transactions')
+    parser.add_argument('--uninitialized-rate', type=float, default=0.0,
+                        help='Rate of transactions of accounts that do not exist')
+    parser.add_argument('--unknown-rate', type=float, default=0.0, help='Rate of unknown events')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator')
+
+
+def generator_from_arguments(args: argparse.Namespace) -> EventGenerator:
+    """Builds an 'EventGenerator' from parsed command line arguments"""
+    return EventGenerator(
+        accounts=args.accounts,
+        merchants=args.merchants,
+        amounts=args.amounts,
+        mean_gap=args.mean_gap,
+        burst_probability=args.burst_probability,
+        burst_size=args.burst_size,
+        inactive_card_rate=args.inactive_card_rate,
+        insufficient_limit_rate=args.insufficient_limit_rate,
+        doubled_rate=args.doubled_rate,
+        uninitialized_rate=args.uninitialized_rate,
+        unknown_rate=args.unknown_rate,
+        seed=args.seed
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    sys.stdout.writelines(generator_from_arguments(args).lines(args.events))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,17 @@
-# Built-in libraries
-import sys
-import json
-
 # Project libraries
+# Each mode imports what only it needs when it runs, so short runs don't pay for the imports of the others.
+# See 'benchmarks/bench_startup.py'.
 from app.service.logging import logger
-from app.auth.authorizer import Authorizer
-from app.parse.io import parse_input_events
-from app.auth.validation.custom_validation import *
+from app.cli.arguments import parse_args, mode_of
+from app.cli.modes import authorize, what_if, serve, prefork, submit, route
+
+MODES = {
+    '--submit': submit,
+    '--prefork': prefork,
+    '--serve': serve,
+    '--route': route,
+    '--what-if': what_if
+}
 
 
 def main() -> None:
@@ -16,30 +21,16 @@ def main() -> None:
     Returns:
         None
     """
-    events = parse_input_events()
-    if events:
-        logger.info('Starting events processing.')
-
-        auth = Authorizer(
-            events=events,
-            validations=[
-                CardNotActiveValidation,
-                InsufficientLimitValidation,
-                HighFreqSmallIntervalValidation,
-                DoubledTransaction
-            ]
-        )
-
-        for processed_event in auth.process():
-            # Write event to stdout
-            sys.stdout.write(
-                f"{json.dumps(processed_event, default=str, sort_keys=True)}\n"
-            )
-
-        logger.info("Done! All events have been processed.")
+    args = parse_args()
+
+    if args.async_logging:
+        logger.start_async()
 
+    mode = mode_of(args)
+    if mode is None:
+        authorize(args)
     else:
-        logger.warning('No events found. Skipping execution.')
+        MODES[mode](args)
 
 
 if __name__ == '__main__':
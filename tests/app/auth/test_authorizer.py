@@ -1,19 +1,15 @@
 # Project libraries
 from app.auth.authorizer import Authorizer
 from app.auth.validation.custom_validation import *
+from tests.helpers import ALL_VALIDATIONS
+from app.parse.io import parse_event
+from app.service.metrics.instrumentation import Instrumentation
 
 # External libraries
 import pytest
 
 
 class TestAuthorizer:
-    ALL_VALIDATIONS = [
-        CardNotActiveValidation,
-        InsufficientLimitValidation,
-        HighFreqSmallIntervalValidation,
-        DoubledTransaction
-    ]
-
     ACCOUNT_EVENTS = [
         {"account": {"active-card": False, "available-limit": 750}, 'event_type': 'account_creation'},
         {"account": {"active-card": True, "available-limit": 1000}, 'event_type': 'account_creation'}
@@ -112,3 +108,105 @@ class TestAuthorizer:
         violations = auth.apply_validations(transaction=event)
 
         assert violations == ['card-not-active']
+
+    def test_process_multiple_accounts(self):
+        events = [
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 100}, 'event_type': 'account_creation'},
+            {"transaction": {"account-id": 2, "merchant": "Uber Eats", "amount": 25, "time": "2020-12-01T11:07:00.000Z"}, 'event_type': 'transaction'},
+            {"account": {"account-id": 2, "active-card": True, "available-limit": 50}, 'event_type': 'account_creation'},
+            {"transaction": {"account-id": 2, "merchant": "Uber Eats", "amount": 25, "time": "2020-12-01T11:07:00.000Z"}, 'event_type': 'transaction'},
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 300}, 'event_type': 'account_creation'},
+            {"transaction": {"account-id": 1, "merchant": "Uber Eats", "amount": 30, "time": "2020-12-01T11:07:00.000Z"}, 'event_type': 'transaction'}
+        ]
+
+        expected_output = [
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 100}, "violations": []},
+            {"account": {"account-id": 2}, "violations": ["account-not-initialized"]},
+            {"account": {"account-id": 2, "active-card": True, "available-limit": 50}, "violations": []},
+            {"account": {"account-id": 2, "active-card": True, "available-limit": 25}, "violations": []},
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 100}, "violations": ["account-already-initialized"]},
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 70}, "violations": []}
+        ]
+
+        auth = self.authorizer(
+            events=events,
+            validations=[
+                CardNotActiveValidation,
+                InsufficientLimitValidation
+            ]
+        )
+
+        assert list(auth.process()) == expected_output
+        assert auth.account is None
+        assert len(auth.accounts) == 2
+
+    def test_export_and_import_accounts(self):
+        lines = [
+            f'{{"account": {{"account-id": {account_id}, "active-card": true, "available-limit": 100}}}}'
+            for account_id in range(3)
+        ] + [
+            f'{{"transaction": {{"account-id": {account_id}, "merchant": "Uber Eats", "amount": 30, "time": "2020-12-01T11:07:00.000Z"}}}}'
+            for account_id in range(3)
+        ]
+        events = [parse_event(value=line, order=order) for order, line in enumerate(lines)]
+        source = self.authorizer(events=events, validations=ALL_VALIDATIONS)
+        list(source.process())
+        expected = {account_id: source.accounts[account_id].to_json() for account_id in (0, 2)}
+
+        target = self.authorizer(events=[], validations=ALL_VALIDATIONS)
+        assert target.import_accounts(data=source.export_accounts(account_ids=[0, 2, 42])) == 2
+        assert set(source.accounts) == {1}
+        assert {k: v.to_json() for k, v in target.accounts.items()} == expected
+
+        # Imported accounts keep their transactions
+        doubled = parse_event(
+            value='{"transaction": {"account-id": 2, "merchant": "Uber Eats", "amount": 30, "time": "2020-12-01T11:08:00.000Z"}}',
+            order=6
+        )
+        assert target.process_event(event=doubled)['violations'] == ['doubled-transaction']
+
+    def test_process_typed_events(self):
+        lines = [
+            '{"account": {"account-id": 1, "active-card": true, "available-limit": 100}}',
+            '{"transaction": {"account-id": 1, "merchant": "Uber Eats", "amount": 25, "time": "2020-12-01T11:07:00.000Z"}}',
+            '{"some_event": {"key": "value"}}'
+        ]
+        events = [parse_event(value=line, order=order) for order, line in enumerate(lines)]
+
+        expected_output = [
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 100}, "violations": []},
+            {"account": {"account-id": 1, "active-card": True, "available-limit": 75}, "violations": []},
+            {"some_event": {"key": "value"}, "event_type": "unknown", "order": 2, "violations": ["unknown-error"]}
+        ]
+
+        auth = self.authorizer(events=events, validations=ALL_VALIDATIONS)
+
+        assert list(auth.process()) == expected_output
+
+    @pytest.mark.parametrize('event, expected_id', [
+        ({"account": {"account-id": 'abc', "active-card": True, "available-limit": 100}}, 'abc'),
+        ({"transaction": {"account-id": 10, "merchant": "Uber Eats", "amount": 25}}, 10),
+        ({"transaction": {"merchant": "Uber Eats", "amount": 25}}, None),
+        ({"some_event": {"account-id": 10}}, None)
+    ])
+    def test_account_id_of(self, event, expected_id):
+        assert Authorizer.account_id_of(event) == expected_id
+
+    def test_process_instrumented(self):
+        events = [
+            {"account": {"active-card": True, "available-limit": 100}, 'event_type': 'account_creation'},
+            {"transaction": {"merchant": "Uber Eats", "amount": 25, "time": datetime(2020, 12, 1, 11, 7)}, 'event_type': 'transaction'},
+            {"transaction": {"merchant": "Uber Eats", "amount": 25, "time": datetime(2020, 12, 1, 11, 8)}, 'event_type': 'transaction'}
+        ]
+
+        instrumentation = Instrumentation()
+        auth = Authorizer(events=events, validations=ALL_VALIDATIONS, instrumentation=instrumentation)
+
+        assert [e['violations'] for e in auth.process()] == [[], [], ['doubled-transaction']]
+
+        snapshot = instrumentation.snapshot()
+        assert {name: s['count'] for name, s in snapshot['stages'].items()} == {
+            'parse': 3, 'dispatch': 3, 'validate': 2, 'register': 1
+        }
+        assert snapshot['validations']['DoubledTransaction']['violations'] == 1
+        assert snapshot['validations']['CardNotActiveValidation']['count'] == 2
@@ -0,0 +1,89 @@
+# Built-in libraries
+import os
+import signal
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.auth.parallel import ShardedAuthorizer, canonical_id, shard_of
+from app.auth.validation.custom_validation import *
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+
+class KillWorkerValidation(CardNotActiveValidation):
+    """Kills the worker process running it, as the OOM killer would"""
+    def check(self, context):
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+class TestShardedAuthorizer:
+    @staticmethod
+    def events():
+        events = [
+            {"account": {"account-id": account_id, "active-card": True, "available-limit": 500}, 'event_type': 'account_creation'}
+            for account_id in range(5)
+        ]
+        events.append({'some_event': {'key': 'value'}, 'event_type': 'unknown'})
+
+        start = datetime(2019, 2, 13, 11)
+        for i in range(200):
+            events.append({
+                "transaction": {
+                    "account-id": i % 7,
+                    "merchant": f"Merchant {i % 3}",
+                    "amount": 10 * (i % 4),
+                    "time": start + timedelta(seconds=10 * i)
+                },
+                'event_type': 'transaction'
+            })
+
+        return [dict(event, order=order) for order, event in enumerate(events)]
+
+    @pytest.mark.parametrize('workers, batch_size', [(1, 1000), (2, 1), (3, 16), (4, 1000)])
+    def test_process_same_output_as_authorizer(self, workers, batch_size):
+        expected_output = list(Authorizer(events=self.events(), validations=ALL_VALIDATIONS).process())
+
+        auth = ShardedAuthorizer(
+            events=self.events(),
+            validations=ALL_VALIDATIONS,
+            workers=workers,
+            batch_size=batch_size
+        )
+
+        assert list(auth.process()) == expected_output
+
+    def test_process_raise_worker_error(self):
+        events = [{"account": {"account-id": 1, "active-card": 'yes', "available-limit": 500}, 'event_type': 'account_creation'}]
+
+        auth = ShardedAuthorizer(events=events, validations=ALL_VALIDATIONS, workers=2)
+
+        with pytest.raises(TypeError):
+            list(auth.process())
+
+    @pytest.mark.parametrize('workers, batch_size', [(-1, 10), (2, 0)])
+    def test_invalid_arguments(self, workers, batch_size):
+        with pytest.raises(ValueError):
+            ShardedAuthorizer(events=[], validations=[], workers=workers, batch_size=batch_size)
+
+    @pytest.mark.parametrize('account_id', [None, 0, 7, 'abc', True])
+    def test_shard_of(self, account_id):
+        shard = shard_of(account_id, 4)
+
+        assert 0 <= shard < 4
+        assert shard == shard_of(account_id, 4)
+
+    @pytest.mark.parametrize('account_id, equal_id', [(1, 1.0), (1, True), (0, False), (-3, -3.0)])
+    def test_shard_of_equal_ids(self, account_id, equal_id):
+        assert canonical_id(account_id) == canonical_id(equal_id)
+        assert type(canonical_id(account_id)) is type(canonical_id(equal_id))
+        assert shard_of(account_id, 7) == shard_of(equal_id, 7)
+        assert shard_of('1', 7) == shard_of('1', 7)
+
+    def test_process_raise_dead_worker(self):
+        auth = ShardedAuthorizer(events=self.events(), validations=[KillWorkerValidation], workers=2)
+
+        with pytest.raises(RuntimeError, match='died'):
+            list(auth.process())
@@ -0,0 +1,84 @@
+# Built-in libraries
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.auth.whatif import WhatIfReplay
+from app.parse.io import EventEncoder, parse_event
+from app.auth.validation.custom_validation import *
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+
+class TestWhatIfReplay:
+    SCENARIOS = {
+        'baseline': ALL_VALIDATIONS,
+        'strict': [
+            CardNotActiveValidation,
+            InsufficientLimitValidation,
+            HighFreqSmallIntervalValidation(threshold=2, window=timedelta(minutes=5)),
+            DoubledTransaction(window=timedelta(minutes=5))
+        ],
+        'no-doubled': ALL_VALIDATIONS[:3]
+    }
+
+    @staticmethod
+    def lines():
+        lines = [
+            '{"account": {"active-card": true, "available-limit": 1000}}',
+            '{"some_event": {"key": "value"}}'
+        ]
+        time = datetime(2019, 2, 13, 11)
+        for i in range(20):
+            time += timedelta(seconds=45)
+            lines.append(
+                f'{{"transaction": {{"merchant": "Merchant {i % 3}", "amount": {10 + i % 2}, '
+                f'"time": "{time.strftime("%Y-%m-%dT%H:%M:%S.000Z")}"}}}}'
+            )
+
+        return lines
+
+    def events(self):
+        return [parse_event(value=line, order=order) for order, line in enumerate(self.lines())]
+
+    def test_same_as_authorizer(self):
+        encode = EventEncoder().encode
+        replay = WhatIfReplay(events=self.events(), scenarios=self.SCENARIOS)
+
+        results = {name: [] for name in self.SCENARIOS}
+        for processed_events in replay.process():
+            for name, processed_event in processed_events.items():
+                results[name].append(encode(processed_event))
+
+        for name, validations in self.SCENARIOS.items():
+            expected = [encode(e) for e in Authorizer(events=self.events(), validations=validations).process()]
+            assert results[name] == expected
+
+    def test_summary(self):
+        replay = WhatIfReplay(events=self.events(), scenarios=self.SCENARIOS)
+        processed = list(replay.process())
+        summary = replay.summary()
+
+        assert list(summary) == ['baseline', 'strict', 'no-doubled']
+        assert all(s['events'] == len(processed) for s in summary.values())
+        assert summary['baseline']['diff'] == {} and summary['baseline']['changed_events'] == 0
+        assert summary['baseline']['violations']['unknown-error'] == 1
+
+        for name, s in summary.items():
+            baseline = summary['baseline']['violations']
+            for violation in set(baseline) | set(s['violations']):
+                assert s['violations'].get(violation, 0) - baseline.get(violation, 0) == s['diff'].get(violation, 0)
+
+            changed = sum(
+                events[name]['violations'] != events['baseline']['violations'] for events in processed
+            )
+            assert s['changed_events'] == changed
+
+        assert summary['strict']['changed_events'] > 0
+        assert 'doubled-transaction' not in summary['no-doubled']['violations']
+
+    def test_no_scenarios(self):
+        with pytest.raises(ValueError):
+            WhatIfReplay(events=[], scenarios={})
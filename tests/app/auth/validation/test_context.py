@@ -0,0 +1,65 @@
+# Built-in libraries
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.bank.account import BankAccount
+from app.bank.records import TransactionRecord
+from app.bank.transactions import BankStatement
+from app.parse.events import Transaction
+from app.auth.validation.context import ValidationContext
+
+# External libraries
+import pytest
+
+
+class TestValidationContext:
+    TRANSACTION = {"transaction": {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 11, 2)}}
+
+    @pytest.fixture
+    def account(self):
+        account = BankAccount(
+            active_card=True,
+            available_limit=100
+        )
+
+        for second in [0, 30, 60, 90]:
+            BankStatement.register(
+                account=account,
+                transaction={"transaction": {"merchant": "Habbib's", "amount": 1, "time": datetime(2019, 2, 13, 11) + timedelta(seconds=second)}}
+            )
+
+        return account
+
+    def test_transaction_fields(self, account):
+        context = ValidationContext(account=account, transaction=self.TRANSACTION)
+
+        assert context.merchant == 'Burger King'
+        assert context.amount == 20
+        assert context.time == datetime(2019, 2, 13, 11, 2)
+
+    def test_recent(self, account):
+        context = ValidationContext(account=account, transaction=self.TRANSACTION, window=timedelta(minutes=1))
+
+        assert len(context.recent) == 2
+        assert context.recent is context.recent
+
+    @pytest.mark.parametrize('window, expected_length', [(30, 1), (60, 2), (120, 4)])
+    def test_recent_since(self, account, window, expected_length):
+        context = ValidationContext(account=account, transaction=self.TRANSACTION, window=timedelta(minutes=1))
+
+        assert len(context.recent_since(timedelta(seconds=window))) == expected_length
+
+    def test_same_defaults_as_typed_transaction(self, account):
+        payload = {"merchant": "Burger King", "time": datetime(2019, 2, 13, 11, 2)}
+        context = ValidationContext(account=account, transaction={"transaction": dict(payload)})
+        typed_context = ValidationContext(account=account, transaction=Transaction(payload=dict(payload), order=0))
+
+        assert context.amount == typed_context.amount == 0
+
+    def test_recent_since_skip_times_that_arent_datetimes(self, account):
+        account.transactions.append(TransactionRecord(time='2019-02-13T11:01:50.000Z', amount=1, merchant=0))
+        context = ValidationContext(account=account, transaction=self.TRANSACTION, window=timedelta(hours=1))
+
+        # Older than the window: served by a scan over all transactions
+        assert len(context.recent) == 4
+        assert len(context.recent_since(timedelta(seconds=60))) == 2
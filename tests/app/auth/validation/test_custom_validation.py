@@ -1,9 +1,16 @@
+import os
+
 import pytest
 
+from app.auth.authorizer import Authorizer
 from app.bank.account import BankAccount
 from app.bank.transactions import BankStatement
+from app.parse.io import parse_input_events
+from app.auth.validation.base_validation import BaseValidation
 from app.auth.validation.custom_validation import *
 
+DATA = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'data')
+
 
 class TestCardNotActiveValidation:
     INPUT = [
@@ -153,6 +160,24 @@ class TestHighFreqSmallIntervalValidation:
 
         assert violation == expected_output
 
+    @pytest.mark.parametrize('threshold, window, expected_output', [
+        (4, None, ''),
+        (2, timedelta(seconds=1), ''),
+        (1, timedelta(seconds=1), 'high-frequency-small-interval')
+    ])
+    def test_parameters(self, account, threshold, window, expected_output):
+        validator = HighFreqSmallIntervalValidation(threshold=threshold, window=window)
+        transaction = {"transaction": {"merchant": "Subway", "amount": 20, "time": datetime(2019, 2, 13, 11, 0, 2)}}
+
+        assert validator.validate(account=account, transaction=transaction) == expected_output
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            HighFreqSmallIntervalValidation(threshold=0)
+
+        with pytest.raises(ValueError):
+            HighFreqSmallIntervalValidation(window=timedelta(0))
+
 
 class TestDoubledTransaction:
     TRANSACTIONS = [
@@ -212,3 +237,47 @@ class TestDoubledTransaction:
         )
 
         assert violation == expected_output
+
+    @pytest.mark.parametrize('window, expected_output', [
+        (timedelta(seconds=1), ''),
+        (timedelta(seconds=2), 'doubled-transaction')
+    ])
+    def test_window(self, account, window, expected_output):
+        validator = DoubledTransaction(window=window)
+        transaction = {"transaction": {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 11, 0, 2)}}
+
+        assert validator.validate(account=account, transaction=transaction) == expected_output
+
+
+class BaselineDoubledTransaction(BaseValidation):
+    """Doubled transaction validation written against dict transactions, as custom validations used to be"""
+    def validate(self, account, transaction):
+        transaction_info = transaction.get('transaction', {})
+        end_time = transaction_info.get('time')
+
+        transactions = BankStatement.query_by_date(
+            account=account,
+            field='time',
+            start_date=end_time - timedelta(minutes=2),
+            end_date=end_time
+        )
+
+        for t in transactions:
+            t_info = t.get('transaction', {})
+            if t_info.get('merchant', '') == transaction_info.get('merchant', '') and \
+                    t_info.get('amount', '') == transaction_info.get('amount', ''):
+                return 'doubled-transaction'
+
+        return ''
+
+
+class TestBaselineCustomValidation:
+    def test_same_as_doubled_transaction(self):
+        def violations(validation):
+            with open(os.path.join(DATA, 'doubled_transaction.jsonl')) as stream:
+                auth = Authorizer(events=parse_input_events(stream=stream), validations=[validation])
+                return [processed_event['violations'] for processed_event in auth.process()]
+
+        assert violations(BaselineDoubledTransaction) == violations(DoubledTransaction) == [
+            [], [], [], ['doubled-transaction'], []
+        ]
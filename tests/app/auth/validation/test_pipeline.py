@@ -0,0 +1,105 @@
+# Built-in libraries
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.bank.account import BankAccount
+from app.bank.transactions import BankStatement
+from app.auth.validation.pipeline import ValidationPipeline
+from app.auth.validation.base_validation import BaseValidation
+from app.auth.validation.custom_validation import *
+
+# External libraries
+import pytest
+
+
+class LegacyValidation(BaseValidation):
+    def validate(self, account: BankAccount, transaction: dict) -> str:
+        if transaction.get('transaction', {}).get('merchant') == 'Blocked':
+            return 'blocked-merchant'
+        return ''
+
+
+class RecentCountValidation(BaseValidation):
+    requires = frozenset({'recent'})
+
+    def __init__(self, window: timedelta):
+        self.window = window
+
+    def check(self, context) -> str:
+        return str(len(context.recent_since(self.window)))
+
+    def validate(self, account: BankAccount, transaction: dict) -> str:
+        return ''
+
+
+class TestValidationPipeline:
+    @pytest.fixture
+    def account(self):
+        account = BankAccount(
+            active_card=True,
+            available_limit=100
+        )
+
+        for second in [0, 30, 60, 90]:
+            BankStatement.register(
+                account=account,
+                transaction={"transaction": {"merchant": "Burger King", "amount": 1, "time": datetime(2019, 2, 13, 11) + timedelta(seconds=second)}}
+            )
+
+        return account
+
+    @staticmethod
+    def transaction(merchant: str = 'Burger King', amount: int = 20) -> dict:
+        return {"transaction": {"merchant": merchant, "amount": amount, "time": datetime(2019, 2, 13, 11, 2)}}
+
+    def test_instantiate_validation_classes(self):
+        pipeline = ValidationPipeline(validations=[CardNotActiveValidation, DoubledTransaction()])
+
+        assert all(isinstance(rule, BaseValidation) for rule in pipeline.rules)
+
+    def test_window_is_the_longest_required(self):
+        pipeline = ValidationPipeline(validations=[
+            RecentCountValidation(window=timedelta(seconds=30)),
+            RecentCountValidation(window=timedelta(seconds=90)),
+            DoubledTransaction
+        ])
+
+        assert pipeline.window == timedelta(seconds=90)
+
+    def test_horizon_is_the_longest_window(self):
+        pipeline = ValidationPipeline(validations=[
+            RecentCountValidation(window=timedelta(seconds=30)),
+            DoubledTransaction,
+            CardNotActiveValidation
+        ])
+
+        assert pipeline.horizon == timedelta(minutes=2)
+        assert ValidationPipeline(validations=[CardNotActiveValidation]).horizon is None
+
+    def test_run_legacy_validation(self, account):
+        pipeline = ValidationPipeline(validations=[LegacyValidation, InsufficientLimitValidation])
+
+        violations = pipeline.run(account=account, transaction=self.transaction(merchant='Blocked', amount=500))
+
+        assert violations == ['blocked-merchant', 'insufficient-limit']
+
+    def test_run_shares_recent_transactions(self, account, monkeypatch):
+        calls = []
+        query_by_date = BankStatement.query_by_date
+
+        def counting_query_by_date(**kwargs):
+            calls.append(kwargs)
+            return query_by_date(**kwargs)
+
+        monkeypatch.setattr(BankStatement, 'query_by_date', counting_query_by_date)
+
+        pipeline = ValidationPipeline(validations=[
+            RecentCountValidation(window=timedelta(seconds=60)),
+            RecentCountValidation(window=timedelta(seconds=120)),
+            HighFreqSmallIntervalValidation
+        ])
+
+        violations = pipeline.run(account=account, transaction=self.transaction())
+
+        assert violations == ['2', '4', 'high-frequency-small-interval']
+        assert len(calls) == 1
@@ -1,6 +1,8 @@
 import pytest
+from datetime import datetime
 
-from app.bank.account import BankAccount
+from app.bank.transactions import BankStatement
+from app.bank.account import BankAccount, FastBankAccount
 
 
 class TestBankAccount:
@@ -58,3 +60,86 @@ class TestBankAccount:
         account_dict = account.to_dict()
 
         assert account_dict == expected_value
+
+    def test_account_to_dict_with_account_id(self):
+        account = BankAccount(
+            active_card=True,
+            available_limit=1000,
+            account_id=42
+        )
+
+        assert account.to_dict() == {
+            "account": {
+                "account-id": 42,
+                "active-card": True,
+                "available-limit": 1000
+            }
+        }
+
+    def test_account_to_json(self, account):
+        assert account.to_json() == '{"active-card": true, "available-limit": 1000}'
+
+    def test_account_info_cached_until_account_changes(self, account):
+        info = account.to_dict().get('account')
+
+        assert account.to_dict().get('account') is info
+
+        account.available_limit = 10
+
+        assert account.to_dict().get('account') is not info
+        assert account.to_json() == '{"active-card": true, "available-limit": 10}'
+
+        account.active_card = False
+
+        assert account.to_json() == '{"active-card": false, "available-limit": 10}'
+
+
+class TestFastBankAccount:
+    @pytest.fixture
+    def account(self):
+        return FastBankAccount(
+            active_card=True,
+            available_limit=1000
+        )
+
+    @pytest.mark.parametrize('active_card, available_limit', [('true', 1000), (True, '1000'), (None, None)])
+    def test_constructor_raise_type_error(self, active_card, available_limit):
+        with pytest.raises(TypeError):
+            FastBankAccount(active_card=active_card, available_limit=available_limit)
+
+    def test_slotted(self, account):
+        assert not hasattr(account, '__dict__')
+
+        with pytest.raises(AttributeError):
+            account.unknown = 1
+
+    def test_same_encoding_as_bank_account(self, account):
+        expected_account = BankAccount(active_card=True, available_limit=1000, account_id=42)
+        account.account_id = 42
+
+        assert account.to_dict() == expected_account.to_dict()
+        assert account.to_json() == expected_account.to_json()
+
+    def test_register_transaction(self, account):
+        record = BankStatement.register(
+            account=account,
+            transaction={"transaction": {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 10)}}
+        )
+
+        assert account.available_limit == 980
+        assert account.transactions == [record]
+        assert len(account.window) == 1
+
+    def test_account_info_cached_until_account_changes(self, account):
+        info = account.to_dict().get('account')
+
+        assert account.to_dict().get('account') is info
+
+        account.available_limit -= 990
+
+        assert account.to_dict().get('account') is not info
+        assert account.to_json() == '{"active-card": true, "available-limit": 10}'
+
+        account.active_card = False
+
+        assert account.to_json() == '{"active-card": false, "available-limit": 10}'
@@ -0,0 +1,90 @@
+# Built-in libraries
+from datetime import datetime, timedelta, timezone
+
+# Project libraries
+from app.bank.records import MerchantTable, TransactionRecord, from_epoch_micros, to_epoch_micros
+
+# External libraries
+import pytest
+
+
+class TestEpochMicros:
+    @pytest.mark.parametrize('value, expected', [
+        (datetime(1970, 1, 1), 0),
+        (datetime(1970, 1, 1, 0, 0, 1, 500), 1000500),
+        (datetime(2019, 2, 13, 11, 0, 0, 123000), 1550055600123000)
+    ])
+    def test_to_epoch_micros(self, value, expected):
+        assert to_epoch_micros(value) == expected
+        assert from_epoch_micros(expected) == value
+
+    def test_to_epoch_micros_aware_datetime(self):
+        value = datetime(2019, 2, 13, 8, tzinfo=timezone(-timedelta(hours=3)))
+
+        assert to_epoch_micros(value) == to_epoch_micros(datetime(2019, 2, 13, 11))
+
+
+class TestMerchantTable:
+    @pytest.fixture
+    def table(self):
+        return MerchantTable()
+
+    def test_encode_same_id_for_same_name(self, table):
+        assert table.encode('Burger King') == table.encode('Burger King') == 0
+        assert table.encode("Habbib's") == 1
+        assert len(table) == 2
+
+    def test_decode(self, table):
+        merchant_id = table.encode('Burger King')
+
+        assert table.decode(merchant_id) == 'Burger King'
+
+    def test_lookup_doesnt_assign_ids(self, table):
+        assert table.lookup('Burger King') is None
+        assert len(table) == 0
+
+    def test_intern_same_object_for_equal_names(self, table):
+        name = table.intern(''.join(['Burger', ' King']))
+
+        assert table.intern(''.join(['Burger', ' King'])) is name
+        assert table.lookup('Burger King') == 0
+
+
+class TestTransactionRecord:
+    TRANSACTION = {"transaction": {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 11)}, 'event_type': 'transaction', 'order': 3}
+
+    def test_from_transaction(self):
+        record = TransactionRecord.from_transaction(self.TRANSACTION)
+
+        assert record.time == to_epoch_micros(datetime(2019, 2, 13, 11))
+        assert record.amount == 20
+        assert isinstance(record.merchant, int)
+
+    def test_from_transaction_keep_records(self):
+        record = TransactionRecord.from_transaction(self.TRANSACTION)
+
+        assert TransactionRecord.from_transaction(record) is record
+
+    def test_to_dict(self):
+        record = TransactionRecord.from_transaction(self.TRANSACTION)
+
+        assert record.to_dict() == {"transaction": {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 11)}}
+
+    def test_transaction_view(self):
+        record = TransactionRecord.from_transaction(self.TRANSACTION)
+        view = {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 11)}
+
+        assert record.get('transaction', {}) == record['transaction'] == view
+        assert record['merchant'] == 'Burger King'
+        with pytest.raises(KeyError):
+            record['order']
+
+    def test_keep_time_that_isnt_datetime(self):
+        record = TransactionRecord.from_transaction({"transaction": {"merchant": "Uber Eats", "amount": 25, "time": "2020-12-01T11:07:00.000Z"}})
+
+        assert record.get('time') == "2020-12-01T11:07:00.000Z"
+
+    def test_no_instance_dict(self):
+        record = TransactionRecord.from_transaction(self.TRANSACTION)
+
+        assert not hasattr(record, '__dict__')
@@ -0,0 +1,124 @@
+# Built-in libraries
+import random
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.bank.account import FastBankAccount
+from app.bank.transactions import BankStatement
+from app.bank.retention import AUTO, RetentionPolicy
+from app.storage.cold_storage import ColdStorage
+from tests.helpers import ALL_VALIDATIONS, transaction
+
+# External libraries
+import pytest
+
+
+class TestRetentionPolicy:
+    @pytest.fixture
+    def account(self):
+        return FastBankAccount(active_card=True, available_limit=10 ** 6)
+
+    @pytest.mark.parametrize('horizon, max_entries, lateness, slack', [
+        (timedelta(seconds=-1), None, timedelta(0), 0),
+        ('all', None, timedelta(0), 0),
+        (None, 0, timedelta(0), 0),
+        (AUTO, None, timedelta(seconds=-1), 0),
+        (AUTO, None, timedelta(0), -0.5)
+    ])
+    def test_invalid_arguments(self, horizon, max_entries, lateness, slack):
+        with pytest.raises(ValueError):
+            RetentionPolicy(horizon=horizon, max_entries=max_entries, lateness=lateness, slack=slack)
+
+    def test_evict_by_horizon(self, account):
+        retention = RetentionPolicy(horizon=timedelta(seconds=60), slack=0)
+
+        for second in range(0, 300, 30):
+            BankStatement.register(account=account, transaction=transaction(second), retention=retention)
+
+        assert [t.get('time') for t in account.transactions] == [
+            datetime(2019, 2, 13, 11, 3, 30),
+            datetime(2019, 2, 13, 11, 4),
+            datetime(2019, 2, 13, 11, 4, 30)
+        ]
+        assert retention.evicted == 7
+
+    def test_lateness_widens_horizon(self, account):
+        retention = RetentionPolicy(horizon=timedelta(seconds=60), lateness=timedelta(seconds=60), slack=0)
+
+        for second in range(0, 300, 30):
+            BankStatement.register(account=account, transaction=transaction(second), retention=retention)
+
+        assert len(account.transactions) == 5
+
+    def test_evict_by_max_entries(self, account):
+        retention = RetentionPolicy(horizon=None, max_entries=3, slack=0)
+
+        for second in range(10):
+            BankStatement.register(account=account, transaction=transaction(second, amount=second), retention=retention)
+
+        assert [t.amount for t in account.transactions] == [7, 8, 9]
+
+    def test_evict_in_batches(self, account):
+        retention = RetentionPolicy(horizon=None, max_entries=4, slack=0.5)
+        evictions = []
+
+        for second in range(40):
+            BankStatement.register(account=account, transaction=transaction(second, amount=second))
+            evictions.append(retention.apply(account))
+            assert 4 <= len(account.transactions) <= 6 or second < 4
+
+        # Out of policy transactions are evicted two at a time, the newest ones kept
+        assert set(evictions) == {0, 2}
+        assert [t.amount for t in account.transactions] == list(range(40 - len(account.transactions), 40))
+        assert retention.evicted == 40 - len(account.transactions)
+
+    def test_auto_horizon_follows_window(self, account):
+        retention = RetentionPolicy(horizon=AUTO, slack=0)
+        account.window.horizon = timedelta(minutes=2)
+
+        for second in range(0, 600, 60):
+            BankStatement.register(account=account, transaction=transaction(second), retention=retention)
+
+        assert len(account.transactions) == 3
+        assert account.transactions == account.window.records()
+
+    def test_evicted_transactions_to_sink(self, account, tmp_path):
+        path = str(tmp_path / 'cold.jsonl')
+        account.account_id = 'abc'
+
+        with ColdStorage(path=path) as sink:
+            retention = RetentionPolicy(horizon=None, max_entries=1, sink=sink)
+            for second in range(3):
+                BankStatement.register(account=account, transaction=transaction(second), retention=retention)
+
+        assert list(ColdStorage.read(path)) == [
+            {"transaction": {"merchant": "Burger King", "amount": 10, "time": "2019-02-13T11:00:00.000Z",
+                             "account-id": "abc"}},
+            {"transaction": {"merchant": "Burger King", "amount": 10, "time": "2019-02-13T11:00:01.000Z",
+                             "account-id": "abc"}}
+        ]
+
+    def test_authorizer_auto_retention_same_output(self):
+        rand = random.Random(7)
+        events = [
+            {"account": {"account-id": i, "active-card": True, "available-limit": 10 ** 4}, 'event_type': 'account_creation'}
+            for i in range(3)
+        ]
+        second = 0
+        for _ in range(500):
+            second += rand.choice([1, 5, 30, 90])
+            events.append(transaction(
+                second,
+                merchant=rand.choice(['Burger King', 'Habbibs']),
+                amount=rand.choice([10, 20]),
+                account_id=rand.randrange(3)
+            ))
+
+        expected_output = list(Authorizer(events=events, validations=ALL_VALIDATIONS).process())
+
+        auth = Authorizer(events=events, validations=ALL_VALIDATIONS, retention=RetentionPolicy(horizon=AUTO))
+
+        assert list(auth.process()) == expected_output
+        assert auth.retention.evicted > 0
+        assert all(len(account.transactions) < 50 for account in auth.accounts.values())
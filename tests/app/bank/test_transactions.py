@@ -61,3 +61,47 @@ class TestTransactions:
         )
 
         assert len(list(query_result)) == 1
+
+    def test_query_by_date_same_result_from_window_and_history(self, bank_account, bank_statement):
+        for minute in range(10):
+            bank_statement.register(
+                account=bank_account,
+                transaction={"transaction": {"merchant": "Uber Eats", "amount": 1, "time": datetime(2021, 10, 10, 0, minute)},
+                             'event_type': 'transaction'}
+            )
+
+        recent = bank_statement.query_by_date(
+            account=bank_account,
+            field='time',
+            start_date=datetime(2021, 10, 10, 0, 8),
+            end_date=datetime(2021, 10, 10, 0, 10)
+        )
+        old = bank_statement.query_by_date(
+            account=bank_account,
+            field='time',
+            start_date=datetime(2021, 10, 10, 0, 0),
+            end_date=datetime(2021, 10, 10, 0, 10)
+        )
+
+        assert len(list(recent)) == 2
+        assert len(list(old)) == 10
+
+    @pytest.mark.parametrize('merchant, amount, expected', [('Uber Eats', 1, True), ('Uber Eats', 2, False), ('Ifood', 1, False)])
+    def test_has_similar_transaction(self, bank_account, bank_statement, merchant, amount, expected):
+        for minute in range(10):
+            bank_statement.register(
+                account=bank_account,
+                transaction={"transaction": {"merchant": "Uber Eats", "amount": 1, "time": datetime(2021, 10, 10, 0, minute)},
+                             'event_type': 'transaction'}
+            )
+
+        for start_minute in [0, 8]:
+            found = bank_statement.has_similar_transaction(
+                account=bank_account,
+                merchant=merchant,
+                amount=amount,
+                start_date=datetime(2021, 10, 10, 0, start_minute),
+                end_date=datetime(2021, 10, 10, 0, 10)
+            )
+
+            assert found == expected
@@ -0,0 +1,123 @@
+# Built-in libraries
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.bank.window import TransactionWindow
+from app.bank.records import MERCHANTS, TransactionRecord, to_epoch_micros
+
+# External libraries
+import pytest
+
+
+def transaction(minute: int, second: int = 0, merchant: str = 'Burger King') -> TransactionRecord:
+    return TransactionRecord.from_transaction(
+        {"transaction": {"merchant": merchant, "amount": 10, "time": datetime(2019, 2, 13, 11, minute, second)}}
+    )
+
+
+class TestTransactionWindow:
+    @pytest.fixture
+    def window(self):
+        return TransactionWindow(horizon=timedelta(minutes=2))
+
+    def test_query_interval(self, window):
+        transactions = [transaction(0), transaction(1), transaction(2)]
+        for t in transactions:
+            window.add(t)
+
+        result = window.query(
+            start_date=datetime(2019, 2, 13, 11, 0, 30),
+            end_date=datetime(2019, 2, 13, 11, 2)
+        )
+
+        assert result == [transactions[1]]
+
+    def test_evict_older_than_horizon(self, window):
+        for minute in range(10):
+            window.add(transaction(minute))
+
+        assert len(window) == 3
+        assert window.covered_from == to_epoch_micros(datetime(2019, 2, 13, 11, 7))
+
+    def test_query_evicted_interval_returns_none(self, window):
+        for minute in range(10):
+            window.add(transaction(minute))
+
+        result = window.query(
+            start_date=datetime(2019, 2, 13, 11, 0),
+            end_date=datetime(2019, 2, 13, 11, 9)
+        )
+
+        assert result is None
+
+    def test_query_widens_horizon(self, window):
+        window.query(
+            start_date=datetime(2019, 2, 13, 11, 0),
+            end_date=datetime(2019, 2, 13, 11, 10)
+        )
+
+        assert window.horizon == timedelta(minutes=10)
+
+    def test_out_of_order_keeps_registration_order(self, window):
+        transactions = [transaction(1, 30, 'A'), transaction(1, 0, 'B'), transaction(1, 10, 'C')]
+        for t in transactions:
+            window.add(t)
+
+        result = window.query(
+            start_date=datetime(2019, 2, 13, 11, 0),
+            end_date=datetime(2019, 2, 13, 11, 2)
+        )
+
+        assert result == transactions
+
+    def test_ignore_transactions_without_datetime(self, window):
+        window.add(TransactionRecord.from_transaction(
+            {"transaction": {"merchant": "Uber Eats", "amount": 25, "time": "2020-12-01T11:07:00.000Z"}}
+        ))
+
+        assert len(window) == 0
+
+    def test_from_transactions(self):
+        transactions = [transaction(0), transaction(1)]
+
+        window = TransactionWindow.from_transactions(transactions)
+
+        assert len(window) == 1
+
+    def test_has_pair(self, window):
+        window.add(transaction(0, merchant='A'))
+        window.add(transaction(1, merchant='B'))
+
+        start_date = datetime(2019, 2, 13, 11, 0)
+        end_date = datetime(2019, 2, 13, 11, 2)
+
+        assert window.has_pair(merchant='A', amount=10, start_date=start_date, end_date=end_date)
+        assert not window.has_pair(merchant='A', amount=20, start_date=start_date, end_date=end_date)
+        assert not window.has_pair(merchant='C', amount=10, start_date=start_date, end_date=end_date)
+
+    def test_has_pair_outside_interval(self, window):
+        window.add(transaction(1, 30, merchant='A'))
+        window.add(transaction(0, 30, merchant='A'))
+
+        found = window.has_pair(
+            merchant='A',
+            amount=10,
+            start_date=datetime(2019, 2, 13, 11, 0, 40),
+            end_date=datetime(2019, 2, 13, 11, 1, 30)
+        )
+
+        assert not found
+
+    def test_has_pair_evicted(self, window):
+        for minute in range(10):
+            window.add(transaction(minute, merchant=str(minute)))
+
+        found = window.has_pair(
+            merchant='0',
+            amount=10,
+            start_date=datetime(2019, 2, 13, 11, 0),
+            end_date=datetime(2019, 2, 13, 11, 2)
+        )
+
+        assert found is None
+        assert (MERCHANTS.lookup('0'), 10) not in window._pairs
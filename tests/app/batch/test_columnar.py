@@ -0,0 +1,128 @@
+# Built-in libraries
+import random
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.io import EventEncoder
+from app.auth.validation.custom_validation import *
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from app.batch.columnar import ColumnarAuthorizer
+
+
+class TestColumnarAuthorizer:
+    @staticmethod
+    def events(seed: int, count: int = 400, accounts: int = 4, disorder: int = 0):
+        rand = random.Random(seed)
+        time = datetime(2019, 2, 13, 11)
+        events = []
+
+        for order in range(count):
+            account_id = rand.randrange(accounts) if accounts > 1 else None
+            draw = rand.random()
+            time += timedelta(seconds=rand.randint(0, 40))
+
+            if draw < 0.05:
+                payload = {"active-card": rand.random() < 0.9, "available-limit": rand.randint(100, 1500)}
+                event_type = 'account'
+            elif draw < 0.07:
+                events.append({"other": {"x": order}, 'event_type': 'unknown', 'order': order})
+                continue
+            else:
+                payload = {
+                    "merchant": f"Merchant {rand.randrange(3)}",
+                    "amount": rand.choice([5, 10, 20, 40]),
+                    "time": time - timedelta(seconds=rand.randint(0, disorder))
+                }
+                event_type = 'transaction'
+
+            if account_id is not None:
+                payload['account-id'] = account_id
+
+            events.append({
+                event_type: payload,
+                'event_type': 'account_creation' if event_type == 'account' else 'transaction',
+                'order': order
+            })
+
+        return events
+
+    def assert_same_as_authorizer(self, events_factory, validations=None, **kwargs):
+        validations = validations or ALL_VALIDATIONS
+        encode = EventEncoder().encode
+
+        expected = [encode(e) for e in Authorizer(events=events_factory(), validations=validations).process()]
+        result = [encode(e) for e in ColumnarAuthorizer(events=events_factory(), validations=validations, **kwargs).process()]
+
+        assert result == expected
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_same_as_authorizer(self, seed):
+        self.assert_same_as_authorizer(lambda: self.events(seed))
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_same_as_authorizer_single_account(self, seed):
+        self.assert_same_as_authorizer(lambda: self.events(seed, accounts=1))
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 50])
+    def test_chunks(self, chunk_size):
+        self.assert_same_as_authorizer(lambda: self.events(1), chunk_size=chunk_size)
+
+    def test_out_of_order_transactions(self):
+        self.assert_same_as_authorizer(lambda: self.events(2, disorder=300))
+        self.assert_same_as_authorizer(lambda: self.events(2, disorder=300), chunk_size=10, lateness=timedelta(minutes=5))
+
+    def test_transaction_older_than_carried_ones(self):
+        events = self.events(3, accounts=1)
+        events.append({
+            "transaction": {"merchant": "Late", "amount": 5, "time": datetime(2019, 2, 13, 10)},
+            'event_type': 'transaction'
+        })
+
+        with pytest.raises(ValueError):
+            list(ColumnarAuthorizer(events=events, validations=ALL_VALIDATIONS, chunk_size=50).process())
+
+    @pytest.mark.parametrize('validations', [
+        [DoubledTransaction, CardNotActiveValidation],
+        [HighFreqSmallIntervalValidation],
+        [InsufficientLimitValidation]
+    ])
+    def test_validation_subsets(self, validations):
+        self.assert_same_as_authorizer(lambda: self.events(4), validations=validations)
+
+    @pytest.mark.parametrize('validations', [
+        [HighFreqSmallIntervalValidation(threshold=2), DoubledTransaction(window=timedelta(seconds=30))],
+        [HighFreqSmallIntervalValidation(threshold=5, window=timedelta(minutes=10)), InsufficientLimitValidation],
+        [HighFreqSmallIntervalValidation(threshold=1, window=timedelta(seconds=20)), HighFreqSmallIntervalValidation()]
+    ])
+    def test_validation_parameters(self, validations):
+        self.assert_same_as_authorizer(lambda: self.events(5), validations=validations)
+        self.assert_same_as_authorizer(lambda: self.events(5), validations=validations, chunk_size=13)
+
+    def test_unsupported_validation(self):
+        class CustomValidation(CardNotActiveValidation):
+            pass
+
+        with pytest.raises(ValueError):
+            ColumnarAuthorizer(events=[], validations=[CustomValidation])
+
+    def test_boolean_limit(self):
+        # Booleans are integers, encoded the same as on 'Authorizer'
+        self.assert_same_as_authorizer(lambda: [
+            {"account": {"account-id": 1, "active-card": True, "available-limit": True}, 'event_type': 'account_creation'}
+        ])
+
+    def test_unsupported_amount(self):
+        events = [
+            {"account": {"active-card": True, "available-limit": 100}, 'event_type': 'account_creation'},
+            {"transaction": {"merchant": "Uber", "amount": 1.5, "time": datetime(2019, 2, 13, 11)}, 'event_type': 'transaction'}
+        ]
+
+        with pytest.raises(ValueError):
+            list(ColumnarAuthorizer(events=events, validations=ALL_VALIDATIONS).process())
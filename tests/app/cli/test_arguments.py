@@ -0,0 +1,59 @@
+# Built-in libraries
+from datetime import timedelta
+
+# Project libraries
+from app.bank.retention import AUTO
+from app.cli.arguments import mode_of, parse_args
+
+# External libraries
+import pytest
+
+
+class TestArguments:
+    @pytest.mark.parametrize('args, mode', [
+        ([], None),
+        (['--workers', '4', '--batch-size', '10'], None),
+        (['--snapshot', 'state.snap', '--wal', 'state.wal', '--retention-horizon', 'auto'], None),
+        (['--serve', '--snapshot', 'state.snap', '--retention-max-entries', '10'], '--serve'),
+        (['--serve', '--handoff-token-file', 'handoff.token'], '--serve'),
+        (['--prefork', '2', '--unix-socket', 'auth.sock'], '--prefork'),
+        (['--submit', 'input.jsonl', '--unix-socket', 'auth.sock'], '--submit'),
+        (['--route', 'local', 'unix:auth.sock', '--batch-size', '10'], '--route'),
+        (['--what-if', 'scenarios.json', '--what-if-output', 'scenarios'], '--what-if')
+    ])
+    def test_mode(self, args, mode):
+        assert mode_of(parse_args(args)) == mode
+
+    def test_retention_horizon(self):
+        assert parse_args(['--retention-horizon', '90']).retention_horizon == timedelta(seconds=90)
+        assert parse_args(['--retention-horizon', AUTO]).retention_horizon == AUTO
+
+        with pytest.raises(SystemExit):
+            parse_args(['--retention-horizon', 'forever'])
+
+    @pytest.mark.parametrize('args', [
+        ['--serve', '--route', 'local'],
+        ['--what-if', 'scenarios.json', '--prefork', '2', '--unix-socket', 'auth.sock'],
+        ['--prefork', '2'],
+        ['--submit', 'input.jsonl'],
+        ['--what-if-output', 'scenarios'],
+        ['--workers', '2', '--columnar'],
+        ['--workers', '2', '--route', 'local'],
+        ['--columnar', '--what-if', 'scenarios.json'],
+        ['--what-if', 'scenarios.json', '--retention-horizon', '0'],
+        ['--what-if', 'scenarios.json', '--metrics'],
+        ['--workers', '2', '--snapshot', 'state.snap'],
+        ['--columnar', '--wal', 'state.wal'],
+        ['--route', 'local', '--cold-storage', 'history.jsonl'],
+        ['--prefork', '2', '--unix-socket', 'auth.sock', '--snapshot', 'state.snap'],
+        ['--serve', '--metrics-file', 'metrics.jsonl'],
+        ['--workers', '2', '--metrics'],
+        ['--route', 'local', '--handoff-token-file', 'handoff.token']
+    ])
+    def test_incompatible_arguments(self, args, capsys):
+        with pytest.raises(SystemExit) as error:
+            parse_args(args)
+
+        error_message = capsys.readouterr().err
+        assert error.value.code == 2
+        assert "can't be used with" in error_message or 'requires' in error_message
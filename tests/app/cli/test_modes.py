@@ -0,0 +1,51 @@
+# Built-in libraries
+from datetime import timedelta
+
+# Project libraries
+from app.cli.modes import build_backends, build_scenarios
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+
+class TestModes:
+    def test_build_scenarios(self):
+        scenarios = build_scenarios({
+            'baseline': {},
+            'strict': {'HighFreqSmallIntervalValidation': {'threshold': 2, 'window': 60}, 'DoubledTransaction': None}
+        })
+
+        assert scenarios['baseline'] == ALL_VALIDATIONS
+        assert scenarios['strict'][:2] == ALL_VALIDATIONS[:2]
+        assert len(scenarios['strict']) == 3
+        assert scenarios['strict'][2].threshold == 2
+        assert scenarios['strict'][2].window == timedelta(seconds=60)
+
+    @pytest.mark.parametrize('spec, message', [
+        ({'': {}}, 'file name'),
+        ({'a/b': {}}, 'file name'),
+        ([{}], 'object of scenarios'),
+        ({'strict': None}, "'strict'"),
+        ({'strict': ['DoubledTransaction']}, "'strict'"),
+        ({'strict': {'UnknownValidation': {}}}, 'UnknownValidation'),
+        ({'strict': {'DoubledTransaction': 60}}, 'DoubledTransaction'),
+        ({'strict': {'DoubledTransaction': {'threshold': 2}}}, 'threshold'),
+        ({'strict': {'CardNotActiveValidation': {'window': 60}}}, 'window'),
+        ({'strict': {'HighFreqSmallIntervalValidation': {'threshold': 'two'}}}, 'threshold'),
+        ({'strict': {'HighFreqSmallIntervalValidation': {'threshold': True}}}, 'threshold'),
+        ({'strict': {'DoubledTransaction': {'window': None}}}, 'window'),
+        ({'strict': {'DoubledTransaction': {'window': -60}}}, 'DoubledTransaction')
+    ])
+    def test_build_invalid_scenarios(self, spec, message):
+        with pytest.raises(ValueError, match=message):
+            build_scenarios(spec)
+
+    @pytest.mark.parametrize('specs', [['localhost'], ['localhost:port']])
+    def test_build_invalid_backends(self, specs):
+        with pytest.raises(ValueError):
+            build_backends(specs)
+
+    def test_build_unreachable_backends(self, tmp_path):
+        with pytest.raises(OSError):
+            build_backends([f"unix:{tmp_path / 'missing.sock'}"])
@@ -0,0 +1,68 @@
+# Built-in libraries
+import pickle
+from datetime import datetime
+
+# Project libraries
+from app.parse.events import AccountCreation, Event, Transaction, UnknownEvent, as_event
+from app.parse.io import parse_event
+
+
+class TestEvents:
+    def test_account_creation_fields(self):
+        event = AccountCreation(payload={'active-card': True, 'available-limit': 100, 'account-id': 1}, order=3)
+
+        assert (event.account_id, event.active_card, event.available_limit, event.order) == (1, True, 100, 3)
+        assert event.event_type == 'account_creation'
+
+    def test_transaction_fields(self):
+        time = datetime(2019, 2, 13, 10)
+        event = Transaction(payload={'merchant': 'Burger King', 'amount': 20, 'time': time}, order=0)
+
+        assert (event.account_id, event.merchant, event.amount, event.time) == (None, 'Burger King', 20, time)
+        assert event.event_type == 'transaction'
+
+    def test_events_are_mappings(self):
+        payload = {'merchant': 'Burger King', 'amount': 20, 'time': datetime(2019, 2, 13, 10)}
+        event = Transaction(payload=payload, order=1)
+
+        assert event == {'transaction': payload, 'event_type': 'transaction', 'order': 1}
+        assert event.get('transaction') is payload
+        assert event['order'] == 1
+        assert event.get('account') is None
+
+    def test_events_are_slotted(self):
+        event = AccountCreation(payload={}, order=0)
+
+        assert not hasattr(event, '__dict__')
+
+    def test_unknown_event_keeps_data(self):
+        data = {'some_other_key': {'event': 'info'}, 'event_type': 'unknown', 'order': 0}
+        event = UnknownEvent(data=data)
+        event.order += 5
+
+        assert event.to_dict() is data
+        assert data['order'] == 5
+        assert event.account_id is None
+
+    def test_events_are_picklable(self):
+        for value in [
+            '{"account": {"active-card": true, "available-limit": 100}}',
+            '{"transaction": {"merchant": "Habbibs", "amount": 90, "time": "2019-02-13T11:00:00.000Z"}}',
+            '{"random_key": {"another": "event"}}'
+        ]:
+            event = parse_event(value=value, order=2)
+            loaded = pickle.loads(pickle.dumps(event))
+
+            assert type(loaded) is type(event)
+            assert loaded == event
+
+    def test_as_event(self):
+        account = as_event({'account': {'active-card': True, 'available-limit': 100}, 'event_type': 'account_creation'})
+        transaction = as_event({'transaction': {'amount': 10}, 'event_type': 'transaction', 'order': 4})
+        unknown = as_event({'random_key': {}})
+
+        assert isinstance(account, AccountCreation) and account.available_limit == 100 and account.order is None
+        assert isinstance(transaction, Transaction) and transaction.amount == 10 and transaction.order == 4
+        assert isinstance(unknown, UnknownEvent) and unknown.event_type == 'unknown'
+        assert as_event(transaction) is transaction
+        assert all(isinstance(event, Event) for event in [account, transaction, unknown])
@@ -1,8 +1,16 @@
 # Built-in libraries
+import os
+import json
+import time
+import threading
 from io import StringIO
 
 # Project libraries
-from app.parse.io import parse_input_events
+from app.bank.account import BankAccount
+from app.auth.authorizer import Authorizer
+from app.bank.records import MERCHANTS
+from app.parse.io import OutputWriter, parse_input_events, read_lines
+from app.auth.validation.custom_validation import CardNotActiveValidation, InsufficientLimitValidation
 
 # External libraries
 import pytest
@@ -41,6 +49,14 @@ class TestParseInputEvents:
         for parsed_event in parse_input_events():
             assert parsed_event.get('event_type') == 'transaction'
 
+    def test_parse_transaction_events_share_merchant(self):
+        events = list(parse_input_events(stream=StringIO('\n'.join(self.TRANSACTION_EVENTS[:1] * 2))))
+        first, second = (event['transaction']['merchant'] for event in events)
+
+        assert first == 'Burger King'
+        assert first is second
+        assert MERCHANTS.lookup('Burger King') is not None
+
     @pytest.mark.parametrize('event', UNKNOWN_EVENTS)
     def test_parse_unknown_events(self, monkeypatch, event):
         monkeypatch.setattr('sys.stdin', StringIO(event))
@@ -54,3 +70,191 @@ class TestParseInputEvents:
 
         for parsed_event in parse_input_events():
             assert parsed_event.get('event_type', '') == ''
+
+
+class TestReadLines:
+    LINES = [
+        '{"account": {"active-card": true, "available-limit": 100}}',
+        '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:00:00.000Z"}}',
+        '{"transaction": {"merchant": "Habbibs", "amount": 90, "time": "2019-02-13T11:00:00.000Z"}}'
+    ]
+
+    @pytest.mark.parametrize('buffer_size', [1, 7, 64, 4096])
+    def test_read_lines_any_buffer_size(self, buffer_size):
+        stream = StringIO('\n'.join(self.LINES) + '\n')
+
+        assert list(read_lines(stream=stream, buffer_size=buffer_size)) == self.LINES
+
+    def test_read_lines_without_trailing_line_break(self):
+        stream = StringIO('\n'.join(self.LINES))
+
+        assert list(read_lines(stream=stream, buffer_size=16)) == self.LINES
+
+    def test_read_lines_skip_empty_lines(self):
+        stream = StringIO('\n\n'.join(self.LINES) + '\n\n')
+
+        assert list(read_lines(stream=stream, buffer_size=16)) == self.LINES
+
+    def test_read_lines_from_file_with_crlf(self, tmp_path):
+        path = tmp_path / 'events.jsonl'
+        path.write_bytes(('\r\n'.join(self.LINES) + '\r\n').encode())
+
+        with open(path) as stream:
+            assert list(read_lines(stream=stream, buffer_size=7)) == self.LINES
+
+    def test_read_lines_is_lazy(self):
+        stream = StringIO('\n'.join(self.LINES * 100))
+
+        next(read_lines(stream=stream, buffer_size=128))
+
+        assert stream.tell() == len(self.LINES[0]) + 1
+
+    def test_read_lines_from_slow_producer(self):
+        read_end, write_end = os.pipe()
+
+        def produce():
+            with open(write_end, 'w') as stream:
+                for line in self.LINES:
+                    stream.write(f"{line}\n")
+                    stream.flush()
+                    # The next line only comes once the previous one was read
+                    assert consumed.wait(timeout=5)
+                    consumed.clear()
+
+        consumed = threading.Event()
+        producer = threading.Thread(target=produce)
+        producer.start()
+
+        lines = []
+        with open(read_end) as stream:
+            for line in read_lines(stream=stream, buffer_size=4096):
+                lines.append(line)
+                consumed.set()
+        producer.join()
+
+        assert lines == self.LINES
+
+    @pytest.mark.parametrize('buffer_size', [0, -1])
+    def test_read_lines_invalid_buffer_size(self, buffer_size):
+        with pytest.raises(ValueError):
+            list(read_lines(stream=StringIO(''), buffer_size=buffer_size))
+
+    def test_parse_input_events_from_stream(self):
+        stream = StringIO('\n'.join(self.LINES))
+
+        events = list(parse_input_events(stream=stream, buffer_size=8))
+
+        assert [e.get('order') for e in events] == [0, 1, 2]
+        assert [e.get('event_type') for e in events] == ['account_creation', 'transaction', 'transaction']
+
+
+class TestOutputWriter:
+    @staticmethod
+    def events():
+        account = BankAccount(active_card=True, available_limit=100, account_id='abc')
+        events = []
+        for violations in [[], ['insufficient-limit'], ['high-frequency-small-interval', 'doubled-transaction']]:
+            event = account.to_dict()
+            event.update({'violations': violations})
+            events.append(event)
+            account.available_limit -= 10
+
+        events.append({"account": {}, 'violations': ['account-not-initialized']})
+        events.append({'some_event': {'key': 'value'}, 'event_type': 'unknown', 'order': 4, 'violations': ['unknown-error']})
+
+        return events
+
+    def test_encode_same_as_json_dumps(self):
+        writer = OutputWriter(stream=StringIO())
+
+        for event in self.events():
+            assert writer.encode(event) == f"{json.dumps(event, default=str, sort_keys=True)}\n"
+
+    def test_barrier_before_write(self):
+        stream = StringIO()
+        calls = []
+        writer = OutputWriter(stream=stream, flush_size=1024, flush_interval=60, barrier=lambda: calls.append(stream.getvalue()))
+
+        writer.flush()
+        assert calls == []
+
+        writer.write(self.events()[0])
+        writer.flush()
+        assert calls == ['']
+        assert stream.getvalue()
+
+    def test_flush_when_input_stalls(self):
+        lines = [
+            '{"account": {"active-card": true, "available-limit": 100}}',
+            '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:00:00.000Z"}}'
+        ]
+        read_end, write_end = os.pipe()
+        output = StringIO()
+        writer = OutputWriter(stream=output, flush_size=64 * 1024, flush_interval=60)
+        stalled = []
+
+        def produce():
+            with open(write_end, 'w') as stream:
+                for position, line in enumerate(lines, start=1):
+                    stream.write(f"{line}\n")
+                    stream.flush()
+                    # Input stalls until the answer is written
+                    deadline = time.monotonic() + 5
+                    while len(output.getvalue().splitlines()) < position:
+                        if time.monotonic() > deadline:
+                            stalled.append(position)
+                            return
+                        time.sleep(0.01)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+
+        with open(read_end) as stream:
+            auth = Authorizer(
+                events=parse_input_events(stream=stream, on_wait=writer.flush),
+                validations=[CardNotActiveValidation, InsufficientLimitValidation]
+            )
+            with writer:
+                for processed_event in auth.process():
+                    writer.write(processed_event)
+        producer.join()
+
+        assert stalled == []
+        assert len(output.getvalue().splitlines()) == len(lines)
+
+    def test_buffer_until_flush_size(self):
+        stream = StringIO()
+        writer = OutputWriter(stream=stream, flush_size=1024, flush_interval=60)
+
+        for event in self.events():
+            writer.write(event)
+
+        assert stream.getvalue() == ''
+
+        writer.flush()
+
+        assert len(stream.getvalue().splitlines()) == len(self.events())
+
+    def test_flush_size_zero_writes_right_away(self):
+        stream = StringIO()
+        writer = OutputWriter(stream=stream, flush_size=0)
+
+        writer.write(self.events()[0])
+
+        assert stream.getvalue() == '{"account": {"account-id": "abc", "active-card": true, "available-limit": 100}, "violations": []}\n'
+
+    def test_flush_interval(self):
+        stream = StringIO()
+        writer = OutputWriter(stream=stream, flush_size=1024, flush_interval=0)
+
+        writer.write(self.events()[0])
+
+        assert stream.getvalue() != ''
+
+    def test_flush_on_exit(self):
+        stream = StringIO()
+
+        with OutputWriter(stream=stream, flush_size=1024, flush_interval=60) as writer:
+            writer.write(self.events()[0])
+
+        assert stream.getvalue() != ''
@@ -0,0 +1,78 @@
+# Built-in libraries
+from io import StringIO
+
+# Project libraries
+from app.parse.io import parse_input_events
+from app.parse.mapped import map_file, parse_file_events, parse_region, read_region_lines, split_regions
+
+# External libraries
+import pytest
+
+
+class TestMappedInput:
+    EVENTS = [
+        '{"account": {"active-card": true, "available-limit": 100}}',
+        '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:00:00.000Z"}}',
+        '',
+        '{"some_other_key": {"event": "info"}}',
+        '{"transaction": {"merchant": "Padaria São João", "amount": 90, "time": "2019-02-13T11:00:00.000Z"}}',
+        '{"account": {"account-id": 1, "active-card": false, "available-limit": 100}}'
+    ] * 5
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / 'events.jsonl'
+        path.write_text('\n'.join(self.EVENTS), encoding='utf-8')
+
+        return str(path)
+
+    @pytest.mark.parametrize('region_size', [1, 50, 10 ** 6])
+    def test_split_regions(self, path, region_size):
+        regions = split_regions(path=path, region_size=region_size)
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        assert regions[0][0] == 0 and regions[-1][1] == len(data)
+        assert all(previous[1] == current[0] for previous, current in zip(regions, regions[1:]))
+        assert all(data[end - 1:end] == b'\n' for _, end in regions[:-1])
+
+    @pytest.mark.parametrize('block_size', [1, 64, 10 ** 6])
+    def test_read_region_lines(self, path, block_size):
+        with map_file(path) as mapped:
+            lines = list(read_region_lines(mapped=mapped, start=0, end=len(mapped), block_size=block_size))
+
+        assert lines == [line for line in self.EVENTS if line]
+
+    def test_parse_region_numbered_from_zero(self, path):
+        start, end = split_regions(path=path, region_size=100)[1]
+
+        events = parse_region(path=path, start=start, end=end)
+
+        assert events[0]['order'] == 0
+
+    @pytest.mark.parametrize('workers, region_size', [(0, 1), (1, 1), (2, 200)])
+    def test_same_events_as_stream(self, path, workers, region_size):
+        events = list(parse_file_events(path=path, workers=workers, region_size=region_size))
+
+        assert events == list(parse_input_events(stream=StringIO('\n'.join(self.EVENTS))))
+
+    @pytest.mark.parametrize('workers', [0, 1])
+    def test_empty_file(self, tmp_path, workers):
+        path = tmp_path / 'empty.jsonl'
+        path.write_text('')
+
+        assert list(parse_file_events(path=str(path), workers=workers)) == []
+
+    def test_stop_early(self, path):
+        events = parse_file_events(path=path)
+
+        assert next(events)['order'] == 0
+        events.close()
+
+    def test_invalid_arguments(self, path):
+        with pytest.raises(ValueError):
+            list(parse_file_events(path=path, workers=-1))
+
+        with pytest.raises(ValueError):
+            split_regions(path=path, region_size=0)
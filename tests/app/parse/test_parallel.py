@@ -0,0 +1,63 @@
+# Built-in libraries
+from io import StringIO
+
+# Project libraries
+from app.parse.io import parse_input_events
+from app.parse.parallel import parse_chunk, parse_input_events_parallel
+
+# External libraries
+import pytest
+
+
+class TestParseInputEventsParallel:
+    EVENTS = [
+        '{"account": {"active-card": true, "available-limit": 100}}',
+        '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:00:00.000Z"}}',
+        '{"some_other_key": {"event": "info"}}',
+        '{"transaction": {"merchant": "Habbibs", "amount": 90, "time": "2019-02-13T11:00:00.000Z"}}',
+        '{"account": {"account-id": 1, "active-card": false, "available-limit": 100}}'
+    ] * 7
+
+    def test_parse_chunk(self):
+        events = parse_chunk(start=10, lines=self.EVENTS[:2])
+
+        assert [event['order'] for event in events] == [10, 11]
+        assert [event['event_type'] for event in events] == ['account_creation', 'transaction']
+
+    @pytest.mark.parametrize('workers, chunk_size, queue_size', [(1, 1, 1), (2, 3, 1), (2, 1000, 4)])
+    def test_same_events_as_sequential_parsing(self, workers, chunk_size, queue_size):
+        stream = '\n'.join(self.EVENTS)
+
+        events = list(parse_input_events_parallel(
+            stream=StringIO(stream),
+            workers=workers,
+            chunk_size=chunk_size,
+            queue_size=queue_size
+        ))
+
+        assert events == list(parse_input_events(stream=StringIO(stream)))
+
+    def test_empty_stream(self):
+        assert list(parse_input_events_parallel(stream=StringIO(''), workers=1)) == []
+
+    def test_stop_early(self):
+        events = parse_input_events_parallel(stream=StringIO('\n'.join(self.EVENTS)), workers=1, chunk_size=2)
+
+        assert next(events)['order'] == 0
+        events.close()
+
+    def test_raise_parse_error(self):
+        events = parse_input_events_parallel(stream=StringIO('{"account": \n'), workers=1)
+
+        with pytest.raises(ValueError):
+            list(events)
+
+    @pytest.mark.parametrize('workers, chunk_size, queue_size', [(0, 10, 1), (1, 0, 1), (1, 10, 0)])
+    def test_invalid_arguments(self, workers, chunk_size, queue_size):
+        with pytest.raises(ValueError):
+            list(parse_input_events_parallel(
+                stream=StringIO(''),
+                workers=workers,
+                chunk_size=chunk_size,
+                queue_size=queue_size
+            ))
@@ -0,0 +1,50 @@
+# Built-in libraries
+from datetime import datetime
+
+# Project libraries
+from app.parse.timestamp import TimestampParser, TIMESTAMP_FORMAT
+
+# External libraries
+import pytest
+
+
+class TestTimestampParser:
+    @pytest.fixture
+    def parser(self):
+        return TimestampParser(cache_size=2)
+
+    @pytest.mark.parametrize('value', [
+        '2019-02-13T11:00:00.000Z',
+        '2019-02-13T11:59:59.999Z',
+        '2020-02-29T23:07:01.010Z',
+        '2019-2-13T11:00:00.000Z',
+        '2019-02-13T11:00:00.123456Z',
+        '2019-02-13T11:00:00.5Z'
+    ])
+    def test_parse_same_as_strptime(self, parser, value):
+        assert parser.parse(value) == datetime.strptime(value, TIMESTAMP_FORMAT)
+
+    @pytest.mark.parametrize('value', [
+        '',
+        '2019-02-13T11: 07:00.000Z',
+        '2019-02-30T11:00:00.000Z',
+        '2019-02-13T24:00:00.000Z',
+        '2019-02-13T11:60:00.000Z',
+        '2019-02-13 11:00:00.000Z',
+        '2019-02-13T11:00:0x.000Z'
+    ])
+    def test_parse_invalid_timestamp(self, parser, value):
+        with pytest.raises(ValueError):
+            parser.parse(value)
+
+    def test_cache_prefix(self, parser):
+        parser.parse('2019-02-13T11:00:00.000Z')
+        parser.parse('2019-02-13T11:30:00.000Z')
+
+        assert list(parser._prefixes) == ['2019-02-13T11']
+
+    def test_cache_size(self, parser):
+        for hour in range(10):
+            parser.parse(f'2019-02-13T{hour:02d}:00:00.000Z')
+
+        assert len(parser._prefixes) <= 2
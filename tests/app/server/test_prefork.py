@@ -0,0 +1,96 @@
+# Built-in libraries
+import os
+import json
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.io import OutputWriter
+from app.parse.mapped import parse_file_events
+from app.server.prefork import PreforkServer, submit
+from app.auth.validation.custom_validation import *
+
+# External libraries
+import pytest
+
+
+def authorize_file(path, stream):
+    auth = Authorizer(
+        events=parse_file_events(path=path),
+        validations=[CardNotActiveValidation, InsufficientLimitValidation, DoubledTransaction]
+    )
+    with OutputWriter(stream=stream) as writer:
+        for processed_event in auth.process():
+            writer.write(processed_event)
+
+
+def fail(path, stream):
+    raise ValueError(f"Unexpected input: {os.path.basename(path)}")
+
+
+class TestPreforkServer:
+    LINES = [
+        '{"account": {"active-card": true, "available-limit": 100}}',
+        '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:00:00.000Z"}}',
+        '{"transaction": {"merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:01:00.000Z"}}',
+        '{"transaction": {"merchant": "Habbibs", "amount": 90, "time": "2019-02-13T11:00:00.000Z"}}'
+    ]
+
+    EXPECTED = [
+        {"account": {"active-card": True, "available-limit": 100}, "violations": []},
+        {"account": {"active-card": True, "available-limit": 80}, "violations": []},
+        {"account": {"active-card": True, "available-limit": 80}, "violations": ["doubled-transaction"]},
+        {"account": {"active-card": True, "available-limit": 80}, "violations": ["insufficient-limit"]}
+    ]
+
+    @pytest.fixture
+    def input_file(self, tmp_path):
+        path = tmp_path / 'events.jsonl'
+        path.write_text('\n'.join(self.LINES) + '\n')
+        return str(path)
+
+    @pytest.fixture
+    def server(self, tmp_path):
+        servers = []
+
+        def start(handler, workers=2):
+            server = PreforkServer(handler=handler, path=str(tmp_path / 'workers.sock'), workers=workers)
+            server.start()
+            servers.append(server)
+            return server
+
+        yield start
+
+        for server in servers:
+            server.stop()
+
+    def test_submit(self, server, input_file):
+        prefork = server(authorize_file)
+
+        # Each request is a run of its own, so answers don't depend on previous requests
+        for _ in range(3):
+            answer = [json.loads(line) for line in submit(path=input_file, unix_socket=prefork.path)]
+            assert answer == self.EXPECTED
+
+        assert len(prefork.pids) == 2
+
+    def test_error(self, server, input_file):
+        prefork = server(fail)
+
+        answer = [json.loads(line) for line in submit(path=input_file, unix_socket=prefork.path)]
+
+        assert answer == [{'error': 'Unexpected input: events.jsonl'}]
+
+    def test_stop(self, server, input_file):
+        prefork = server(authorize_file, workers=1)
+        pids = list(prefork.pids)
+        prefork.stop()
+
+        assert not os.path.exists(prefork.path)
+        assert prefork.pids == []
+        for pid in pids:
+            with pytest.raises(ProcessLookupError):
+                os.kill(pid, 0)
+
+    def test_invalid_workers(self, tmp_path):
+        with pytest.raises(ValueError):
+            PreforkServer(handler=authorize_file, path=str(tmp_path / 'workers.sock'), workers=0)
@@ -0,0 +1,261 @@
+# Built-in libraries
+import io
+import json
+import asyncio
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.io import OutputWriter, parse_input_events
+from app.server.server import AuthorizerServer
+from app.server.router import HashRing, LocalBackend, Router, ServerBackend
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+
+class TestHashRing:
+    def test_spread(self):
+        ring = HashRing(nodes=['a', 'b', 'c', 'd'])
+        counts = {node: 0 for node in ring.nodes}
+        for key in range(10000):
+            counts[ring.node_of(key)] += 1
+
+        assert all(1500 < count < 3500 for count in counts.values())
+
+    def test_minimal_movement(self):
+        ring = HashRing(nodes=['a', 'b', 'c'])
+        before = {key: ring.node_of(key) for key in range(10000)}
+
+        ring.add('d')
+        after = {key: ring.node_of(key) for key in range(10000)}
+        moved = [key for key in before if before[key] != after[key]]
+
+        # Only keys taken over by the new node move, about a quarter of them
+        assert all(after[key] == 'd' for key in moved)
+        assert 1500 < len(moved) < 3500
+
+        ring.remove('d')
+        assert {key: ring.node_of(key) for key in range(10000)} == before
+
+    def test_equal_keys(self):
+        ring = HashRing(nodes=['a', 'b', 'c', 'd'])
+
+        assert all(ring.node_of(key) == ring.node_of(float(key)) for key in range(100))
+        assert ring.node_of(True) == ring.node_of(1)
+        assert ring.node_of(False) == ring.node_of(0)
+
+    def test_stable(self):
+        assert HashRing(nodes=['a', 'b']).node_of('x') == HashRing(nodes=['b', 'a']).node_of('x')
+
+    def test_invalid(self):
+        ring = HashRing(nodes=['a'])
+
+        with pytest.raises(ValueError):
+            ring.add('a')
+        with pytest.raises(ValueError):
+            ring.remove('b')
+        with pytest.raises(LookupError):
+            HashRing().node_of(1)
+        with pytest.raises(ValueError):
+            HashRing(vnodes=0)
+
+
+class TestRouter:
+    @staticmethod
+    def lines(accounts=8, transactions=120):
+        lines = [
+            json.dumps({"account": {"account-id": account_id, "active-card": True, "available-limit": 100}})
+            for account_id in range(accounts)
+        ]
+        lines.append(json.dumps({"some_event": {"key": "value"}}))
+        for i in range(transactions):
+            lines.append(json.dumps({"transaction": {
+                "account-id": i % (accounts + 1),
+                "merchant": f"Merchant {i % 2}",
+                "amount": 10 + i % 3,
+                "time": f"2019-02-13T11:{i // 4 % 60:02d}:{(i % 4) * 15:02d}.000Z"
+            }}))
+
+        return lines
+
+    def expected(self, lines):
+        output = io.StringIO()
+        auth = Authorizer(events=parse_input_events(stream=io.StringIO('\n'.join(lines))), validations=ALL_VALIDATIONS)
+        with OutputWriter(stream=output) as writer:
+            for processed_event in auth.process():
+                writer.write(processed_event)
+
+        return output.getvalue().splitlines(keepends=True)
+
+    @pytest.fixture
+    def local_router(self):
+        routers = []
+
+        def build(backends=2, **kwargs):
+            router = Router(
+                backends={f"local-{i}": LocalBackend(validations=ALL_VALIDATIONS) for i in range(backends)},
+                **kwargs
+            )
+            routers.append(router)
+            return router
+
+        yield build
+
+        for router in routers:
+            router.close()
+
+    def test_same_as_authorizer(self, local_router):
+        lines = self.lines()
+        router = local_router(backends=3, batch_size=7)
+
+        assert list(router.process(lines)) == self.expected(lines)
+        assert set(router.accounts.values()) == set(router.backends)
+
+    def test_add_and_remove_backends(self, local_router):
+        lines = self.lines()
+        router = local_router(backends=2, batch_size=5)
+        output = []
+
+        for position, line in enumerate(router.process(lines)):
+            output.append(line)
+            if position == 30:
+                router.add_backend('local-2', LocalBackend(validations=ALL_VALIDATIONS))
+            elif position == 80:
+                router.remove_backend('local-0')
+
+        # Moved accounts keep their state on their new backend
+        assert output == self.expected(lines)
+        assert router.moved > 0
+        assert set(router.backends) == {'local-1', 'local-2'}
+        assert all(router.ring.node_of(account_id) == node for account_id, node in router.accounts.items())
+
+    def test_late_events_after_handoff(self, local_router):
+        accounts = 8
+        lines = [
+            json.dumps({"account": {"account-id": account_id, "active-card": True, "available-limit": 1000}})
+            for account_id in range(accounts)
+        ]
+        # Three transactions of each account, then a later one evicting them from its time window
+        for time in ('11:00:00', '11:00:10', '11:00:20', '12:00:00'):
+            lines.extend(
+                json.dumps({"transaction": {
+                    "account-id": account_id,
+                    "merchant": f"Merchant {time}",
+                    "amount": 10,
+                    "time": f"2019-02-13T{time}.000Z"
+                }})
+                for account_id in range(accounts)
+            )
+        # Late transactions, only a 'high-frequency-small-interval' with the evicted ones
+        lines.extend(
+            json.dumps({"transaction": {
+                "account-id": account_id,
+                "merchant": "Merchant late",
+                "amount": 10,
+                "time": "2019-02-13T11:00:30.000Z"
+            }})
+            for account_id in range(accounts)
+        )
+        # A batch per time, so the later transactions are processed when backends change, and the late ones after
+        router = local_router(backends=2, batch_size=accounts, depth=1)
+        output = []
+
+        for position, line in enumerate(router.process(lines)):
+            output.append(line)
+            if position == 4 * accounts - 1:
+                router.add_backend('local-2', LocalBackend(validations=ALL_VALIDATIONS))
+
+        # Moved accounts keep their whole history, not only their time window
+        assert output == self.expected(lines)
+        assert router.moved > 0
+        assert all('high-frequency-small-interval' in line for line in output[-accounts:])
+
+    def test_invalid_backends(self, local_router):
+        router = local_router(backends=1)
+
+        with pytest.raises(ValueError):
+            router.remove_backend('local-0')
+        with pytest.raises(ValueError):
+            router.add_backend('local-0', router.backends['local-0'])
+        with pytest.raises(ValueError):
+            Router(backends={})
+
+    def test_server_backends(self, tmp_path):
+        lines = self.lines()
+        servers = [AuthorizerServer(validations=ALL_VALIDATIONS, handoff_token='secret') for _ in range(3)]
+        paths = [str(tmp_path / f"auth-{i}.sock") for i in range(3)]
+
+        def route():
+            router = Router(
+                backends={
+                    f"server-{i}": ServerBackend(unix_socket=path, handoff_token='secret')
+                    for i, path in enumerate(paths[:2])
+                },
+                batch_size=9
+            )
+            output = []
+            for position, line in enumerate(router.process(lines)):
+                output.append(line)
+                if position == 40:
+                    # Small line limit, so handed off state is imported in parts
+                    router.add_backend(
+                        'server-2', ServerBackend(unix_socket=paths[2], line_limit=512, handoff_token='secret')
+                    )
+                elif position == 90:
+                    router.remove_backend('server-0')
+            router.close()
+
+            return router, output
+
+        async def main():
+            listening = [await server.start(unix_socket=path) for server, path in zip(servers, paths)]
+            # The router blocks on its backends, so it runs apart from the event loop serving them
+            result = await asyncio.to_thread(route)
+            for server in listening:
+                server.close()
+                await server.wait_closed()
+
+            return result
+
+        router, output = asyncio.run(main())
+
+        assert output == self.expected(lines)
+        assert router.moved > 0
+        assert not servers[0].authorizer.accounts
+        # Each account is owned by a single server
+        owned = [set(server.authorizer.accounts) for server in servers[1:]]
+        assert not owned[0] & owned[1]
+        assert owned[0] | owned[1] == set(router.accounts)
+
+    def test_server_backends_without_token(self, tmp_path):
+        path = str(tmp_path / 'auth.sock')
+        servers = {token: AuthorizerServer(validations=ALL_VALIDATIONS, handoff_token=token) for token in (None, 'b')}
+
+        def handoff(token):
+            backend = ServerBackend(unix_socket=path, handoff_token=token)
+            try:
+                backend.export_accounts([0])
+            finally:
+                backend.close()
+
+        async def main(server, token):
+            listening = await server.start(unix_socket=path)
+            try:
+                await asyncio.to_thread(handoff, token)
+            finally:
+                listening.close()
+                await listening.wait_closed()
+
+        for server_token, backend_token in [(None, None), (None, 'a'), ('b', 'a')]:
+            with pytest.raises(RuntimeError):
+                asyncio.run(main(servers[server_token], backend_token))
+
+    def test_dead_local_backend(self, local_router):
+        router = local_router(backends=1)
+        backend = router.backends['local-0']
+        backend._process.kill()
+        backend._process.join()
+
+        with pytest.raises(RuntimeError, match='died'):
+            list(router.process(self.lines()))
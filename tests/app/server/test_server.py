@@ -0,0 +1,173 @@
+# Built-in libraries
+import io
+import json
+import asyncio
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.parse.io import OutputWriter, parse_input_events
+from app.server.client import AuthorizerClient, run
+from app.server.server import AuthorizerServer
+from app.storage.wal import WriteAheadLog
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+
+class TestAuthorizerServer:
+    @staticmethod
+    def lines():
+        lines = [
+            json.dumps({"account": {"account-id": account_id, "active-card": True, "available-limit": 100}})
+            for account_id in range(3)
+        ]
+        lines.append(json.dumps({"some_event": {"key": "value"}}))
+        for i in range(30):
+            lines.append(json.dumps({"transaction": {
+                "account-id": i % 4,
+                "merchant": f"Merchant {i % 2}",
+                "amount": 10 + i % 3,
+                "time": f"2019-02-13T11:{i // 2:02d}:{(i % 2) * 30:02d}.000Z"
+            }}))
+
+        return lines
+
+    def expected(self, lines):
+        output = io.StringIO()
+        auth = Authorizer(events=parse_input_events(stream=io.StringIO('\n'.join(lines))), validations=ALL_VALIDATIONS)
+        with OutputWriter(stream=output) as writer:
+            for processed_event in auth.process():
+                writer.write(processed_event)
+
+        return output.getvalue().splitlines(keepends=True)
+
+    @staticmethod
+    def serve(server, coroutine, **address):
+        async def main():
+            listening = await server.start(**address)
+            if not address.get('unix_socket'):
+                address['port'] = listening.sockets[0].getsockname()[1]
+            async with listening:
+                return await coroutine(address)
+
+        return asyncio.run(main())
+
+    def test_single_connection(self, tmp_path):
+        lines = self.lines()
+        server = AuthorizerServer(validations=ALL_VALIDATIONS)
+
+        result = self.serve(
+            server,
+            lambda address: AuthorizerClient(**address).send(lines),
+            unix_socket=str(tmp_path / 'auth.sock')
+        )
+
+        assert result['answers'] == self.expected(lines)
+        assert len(result['latencies']) == len(lines)
+
+    def test_connections_share_accounts(self):
+        lines = self.lines()
+        server = AuthorizerServer(validations=ALL_VALIDATIONS)
+
+        async def send_in_turns(address):
+            first = await AuthorizerClient(**address).send(lines[:10])
+            second = await AuthorizerClient(**address).send(lines[10:])
+            return first['answers'] + second['answers']
+
+        answers = self.serve(server, send_in_turns, host='127.0.0.1', port=0)
+
+        assert answers == self.expected(lines)
+
+    def test_concurrent_connections(self):
+        lines = self.lines()
+        server = AuthorizerServer(validations=ALL_VALIDATIONS, max_connections=2)
+
+        result = self.serve(server, lambda address: run(lines=lines, connections=4, **address), host='127.0.0.1', port=0)
+
+        assert result['events'] == len(lines)
+        assert server.active_connections == 0
+
+        # Each account is sent on a single connection, so its events keep their order
+        expected = Authorizer(
+            events=parse_input_events(stream=io.StringIO('\n'.join(lines))),
+            validations=ALL_VALIDATIONS
+        )
+        list(expected.process())
+        assert {k: v.to_json() for k, v in server.authorizer.accounts.items()} == \
+               {k: v.to_json() for k, v in expected.accounts.items()}
+
+    def test_invalid_event_closes_connection(self):
+        server = AuthorizerServer(validations=ALL_VALIDATIONS)
+
+        result = self.serve(
+            server,
+            lambda address: AuthorizerClient(**address).send(['not json', self.lines()[0]]),
+            host='127.0.0.1',
+            port=0
+        )
+
+        assert result['answers'] == []
+        assert server.active_connections == 0
+
+    def test_handoff(self):
+        lines = self.lines()
+        source = AuthorizerServer(validations=ALL_VALIDATIONS, handoff_token='secret')
+        target = AuthorizerServer(validations=ALL_VALIDATIONS, handoff_token='secret')
+
+        async def handoff(address):
+            await AuthorizerClient(**address).send(lines[:4])
+            result = await AuthorizerClient(**address).send([
+                json.dumps({'handoff': {'export': [0, 1], 'token': 'secret'}})
+            ])
+            return json.loads(result['answers'][0])
+
+        state = self.serve(source, handoff, host='127.0.0.1', port=0)['handoff']['state']
+
+        assert set(source.authorizer.accounts) == {2}
+        assert target.handoff({'import': state}) == {'handoff': {'imported': 2}}
+        assert set(target.authorizer.accounts) == {0, 1}
+
+    @pytest.mark.parametrize('handoff_token, message', [
+        (None, {'export': [0, 1]}),
+        (None, {'export': [0, 1], 'token': None}),
+        ('secret', {'export': [0, 1]}),
+        ('secret', {'export': [0, 1], 'token': 'guess'}),
+        ('secret', 'export')
+    ])
+    def test_handoff_requires_token(self, handoff_token, message):
+        lines = self.lines()
+        server = AuthorizerServer(validations=ALL_VALIDATIONS, handoff_token=handoff_token)
+
+        async def handoff(address):
+            await AuthorizerClient(**address).send(lines[:4])
+            result = await AuthorizerClient(**address).send([json.dumps({'handoff': message})])
+            return json.loads(result['answers'][0])
+
+        answer = self.serve(server, handoff, host='127.0.0.1', port=0)
+
+        # Answered as any other unknown event, keeping the accounts
+        assert answer['violations'] == ['unknown-error']
+        assert set(server.authorizer.accounts) == {0, 1, 2}
+
+    def test_handoff_errors(self, tmp_path):
+        server = AuthorizerServer(validations=ALL_VALIDATIONS)
+
+        assert 'error' in server.handoff({'import': 'bm90IGEgc25hcHNob3Q='})['handoff']
+        assert 'error' in server.handoff({'unknown': []})['handoff']
+
+        server.authorizer.wal = WriteAheadLog(path=str(tmp_path / 'auth.wal'))
+        assert 'error' in server.handoff({'export': [0]})['handoff']
+
+    def test_group_commit_before_answers(self, tmp_path):
+        lines = self.lines()
+        server = AuthorizerServer(validations=ALL_VALIDATIONS)
+        wal = server.authorizer.wal = WriteAheadLog(path=str(tmp_path / 'auth.wal'), fsync='group', group_interval=0.01)
+
+        result = self.serve(server, lambda address: run(lines=lines, connections=4, **address), host='127.0.0.1', port=0)
+
+        assert result['events'] == len(lines)
+        assert wal.pending == 0
+        assert wal.committed_lsn == server.authorizer.lsn
+        # Connections waiting at the same time share commits
+        assert wal.syncs < server.authorizer.lsn
@@ -0,0 +1,117 @@
+# Built-in libraries
+import os
+import logging
+import threading
+
+# Project libraries
+from app.service.logging.local_logging import LocalLogging, DEBUG, INFO
+
+# External libraries
+import pytest
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.getMessage(), threading.current_thread()))
+
+
+class LazyMessage:
+    def __init__(self):
+        self.formatted = False
+
+    def __str__(self):
+        self.formatted = True
+        return 'lazy'
+
+
+class TestLocalLogging:
+    @pytest.fixture
+    def local_logging(self):
+        local_logging = LocalLogging()
+        handler = RecordingHandler()
+        local_logging.logger.handlers = [handler]
+
+        yield local_logging, handler
+
+        local_logging.stop()
+        local_logging.logger.handlers = []
+
+    def test_lazy_setup(self):
+        local_logging = LocalLogging()
+
+        assert local_logging._logger is None
+        assert local_logging.logger is logging.getLogger('app.service.logging.local_logging')
+
+    def test_setup_keeps_existing_loggers(self):
+        existing = logging.getLogger('tests.existing')
+        local_logging = LocalLogging()
+        local_logging.info('First message')
+
+        assert not existing.disabled
+        local_logging.logger.handlers = []
+
+    def test_log(self, local_logging):
+        local_logging, handler = local_logging
+        local_logging.info('Processed %d events', 10)
+        local_logging.warning('Done!')
+
+        assert [message for message, _ in handler.records] == ['Processed 10 events', 'Done!']
+        assert all(thread is threading.current_thread() for _, thread in handler.records)
+
+    def test_disabled_level_is_not_formatted(self, local_logging):
+        local_logging, handler = local_logging
+        message = LazyMessage()
+        local_logging.debug('Message: %s', message)
+
+        assert not local_logging.enabled(DEBUG)
+        assert local_logging.enabled(INFO)
+        assert not message.formatted
+        assert handler.records == []
+
+    def test_asynchronous(self, local_logging):
+        local_logging, handler = local_logging
+        local_logging.start_async()
+
+        for position in range(100):
+            local_logging.info('Event %d', position)
+
+        local_logging.stop()
+
+        assert [message for message, _ in handler.records] == [f'Event {position}' for position in range(100)]
+        assert all(thread is not threading.current_thread() for _, thread in handler.records)
+        assert local_logging.logger.handlers == [handler]
+
+    def test_asynchronous_before_setup(self):
+        local_logging = LocalLogging(asynchronous=True)
+        handlers = local_logging.logger.handlers
+
+        assert [type(handler).__name__ for handler in handlers] == ['QueueHandler']
+
+        local_logging.stop()
+
+        assert [type(handler).__name__ for handler in local_logging.logger.handlers] == ['StreamHandler']
+        local_logging.logger.handlers = []
+
+    def test_asynchronous_after_fork(self, local_logging):
+        local_logging, _ = local_logging
+        read_end, write_end = os.pipe()
+        stream = open(write_end, 'w')
+        local_logging.logger.handlers = [logging.StreamHandler(stream)]
+        local_logging.start_async()
+
+        pid = os.fork()
+        if not pid:
+            local_logging.info('Logged by the child')
+            local_logging.stop()
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        local_logging.stop()
+        stream.close()
+
+        with open(read_end) as f:
+            assert f.read() == 'Logged by the child\n'
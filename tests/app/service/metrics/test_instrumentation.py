@@ -0,0 +1,98 @@
+# Built-in libraries
+import json
+
+# Project libraries
+from app.service.logging import INFO, WARNING
+from app.service.metrics.instrumentation import Instrumentation, LatencyRecorder, file_exporter, log_exporter
+
+# External libraries
+import pytest
+
+
+class TestLatencyRecorder:
+    @pytest.fixture
+    def recorder(self):
+        recorder = LatencyRecorder(sample_size=100)
+        for elapsed_ns in range(1000, 101000, 1000):
+            recorder.record(elapsed_ns)
+
+        return recorder
+
+    def test_snapshot(self, recorder):
+        snapshot = recorder.snapshot()
+
+        assert snapshot['count'] == 100
+        assert snapshot['total_ms'] == 5.05
+        assert snapshot['mean_us'] == 50.5
+        assert snapshot['p50_us'] == 51.0
+        assert snapshot['p99_us'] == 100.0
+
+    def test_percentile_of_most_recent_samples(self, recorder):
+        for _ in range(100):
+            recorder.record(1000)
+
+        assert recorder.percentile(99) == 1.0
+        assert recorder.count == 200
+
+    def test_percentile_without_samples(self):
+        assert LatencyRecorder().percentile(50) == 0.0
+
+
+class TestInstrumentation:
+    def test_snapshot(self):
+        instrumentation = Instrumentation()
+        instrumentation.record_stage('parse', 1000)
+        instrumentation.record_validation('SomeValidation', 2000, '')
+        instrumentation.record_validation('SomeValidation', 2000, 'some-violation')
+
+        snapshot = instrumentation.snapshot()
+
+        assert snapshot['stages']['parse']['count'] == 1
+        assert snapshot['validations']['SomeValidation']['violations'] == 1
+        assert snapshot['validations']['SomeValidation']['violation_rate'] == 0.5
+
+    def test_tick_export_periodically(self):
+        snapshots = []
+        instrumentation = Instrumentation(export_interval=0, exporter=snapshots.append)
+
+        instrumentation.tick()
+        instrumentation.tick()
+
+        assert len(snapshots) == 2
+
+    def test_tick_without_export_interval(self):
+        snapshots = []
+        instrumentation = Instrumentation(exporter=snapshots.append)
+
+        instrumentation.tick()
+
+        assert snapshots == []
+
+    def test_file_exporter(self, tmp_path):
+        path = tmp_path / 'metrics.jsonl'
+        instrumentation = Instrumentation(exporter=file_exporter(str(path)))
+
+        instrumentation.export()
+        instrumentation.export()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        assert set(json.loads(lines[0])) == {'elapsed_s', 'stages', 'validations'}
+
+    @pytest.mark.parametrize('level, logged', [(INFO, True), (WARNING, False)])
+    def test_log_exporter(self, level, logged):
+        class FakeLogger:
+            def __init__(self):
+                self.messages = []
+
+            def enabled(self, message_level):
+                return message_level >= level
+
+            def info(self, message, *args):
+                self.messages.append(message % args)
+
+        logger = FakeLogger()
+        Instrumentation(exporter=log_exporter(logger)).export()
+
+        assert len(logger.messages) == logged
+        assert all(message.startswith('Metrics: {') for message in logger.messages)
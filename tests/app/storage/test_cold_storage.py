@@ -0,0 +1,67 @@
+# Built-in libraries
+from datetime import datetime
+
+# Project libraries
+from app.parse.io import parse_event
+from app.storage.cold_storage import ColdStorage
+from app.bank.records import TransactionRecord
+
+
+class TestColdStorage:
+    def test_write_and_read(self, tmp_path):
+        path = str(tmp_path / 'cold.jsonl')
+        record = TransactionRecord.from_transaction(
+            {"transaction": {"merchant": "Burger King", "amount": 20, "time": datetime(2019, 2, 13, 10, 0, 0, 123456)}}
+        )
+
+        with ColdStorage(path=path, flush_size=10) as sink:
+            sink.write(account_id=None, records=[record])
+            sink.write(account_id=7, records=[record])
+
+            # Buffered until flushed
+            assert list(ColdStorage.read(path)) == []
+
+        transactions = list(ColdStorage.read(path))
+
+        assert sink.written == 2
+        assert transactions[0] == {"transaction": {
+            "merchant": "Burger King", "amount": 20, "time": "2019-02-13T10:00:00.123Z"
+        }}
+        assert transactions[1]['transaction']['account-id'] == 7
+
+    def test_replayed_as_input_events(self, tmp_path):
+        path = str(tmp_path / 'cold.jsonl')
+        transaction = {"transaction": {"merchant": "Habbibs", "amount": 20, "time": datetime(2019, 2, 13, 10, 0, 1)}}
+
+        with ColdStorage(path=path) as sink:
+            sink.write(account_id=None, records=[TransactionRecord.from_transaction(transaction)])
+
+        with open(path) as f:
+            event = parse_event(value=f.readline(), order=0)
+
+        assert event['transaction'] == transaction['transaction']
+
+    def test_same_line_as_input(self, tmp_path):
+        path = str(tmp_path / 'cold.jsonl')
+        line = (
+            '{"transaction": {"merchant": "Habbibs", "amount": 20, "time": "1969-12-31T23:59:59.005Z", '
+            '"account-id": 1}}'
+        )
+        event = parse_event(value=line, order=0)
+
+        with ColdStorage(path=path) as sink:
+            sink.write(account_id=1, records=[TransactionRecord.from_transaction(event)])
+
+        # Times to the millisecond, as on input lines, which the fast timestamp parser reads back
+        with open(path) as f:
+            assert f.read() == f"{line}\n"
+
+    def test_append_to_existing_file(self, tmp_path):
+        path = str(tmp_path / 'cold.jsonl')
+        record = TransactionRecord(time=0, amount=1, merchant=0)
+
+        for _ in range(2):
+            with ColdStorage(path=path, flush_size=0) as sink:
+                sink.write(account_id=1, records=[record])
+
+        assert len(list(ColdStorage.read(path))) == 2
@@ -0,0 +1,134 @@
+# Built-in libraries
+import os
+from datetime import datetime
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.bank.account import BankAccount
+from app.bank.transactions import BankStatement
+from app.storage.snapshot import Snapshot
+from tests.helpers import ALL_VALIDATIONS, transaction
+
+# External libraries
+import pytest
+
+
+class TestSnapshot:
+    @pytest.fixture
+    def account(self):
+        account = BankAccount(active_card=True, available_limit=1000, account_id='abc')
+
+        # Widens the window horizon, as validations do
+        list(BankStatement.query_by_date(
+            account=account,
+            field='time',
+            start_date=datetime(2019, 2, 13, 11, 3),
+            end_date=datetime(2019, 2, 13, 11, 5)
+        ))
+
+        for second in (0, 200, 290, 250, 300):
+            BankStatement.register(account=account, transaction=transaction(second, amount=second % 7))
+
+        return account
+
+    def test_round_trip(self, account):
+        restored = Snapshot.loads(Snapshot.dumps({'abc': account}))[0]['abc']
+
+        assert restored.to_json() == account.to_json()
+        assert restored.window.horizon == account.window.horizon
+        assert restored.window.covered_from == account.window.covered_from
+        assert restored.window.records() == account.window.records()
+
+    def test_keeps_only_window_transactions(self, account):
+        restored = Snapshot.loads(Snapshot.dumps({'abc': account}))[0]['abc']
+
+        assert len(account.transactions) == 5
+        assert restored.transactions == account.window.records()
+        assert [t.get('time').second for t in restored.transactions] == [20, 50, 10, 0]
+
+    def test_keeps_history(self, account):
+        restored = Snapshot.loads(Snapshot.dumps({'abc': account}, history=True))[0]['abc']
+
+        assert restored.transactions == account.transactions
+        assert restored.window.covered_from == account.window.covered_from
+        assert restored.window.records() == account.window.records()
+
+        # Transactions evicted from the history while still on the window are kept too
+        del account.transactions[:4]
+        restored = Snapshot.loads(Snapshot.dumps({'abc': account}, history=True))[0]['abc']
+
+        assert [t.get('time').second for t in restored.transactions] == [20, 50, 10, 0]
+        assert restored.window.records() == account.window.records()
+
+    def test_restored_queries(self, account):
+        restored = Snapshot.loads(Snapshot.dumps({'abc': account}))[0]['abc']
+        start, end = datetime(2019, 2, 13, 11, 3, 30), datetime(2019, 2, 13, 11, 5, 1)
+
+        assert list(BankStatement.query_by_date(restored, 'time', start, end)) == \
+               list(BankStatement.query_by_date(account, 'time', start, end))
+        assert BankStatement.has_similar_transaction(restored, 'Burger King', 300 % 7, start, end)
+
+    @pytest.mark.parametrize('value', [None, 0, -1, 2 ** 70, 'abc', 'çã', 1.5, True, False])
+    def test_values(self, value):
+        account = BankAccount(active_card=False, available_limit=10, account_id=value)
+        account.transactions = [{"transaction": {"merchant": value, "amount": value, "time": datetime(2019, 2, 13)}}]
+
+        restored, _ = Snapshot.loads(Snapshot.dumps({value: account}))
+
+        assert list(restored) == [value]
+        assert type(list(restored)[0]) is type(value)
+        assert restored[value].window.records()[0].get('merchant') == value
+        assert restored[value].window.records()[0].amount == value
+
+    def test_invalid_data(self):
+        with pytest.raises(ValueError):
+            Snapshot.loads(b'')
+
+        with pytest.raises(ValueError):
+            Snapshot.loads(b'NOTASNAP' + bytes(10))
+
+    def test_save_and_load(self, account, tmp_path):
+        path = str(tmp_path / 'state.snap')
+        with open(path, 'wb') as f:
+            f.write(b'previous snapshot')
+
+        Snapshot.save({'abc': account}, path, lsn=42)
+        accounts, lsn = Snapshot.load(path)
+
+        assert accounts['abc'].to_json() == account.to_json()
+        assert lsn == 42
+        assert os.listdir(tmp_path) == ['state.snap']
+
+    def test_failed_save_keeps_previous_snapshot(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'state.snap')
+        Snapshot.save({}, path)
+
+        def fail(accounts, lsn):
+            raise RuntimeError('failed')
+
+        monkeypatch.setattr(Snapshot, 'dumps', fail)
+        with pytest.raises(RuntimeError):
+            Snapshot.save({}, path)
+
+        assert Snapshot.load(path) == ({}, 0)
+        assert os.listdir(tmp_path) == ['state.snap']
+
+    def test_authorizer_restart(self, tmp_path):
+        path = str(tmp_path / 'state.snap')
+        events = [
+            {"account": {"account-id": account_id, "active-card": True, "available-limit": 100}, 'event_type': 'account_creation'}
+            for account_id in range(3)
+        ]
+        events += [transaction(15 * i, merchant=f"Merchant {i % 2}", amount=5 + i % 3, account_id=i % 3) for i in range(60)]
+
+        expected = [str(e) for e in Authorizer(events=events, validations=ALL_VALIDATIONS).process()]
+
+        first = Authorizer(events=events[:30], validations=ALL_VALIDATIONS)
+        result = [str(e) for e in first.process()]
+        first.save_snapshot(path)
+
+        second = Authorizer(events=events[30:], validations=ALL_VALIDATIONS)
+        second.load_snapshot(path)
+        result += [str(e) for e in second.process()]
+
+        assert result == expected
@@ -0,0 +1,168 @@
+# Built-in libraries
+import os
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.auth.authorizer import Authorizer
+from app.bank.account import BankAccount
+from app.bank.records import TransactionRecord
+from app.bank.retention import RetentionPolicy
+from app.storage.cold_storage import ColdStorage
+from app.storage.wal import ACCOUNT_CREATION, TRANSACTION, WriteAheadLog
+from tests.helpers import ALL_VALIDATIONS
+
+# External libraries
+import pytest
+
+
+def record(second: int, merchant: str = 'Burger King', amount: int = 10) -> TransactionRecord:
+    return TransactionRecord.from_transaction(
+        {"transaction": {"merchant": merchant, "amount": amount, "time": datetime(2019, 2, 13, 11) + timedelta(seconds=second)}}
+    )
+
+
+class TestWriteAheadLog:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / 'authorizer.wal')
+
+    def test_append_and_read(self, path):
+        with WriteAheadLog(path=path) as wal:
+            assert wal.append_account(BankAccount(active_card=True, available_limit=100, account_id='abc')) == 1
+            assert wal.append_transaction(account_id='abc', record=record(0, amount=25)) == 2
+
+        assert list(WriteAheadLog.read(path)) == [
+            (1, ACCOUNT_CREATION, ('abc', True, 100)),
+            (2, TRANSACTION, ('abc', record(0).time, 25, 'Burger King'))
+        ]
+        assert list(WriteAheadLog.read(path, after=1)) == [(2, TRANSACTION, ('abc', record(0).time, 25, 'Burger King'))]
+
+    @pytest.mark.parametrize('fsync, syncs', [('always', 5), ('group', 1), ('never', 0)])
+    def test_fsync_policies(self, path, fsync, syncs):
+        wal = WriteAheadLog(path=path, fsync=fsync, group_interval=60)
+        for second in range(5):
+            wal.append_transaction(account_id=None, record=record(second))
+
+        wal.close()
+
+        assert wal.syncs == syncs
+        assert len(list(WriteAheadLog.read(path))) == 5
+
+    def test_group_commit(self, path):
+        wal = WriteAheadLog(path=path, fsync='group', group_interval=60, group_size=3)
+        for second in range(7):
+            wal.append_transaction(account_id=None, record=record(second))
+
+        assert wal.syncs == 2
+        assert wal.pending == 1
+        assert wal.committed_lsn == 6
+        assert len(list(WriteAheadLog.read(path))) == 6
+
+        wal.commit()
+        assert wal.pending == 0
+        assert wal.committed_lsn == 7
+
+    def test_invalid_fsync_policy(self, path):
+        with pytest.raises(ValueError):
+            WriteAheadLog(path=path, fsync='sometimes')
+
+    def test_drops_partially_written_entry(self, path):
+        with WriteAheadLog(path=path) as wal:
+            for second in range(3):
+                wal.append_transaction(account_id=None, record=record(second))
+
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        assert [lsn for lsn, _, _ in WriteAheadLog.read(path)] == [1, 2]
+
+        with WriteAheadLog(path=path) as wal:
+            assert wal.append_transaction(account_id=None, record=record(10)) == 3
+
+        assert [lsn for lsn, _, _ in WriteAheadLog.read(path)] == [1, 2, 3]
+
+    def test_truncate_keeps_sequence(self, path):
+        with WriteAheadLog(path=path) as wal:
+            for second in range(3):
+                wal.append_transaction(account_id=None, record=record(second))
+            wal.truncate()
+
+        assert list(WriteAheadLog.read(path)) == []
+
+        with WriteAheadLog(path=path) as wal:
+            assert wal.append_transaction(account_id=None, record=record(10)) == 4
+
+    def test_sequence_continues_from_lsn(self, path):
+        with WriteAheadLog(path=path, lsn=41) as wal:
+            assert wal.append_transaction(account_id=None, record=record(0)) == 42
+
+    def test_authorizer_recovery(self, tmp_path, path):
+        snapshot = str(tmp_path / 'authorizer.snap')
+        events = [
+            {"account": {"account-id": account_id, "active-card": True, "available-limit": 100}, 'event_type': 'account_creation'}
+            for account_id in range(3)
+        ]
+        events += [
+            {"transaction": {
+                "account-id": i % 3,
+                "merchant": f"Merchant {i % 2}",
+                "amount": 5 + i % 3,
+                "time": datetime(2019, 2, 13, 11) + timedelta(seconds=15 * i)
+            }, 'event_type': 'transaction'}
+            for i in range(60)
+        ]
+
+        expected = [str(e) for e in Authorizer(events=events, validations=ALL_VALIDATIONS).process()]
+
+        # Saves a snapshot after the first events
+        first = Authorizer(events=events[:20], validations=ALL_VALIDATIONS, wal=WriteAheadLog(path=path))
+        result = [str(e) for e in first.process()]
+        first.save_snapshot(snapshot)
+        first.wal.close()
+
+        # Crashes without saving a snapshot
+        second = Authorizer(events=events[20:40], validations=ALL_VALIDATIONS)
+        second.load_snapshot(snapshot)
+        second.wal = WriteAheadLog(path=path, lsn=second.lsn)
+        result += [str(e) for e in second.process()]
+        second.wal.commit()
+
+        third = Authorizer(events=events[40:], validations=ALL_VALIDATIONS)
+        third.load_snapshot(snapshot)
+        assert third.recover(path) == second.lsn - first.lsn
+        result += [str(e) for e in third.process()]
+
+        assert result == expected
+
+    def test_recovery_doesnt_write_evicted_transactions_again(self, tmp_path, path):
+        cold = str(tmp_path / 'cold.jsonl')
+        events = [{"account": {"account-id": 1, "active-card": True, "available-limit": 1000}, 'event_type': 'account_creation'}]
+        events += [
+            {"transaction": {
+                "account-id": 1, "merchant": f"Merchant {i}", "amount": 1, "time": datetime(2019, 2, 13, 11, i)
+            }, 'event_type': 'transaction'}
+            for i in range(30)
+        ]
+
+        first = Authorizer(
+            events=events,
+            validations=ALL_VALIDATIONS,
+            wal=WriteAheadLog(path=path),
+            retention=RetentionPolicy(max_entries=5, sink=ColdStorage(path=cold, flush_size=0))
+        )
+        list(first.process())
+        first.wal.close()
+        first.retention.close()
+        written = list(ColdStorage.read(cold))
+        assert written
+
+        second = Authorizer(
+            events=[],
+            validations=ALL_VALIDATIONS,
+            retention=RetentionPolicy(max_entries=5, sink=ColdStorage(path=cold, flush_size=0))
+        )
+        second.recover(path)
+        second.retention.close()
+
+        assert list(ColdStorage.read(cold)) == written
+        assert second.accounts[1].transactions == first.accounts[1].transactions
@@ -0,0 +1,27 @@
+# Built-in libraries
+from datetime import datetime, timedelta
+
+# Project libraries
+from app.auth.validation.custom_validation import (
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+)
+
+# Default validations, the ones run by 'run.py'
+ALL_VALIDATIONS = [
+    CardNotActiveValidation,
+    InsufficientLimitValidation,
+    HighFreqSmallIntervalValidation,
+    DoubledTransaction
+]
+
+
+def transaction(second: int, merchant: str = 'Burger King', amount: int = 10, account_id=None) -> dict:
+    """Transaction event as parsed from input, 'second' seconds after 2019-02-13T11:00"""
+    payload = {"merchant": merchant, "amount": amount, "time": datetime(2019, 2, 13, 11) + timedelta(seconds=second)}
+    if account_id is not None:
+        payload['account-id'] = account_id
+
+    return {"transaction": payload, 'event_type': 'transaction'}